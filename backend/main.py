@@ -1,8 +1,20 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from routes import resume, jd, interview, rewriter
+from fastapi.responses import ORJSONResponse
+from routes import resume, jd, interview, rewriter, analysis, screening
+from services.registry import ServiceRegistry
 
-app = FastAPI(title="HireSense API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the analyzer and its LLM provider connection pool once per process
+    app.state.services = ServiceRegistry()
+    yield
+    # Release pooled LLM provider connections on shutdown
+    await app.state.services.close()
+
+# orjson renders the (already validated) response bodies much faster than the stdlib encoder
+app = FastAPI(title="HireSense API", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Enable CORS for frontend
 app.add_middleware(
@@ -23,7 +35,14 @@ app.include_router(resume.router)
 app.include_router(jd.router)
 app.include_router(interview.router)
 app.include_router(rewriter.router)
+app.include_router(analysis.router)
+app.include_router(screening.router)
 
 @app.get("/")
 async def root():
     return {"message": "HireSense API is running"}
+
+@app.get("/api/stats")
+async def stats():
+    """Runtime counters for caches and other shared services"""
+    return app.state.services.stats()
@@ -0,0 +1,370 @@
+"""
+Local stand-in for the Cerebras chat-completions API, for load tests and capacity planning
+
+Replies are canned but schema-valid for every HireSense prompt, and arrive with
+realistic timing: a sampled time to first token, then output at a fixed token rate.
+Error and 429 rates and a concurrency cap exercise the retry and backoff paths.
+
+    python mock_llm_server.py --port 9100 --latency-median 0.6 --latency-p95 2.0 --tokens-per-second 300
+    LLM_BASE_URL=http://127.0.0.1:9100 CEREBRAS_API_KEY=mock uvicorn main:app
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from services.prompt_budget import count_tokens
+from services.prompts import MISSING_FIELDS_INSTRUCTIONS, PROMPT_TEMPLATES
+
+# Text that precedes the field list in a missing-fields follow-up
+MISSING_FIELDS_MARKER = MISSING_FIELDS_INSTRUCTIONS.split("{fields}")[0]
+
+# Tokens per streamed chunk
+CHUNK_TOKENS = 4
+
+CANNED_REPLIES: Dict[str, Any] = {
+    "analysis": {
+        "match_score": 64,
+        "overall_assessment": "Solid backend experience, but the resume doesn't show the container and cloud work this role centres on.",
+        "why_not_passing": {
+            "main_reasons": [
+                "No evidence of Docker or Kubernetes in production",
+                "Cloud experience is implied rather than stated",
+                "Impact is described without metrics",
+            ],
+            "ats_perspective": "Several required keywords are missing, so the resume ranks below candidates who list them explicitly.",
+        },
+        "missing_keywords": [
+            {"keyword": "Docker", "importance": "high", "why_matters": "Every service in this team ships as a container."},
+            {"keyword": "Kubernetes", "importance": "high", "why_matters": "Deployments and scaling run on Kubernetes."},
+            {"keyword": "AWS", "importance": "medium", "why_matters": "The platform is hosted on AWS."},
+            {"keyword": "System Design", "importance": "medium", "why_matters": "The role owns service boundaries end to end."},
+        ],
+        "gap_analysis": {
+            "experience_gaps": "Two years short of the senior level the posting asks for.",
+            "skills_gaps": "Containers, orchestration and cloud infrastructure.",
+            "qualification_gaps": "No cloud certification, which the posting lists as a plus.",
+        },
+        "section_detailed_feedback": {
+            "Summary": {
+                "current_state": "Generic statement about being a passionate engineer.",
+                "problem": "Doesn't name the target role or the stack.",
+                "impact": "Recruiters can't tell within seconds whether the profile fits.",
+            },
+            "Experience": {
+                "current_state": "Lists responsibilities for each role.",
+                "problem": "No outcomes or numbers.",
+                "impact": "Achievements read as duties, which weakens seniority signals.",
+            },
+        },
+        "actionable_next_steps": [
+            "Add a project that deploys a service with Docker and Kubernetes",
+            "Quantify the impact of the three most recent accomplishments",
+            "Rewrite the summary around the backend platform role",
+        ],
+    },
+    "questions": [
+        {
+            "question": "Walk me through how you would containerise and deploy one of your services.",
+            "category": "technical",
+            "focus_area": "Docker",
+            "why_asking": "Docker is required and missing from the resume.",
+        },
+        {
+            "question": "Tell me about a time you had to scale a system under growing load.",
+            "category": "behavioral",
+            "focus_area": "System Design",
+            "why_asking": "Checks design experience the resume doesn't show.",
+        },
+        {
+            "question": "How would you roll out a breaking API change without downtime?",
+            "category": "situational",
+            "focus_area": "Kubernetes",
+            "why_asking": "Probes deployment practices.",
+        },
+    ],
+    "evaluation": {
+        "score": 72,
+        "star_analysis": {
+            "situation": "Clear context about the team and system.",
+            "task": "Goal stated, but ownership is vague.",
+            "action": "Concrete technical steps described.",
+            "result": "Outcome mentioned without numbers.",
+        },
+        "strengths": ["Specific technical detail", "Logical structure"],
+        "improvements": ["Quantify the result", "Make your own role explicit"],
+        "suggestion": "Close with a measurable outcome, e.g. latency or cost saved.",
+        "example_reframe": "I led the migration of our API to containers, cutting deploy time from 40 to 8 minutes.",
+    },
+    "rewrite": {
+        "original": "Worked on backend services",
+        "rewritten": "Led the redesign of three backend services in Python and Docker, cutting p95 latency by 45% for 2M monthly users.",
+        "improvements": {
+            "before_issues": ["Vague verb", "No scope", "No result"],
+            "after_strengths": ["Strong action verb", "Named technologies", "Quantified impact"],
+        },
+        "star_breakdown": {
+            "situation": "Backend services were slow at peak load",
+            "task": "Improve latency without a rewrite",
+            "action": "Redesigned the services and containerised them",
+            "result": "45% lower p95 latency",
+        },
+        "keywords_added": ["Python", "Docker"],
+        "impact_score_improvement": 35,
+    },
+}
+
+
+@dataclass
+class MockSettings:
+    """Timing and failure knobs, from MOCK_LLM_* variables or the command line"""
+    latency_distribution: str = "lognormal"  # fixed, exponential or lognormal
+    latency_median: float = 0.5  # seconds to first token
+    latency_p95: float = 1.5  # lognormal only
+    tokens_per_second: float = 400.0  # output rate, 0 = all at once
+    error_rate: float = 0.0  # share of requests answered with a 500
+    rate_limit_rate: float = 0.0  # share of requests answered with a 429
+    retry_after: float = 1.0  # Retry-After sent with 429s
+    max_concurrency: int = 0  # requests beyond this get a 429, 0 = unlimited
+    seed: Optional[int] = None
+
+    @classmethod
+    def from_env(cls) -> "MockSettings":
+        seed = os.getenv("MOCK_LLM_SEED")
+        return cls(
+            latency_distribution=os.getenv("MOCK_LLM_LATENCY_DISTRIBUTION", "lognormal"),
+            latency_median=float(os.getenv("MOCK_LLM_LATENCY_MEDIAN", "0.5")),
+            latency_p95=float(os.getenv("MOCK_LLM_LATENCY_P95", "1.5")),
+            tokens_per_second=float(os.getenv("MOCK_LLM_TOKENS_PER_SECOND", "400")),
+            error_rate=float(os.getenv("MOCK_LLM_ERROR_RATE", "0")),
+            rate_limit_rate=float(os.getenv("MOCK_LLM_RATE_LIMIT_RATE", "0")),
+            retry_after=float(os.getenv("MOCK_LLM_RETRY_AFTER", "1")),
+            max_concurrency=int(os.getenv("MOCK_LLM_MAX_CONCURRENCY", "0")),
+            seed=int(seed) if seed else None,
+        )
+
+
+class MockLLM:
+    """Samples timings and failures and builds chat-completion payloads"""
+
+    def __init__(self, settings: MockSettings):
+        if settings.latency_distribution not in ("fixed", "exponential", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {settings.latency_distribution}")
+        self.settings = settings
+        self.random = random.Random(settings.seed)
+        # p95 of a lognormal sits 1.645 standard deviations above the median in log space
+        self._sigma = math.log(max(settings.latency_p95, settings.latency_median) / settings.latency_median) / 1.645 \
+            if settings.latency_median > 0 else 0.0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = 0
+        self.streams = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.truncated = 0
+        self.completion_tokens = 0
+
+    def first_token_delay(self) -> float:
+        median = self.settings.latency_median
+        if median <= 0 or self.settings.latency_distribution == "fixed":
+            return max(median, 0.0)
+        if self.settings.latency_distribution == "exponential":
+            return self.random.expovariate(math.log(2) / median)
+        return self.random.lognormvariate(math.log(median), self._sigma)
+
+    def failure(self) -> Optional[JSONResponse]:
+        """A 429 or 500 for this request, or None to answer it"""
+        settings = self.settings
+        if settings.max_concurrency and self.in_flight >= settings.max_concurrency:
+            return self._rate_limited("Too many concurrent requests")
+
+        roll = self.random.random()
+        if roll < settings.rate_limit_rate:
+            return self._rate_limited("Rate limit exceeded")
+        if roll < settings.rate_limit_rate + settings.error_rate:
+            self.errors += 1
+            return JSONResponse(
+                status_code=500,
+                content={"message": "Mock internal server error", "type": "server_error", "code": "500"},
+            )
+        return None
+
+    def _rate_limited(self, message: str) -> JSONResponse:
+        self.rate_limited += 1
+        return JSONResponse(
+            status_code=429,
+            content={"message": message, "type": "too_many_requests_error", "code": "429"},
+            headers={"Retry-After": f"{self.settings.retry_after:g}"},
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "settings": asdict(self.settings),
+            "requests": self.requests,
+            "streams": self.streams,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "errors": self.errors,
+            "rate_limited": self.rate_limited,
+            "truncated": self.truncated,
+            "completion_tokens": self.completion_tokens,
+        }
+
+
+def reply_content(messages: List[Dict[str, str]]) -> str:
+    """Canned JSON for the prompt template the request was built from"""
+    system = next((m["content"] for m in messages if m.get("role") == "system"), "")
+    user = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "")
+    template = PROMPT_TEMPLATES.get(system)
+    reply = CANNED_REPLIES.get(template.name if template is not None else "", {"message": "ok"})
+
+    # A missing-fields follow-up only wants the listed fields back
+    if MISSING_FIELDS_MARKER in user and isinstance(reply, dict):
+        fields = [field.strip() for field in user.rsplit(MISSING_FIELDS_MARKER, 1)[1].split(",")]
+        reply = {field: reply[field] for field in fields if field in reply}
+    return json.dumps(reply, indent=2)
+
+
+def limit_tokens(content: str, max_tokens: int, model: str) -> tuple:
+    """(content, finish_reason) with content cut to max_tokens, as a real model stops at the limit"""
+    if not max_tokens or count_tokens(content, model) <= max_tokens:
+        return content, "stop"
+    chars = len(content) * max_tokens // count_tokens(content, model)
+    return content[:chars], "length"
+
+
+def usage(prompt_tokens: int, completion_tokens: int) -> Dict[str, int]:
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def create_app(settings: Optional[MockSettings] = None) -> FastAPI:
+    mock = MockLLM(settings or MockSettings.from_env())
+    app = FastAPI(title="HireSense mock LLM")
+    app.state.mock = mock
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        mock.requests += 1
+        failure = mock.failure()
+        if failure is not None:
+            return failure
+
+        model = body.get("model", "mock")
+        messages = body.get("messages", [])
+        max_tokens = body.get("max_completion_tokens") or body.get("max_tokens") or 0
+        content, finish_reason = limit_tokens(reply_content(messages), max_tokens, model)
+        prompt_tokens = count_tokens("".join(m.get("content", "") for m in messages), model)
+        completion_tokens = count_tokens(content, model)
+        if finish_reason == "length":
+            mock.truncated += 1
+        mock.completion_tokens += completion_tokens
+
+        response_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        tokens_per_second = mock.settings.tokens_per_second
+        mock.in_flight += 1
+        mock.max_in_flight = max(mock.max_in_flight, mock.in_flight)
+
+        if not body.get("stream"):
+            try:
+                generation = completion_tokens / tokens_per_second if tokens_per_second > 0 else 0.0
+                await asyncio.sleep(mock.first_token_delay() + generation)
+            finally:
+                mock.in_flight -= 1
+            return {
+                "id": response_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "system_fingerprint": "fp_mock",
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": finish_reason,
+                    "message": {"role": "assistant", "content": content},
+                }],
+                "usage": usage(prompt_tokens, completion_tokens),
+                "time_info": {},
+            }
+
+        mock.streams += 1
+
+        def chunk(delta: Dict[str, Any], finish: Optional[str] = None, **extra: Any) -> str:
+            payload = {
+                "id": response_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "system_fingerprint": "fp_mock",
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+                **extra,
+            }
+            return f"data: {json.dumps(payload)}\n\n"
+
+        async def events() -> AsyncIterator[str]:
+            try:
+                await asyncio.sleep(mock.first_token_delay())
+                yield chunk({"role": "assistant"})
+                step = max(1, len(content) * CHUNK_TOKENS // max(completion_tokens, 1))
+                for start in range(0, len(content), step):
+                    piece = content[start:start + step]
+                    if tokens_per_second > 0:
+                        await asyncio.sleep(count_tokens(piece, model) / tokens_per_second)
+                    yield chunk({"content": piece})
+                yield chunk({}, finish_reason, usage=usage(prompt_tokens, completion_tokens), time_info={})
+                yield "data: [DONE]\n\n"
+            finally:
+                mock.in_flight -= 1
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/stats")
+    async def stats():
+        return mock.stats()
+
+    return app
+
+
+def main() -> None:
+    defaults = MockSettings.from_env()
+    parser = argparse.ArgumentParser(description="Mock chat-completions server for load testing HireSense")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.getenv("MOCK_LLM_PORT", "9100")))
+    parser.add_argument("--latency-distribution", choices=["fixed", "exponential", "lognormal"],
+                        default=defaults.latency_distribution)
+    parser.add_argument("--latency-median", type=float, default=defaults.latency_median,
+                        help="median seconds to first token")
+    parser.add_argument("--latency-p95", type=float, default=defaults.latency_p95,
+                        help="p95 seconds to first token (lognormal)")
+    parser.add_argument("--tokens-per-second", type=float, default=defaults.tokens_per_second,
+                        help="output token rate, 0 = instant")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="share of 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=defaults.rate_limit_rate,
+                        help="share of 429 responses")
+    parser.add_argument("--retry-after", type=float, default=defaults.retry_after)
+    parser.add_argument("--max-concurrency", type=int, default=defaults.max_concurrency,
+                        help="concurrent requests before answering 429, 0 = unlimited")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args()
+
+    settings = MockSettings(**{
+        field: getattr(args, field) for field in MockSettings.__dataclass_fields__
+    })
+    print(f"🧪 Mock LLM on http://{args.host}:{args.port} with {settings}")
+    uvicorn.run(create_app(settings), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
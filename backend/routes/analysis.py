@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from typing import Dict, Any, Optional
+from services.ai_analyzer import AIAnalyzer
+from services.deadlines import latency_budget
+from services.prescorer import prescore
+from services.registry import get_analyzer, get_resume_store
+from services.resume_store import ResumeStore
+from routes.resume import resolve_resume_text
+import json
+
+router = APIRouter(prefix="/api/analysis", tags=["Resume Analysis"])
+
+class AnalysisRequest(BaseModel):
+    resume_text: Optional[str] = None
+    resume_id: Optional[str] = None  # From /api/resume/upload, instead of resume_text
+    job_description: str
+
+@router.post("/prescore")
+async def prescore_resume(
+    payload: AnalysisRequest,
+    resume_store: ResumeStore = Depends(get_resume_store)
+) -> Dict[str, Any]:
+    """
+    Instant local keyword match score, no LLM call
+    Returns match_score plus matched and missing job description terms
+    """
+    resume_text = await resolve_resume_text(resume_store, payload.resume_text, payload.resume_id)
+    return prescore(resume_text, payload.job_description)
+
+@router.post("/stream", dependencies=[Depends(latency_budget("analysis"))])
+async def stream_analysis(
+    payload: AnalysisRequest,
+    include_tokens: bool = False,
+    use_cache: bool = True,
+    analyzer: AIAnalyzer = Depends(get_analyzer),
+    resume_store: ResumeStore = Depends(get_resume_store)
+):
+    """
+    Stream resume analysis as newline-delimited JSON
+
+    Each line is one event:
+    - {"event": "preview", "value": ...} local keyword score, sent immediately
+    - {"event": "section", "key": ..., "value": ...} when a top-level field is complete
+    - {"event": "token", "text": ...} raw model output (only with include_tokens=true)
+    - {"event": "done", "fallback": bool} once the analysis is finished
+    """
+
+    resume_text = await resolve_resume_text(resume_store, payload.resume_text, payload.resume_id)
+
+    if not payload.job_description.strip():
+        raise HTTPException(status_code=400, detail="Job description cannot be empty")
+
+    async def event_stream():
+        async for event in analyzer.stream_analysis(
+            resume_text=resume_text,
+            job_description=payload.job_description,
+            use_cache=use_cache
+        ):
+            if event["event"] == "token" and not include_tokens:
+                continue
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="application/x-ndjson",
+        # Stop reverse proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
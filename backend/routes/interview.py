@@ -1,135 +1,314 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form
 from pydantic import BaseModel
 from typing import Dict, Any, List, Optional
 from services.ai_analyzer import AIAnalyzer
-from services.pdf_parcer import extract_text_from_pdf
+from services.deadlines import latency_budget
+from services.registry import get_analyzer, get_resume_store, get_session_store
+from services.resume_store import ResumeStore
+from services.response_models import (
+    AnswerFeedback,
+    InterviewSummary,
+    QuestionsResponse,
+    SessionEvaluationResponse,
+    SessionView,
+    StartInterviewResponse,
+)
+from services.session_store import SessionStore
+from routes.resume import resolve_resume_text
+import asyncio
 import json
 
 router = APIRouter(prefix="/api/interview", tags=["Mock Interview"])
 
+# Requests with a session_id (from /start-interview) load the resume, job description
+# and analysis from the server-side session, so those fields can be left out
+
 class InterviewQuestionRequest(BaseModel):
-    resume_text: str
-    job_description: str
-    analysis: Dict[str, Any]  # Previous analysis results
+    session_id: Optional[str] = None
+    resume_text: Optional[str] = None
+    resume_id: Optional[str] = None  # From /api/resume/upload, instead of resume_text
+    job_description: Optional[str] = None
+    analysis: Optional[Dict[str, Any]] = None  # Previous analysis results
     question_count: int = 5
 
 class AnswerFeedbackRequest(BaseModel):
+    session_id: Optional[str] = None
+    question: str
+    answer: str
+    job_description: Optional[str] = None
+    resume_context: Optional[str] = None
+    resume_id: Optional[str] = None
+
+class QuestionAnswer(BaseModel):
     question: str
     answer: str
-    job_description: str
+
+class SessionEvaluationRequest(BaseModel):
+    session_id: Optional[str] = None
+    job_description: Optional[str] = None
+    analysis: Optional[Dict[str, Any]] = None
+    answers: List[QuestionAnswer]
     resume_context: Optional[str] = None
+    resume_id: Optional[str] = None
 
 class InterviewSession(BaseModel):
     session_id: str
-    resume_text: str
-    job_description: str
-    analysis: Dict[str, Any]
-    questions: List[str] = []
-    answers: List[Dict[str, Any]] = []
-
-@router.post("/generate-questions")
-async def generate_interview_questions(payload: InterviewQuestionRequest) -> Dict[str, Any]:
+    resume_text: Optional[str] = None
+    resume_id: Optional[str] = None
+    job_description: Optional[str] = None
+    analysis: Optional[Dict[str, Any]] = None
+    questions: Optional[List[str]] = None
+    answers: Optional[List[Dict[str, Any]]] = None
+
+async def load_session(store: SessionStore, session_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Stored interview session for a request, None if the request has no session_id
+    """
+    if not session_id:
+        return None
+
+    session = await store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Interview session not found or expired")
+    return session
+
+def require_job_description(job_description: Optional[str]) -> str:
+    if not (job_description or "").strip():
+        raise HTTPException(status_code=400, detail="Either job_description or session_id is required")
+    return job_description
+
+@router.get("/sessions/{session_id}", response_model=SessionView)
+async def get_session(
+    session_id: str,
+    session_store: SessionStore = Depends(get_session_store)
+) -> Dict[str, Any]:
+    """
+    Stored interview session: analysis, questions and evaluated answers so far
+    Resume and job description text are left out; the resume is available through resume_id
+    """
+    return await load_session(session_store, session_id)
+
+@router.post("/generate-questions", response_model=QuestionsResponse, dependencies=[Depends(latency_budget("questions"))])
+async def generate_interview_questions(
+    payload: InterviewQuestionRequest,
+    use_cache: bool = False,  # Questions are sampled; reuse a cached set only when asked
+    analyzer: AIAnalyzer = Depends(get_analyzer),
+    resume_store: ResumeStore = Depends(get_resume_store),
+    session_store: SessionStore = Depends(get_session_store)
+) -> Dict[str, Any]:
     """
     Generate targeted interview questions based on resume analysis
     Focuses on weak areas and missing skills
     """
+    session = await load_session(session_store, payload.session_id) or {}
+    resume_text = await resolve_resume_text(
+        resume_store, payload.resume_text or session.get("resume_text"), payload.resume_id
+    )
+    job_description = require_job_description(payload.job_description or session.get("job_description"))
+    analysis = payload.analysis if payload.analysis is not None else session.get("analysis", {})
+    
     try:
-        analyzer = AIAnalyzer()
-        questions = analyzer.generate_interview_questions(
-            resume_text=payload.resume_text,
-            job_description=payload.job_description,
-            analysis=payload.analysis,
-            count=payload.question_count
+        questions = await analyzer.generate_interview_questions(
+            resume_text=resume_text,
+            job_description=job_description,
+            analysis=analysis,
+            count=payload.question_count,
+            use_cache=use_cache
         )
         
+        if session:
+            await session_store.update(session["session_id"], questions=questions)
+        
         return {
             "questions": questions,
             "total": len(questions),
-            "focus_areas": payload.analysis.get("missing_keywords", [])[:5]
+            "focus_areas": analysis.get("missing_keywords", [])[:5]
         }
     
     except Exception as e:
         print(f"❌ Question generation error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to generate questions: {str(e)}")
 
-@router.post("/evaluate-answer")
-async def evaluate_answer(payload: AnswerFeedbackRequest) -> Dict[str, Any]:
+@router.post("/evaluate-answer", response_model=AnswerFeedback, dependencies=[Depends(latency_budget("evaluation"))])
+async def evaluate_answer(
+    payload: AnswerFeedbackRequest,
+    use_cache: bool = True,
+    analyzer: AIAnalyzer = Depends(get_analyzer),
+    resume_store: ResumeStore = Depends(get_resume_store),
+    session_store: SessionStore = Depends(get_session_store)
+) -> Dict[str, Any]:
     """
     Evaluate user's answer using STAR framework
     Provides constructive feedback
+    With a session_id the evaluated answer is also recorded in the session
     """
+    session = await load_session(session_store, payload.session_id) or {}
+    resume_context = await resolve_resume_text(
+        resume_store, payload.resume_context or session.get("resume_text"), payload.resume_id, required=False
+    )
+    job_description = require_job_description(payload.job_description or session.get("job_description"))
+    
     try:
-        analyzer = AIAnalyzer()
-        feedback = analyzer.evaluate_interview_answer(
+        feedback = await analyzer.evaluate_interview_answer(
             question=payload.question,
             answer=payload.answer,
-            job_description=payload.job_description,
-            resume_context=payload.resume_context
+            job_description=job_description,
+            resume_context=resume_context,
+            use_cache=use_cache
         )
         
+        if session:
+            await session_store.add_answers(session["session_id"], [
+                {"question": payload.question, "answer": payload.answer, "feedback": feedback}
+            ])
+        
         return feedback
     
     except Exception as e:
         print(f"❌ Answer evaluation error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to evaluate answer: {str(e)}")
 
-@router.post("/complete-interview")
-async def complete_interview(session: InterviewSession) -> Dict[str, Any]:
+@router.post("/evaluate-session", response_model=SessionEvaluationResponse, dependencies=[Depends(latency_budget("session_evaluation"))])
+async def evaluate_session(
+    payload: SessionEvaluationRequest,
+    concurrency: Optional[int] = Query(None, ge=1, le=16),
+    use_cache: bool = True,
+    analyzer: AIAnalyzer = Depends(get_analyzer),
+    resume_store: ResumeStore = Depends(get_resume_store),
+    session_store: SessionStore = Depends(get_session_store)
+) -> Dict[str, Any]:
+    """
+    Evaluate every answer of an interview session in one request
+    Answers are scored concurrently and the session summary is returned alongside
+    """
+    if not payload.answers:
+        raise HTTPException(status_code=400, detail="At least one answer is required")
+    
+    session = await load_session(session_store, payload.session_id) or {}
+    resume_context = await resolve_resume_text(
+        resume_store, payload.resume_context or session.get("resume_text"), payload.resume_id, required=False
+    )
+    job_description = require_job_description(payload.job_description or session.get("job_description"))
+    analysis = payload.analysis if payload.analysis is not None else session.get("analysis", {})
+    
+    try:
+        pairs = [pair.model_dump() for pair in payload.answers]
+        feedbacks = await analyzer.evaluate_interview_answers(
+            answers=pairs,
+            job_description=job_description,
+            resume_context=resume_context,
+            concurrency=concurrency,
+            use_cache=use_cache
+        )
+        
+        evaluations = [
+            {**pair, "feedback": feedback}
+            for pair, feedback in zip(pairs, feedbacks)
+        ]
+        summary = analyzer.generate_interview_summary(
+            questions=[pair["question"] for pair in pairs],
+            answers=evaluations,
+            analysis=analysis
+        )
+        
+        if session:
+            await session_store.add_answers(session["session_id"], evaluations)
+            await session_store.update(session["session_id"], summary=summary)
+        
+        return {
+            "evaluations": evaluations,
+            "summary": summary
+        }
+    
+    except Exception as e:
+        print(f"❌ Session evaluation error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to evaluate session: {str(e)}")
+
+@router.post("/complete-interview", response_model=InterviewSummary)
+async def complete_interview(
+    session: InterviewSession,
+    analyzer: AIAnalyzer = Depends(get_analyzer),
+    session_store: SessionStore = Depends(get_session_store)
+) -> Dict[str, Any]:
     """
     Generate comprehensive interview feedback
+    Fields left out of the body are taken from the stored session, if there is one
     """
+    stored = await session_store.get(session.session_id) or {}
+    
     try:
-        analyzer = AIAnalyzer()
         feedback = analyzer.generate_interview_summary(
-            questions=session.questions,
-            answers=session.answers,
-            analysis=session.analysis
+            questions=session.questions if session.questions is not None else stored.get("questions", []),
+            answers=session.answers if session.answers is not None else stored.get("answers", []),
+            analysis=session.analysis if session.analysis is not None else stored.get("analysis", {})
         )
         
+        if stored:
+            await session_store.update(session.session_id, summary=feedback)
+        
         return feedback
     
     except Exception as e:
         print(f"❌ Interview completion error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to generate summary: {str(e)}")
 
-@router.post("/start-interview")
+@router.post("/start-interview", response_model=StartInterviewResponse, dependencies=[Depends(latency_budget("start_interview"))])
 async def start_interview(
     file: UploadFile = File(...),
-    job_description: str = Form(...)
+    job_description: str = Form(...),
+    use_cache: bool = True,
+    analyzer: AIAnalyzer = Depends(get_analyzer),
+    resume_store: ResumeStore = Depends(get_resume_store),
+    session_store: SessionStore = Depends(get_session_store)
 ) -> Dict[str, Any]:
     """
     Complete workflow: Upload resume, analyze with AI, and generate interview questions
     
     Returns:
+    - session_id: Server-side session holding the resume, job description, analysis and questions
+    - resume_id: Content hash of the PDF, usable instead of resume_text in later calls
     - resume_text: Extracted text from PDF
     - filename: Original filename
     - analysis: AI-powered resume analysis (match score, gaps, feedback)
     - interview: Generated questions based on weak areas
     """
     try:
-        # Step 1: Extract text from PDF
+        # Step 1: Extract text from PDF (skipped if this exact file was parsed before)
         pdf_content = await file.read()
-        resume_text = extract_text_from_pdf(pdf_content)
-        
-        if not resume_text.strip():
-            raise HTTPException(status_code=400, detail="Could not extract text from PDF")
+        try:
+            record, _ = await resume_store.parse(pdf_content, filename=file.filename)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Could not extract text from PDF: {str(e)}")
+        resume_text = record["resume_text"]
         
-        # Step 2: AI Analysis
-        analyzer = AIAnalyzer()
-        analysis = analyzer.analyze_resume(
-            resume_text=resume_text,
-            job_description=job_description
+        # Step 2: Run AI analysis and question generation side by side.
+        # Questions are seeded from a local keyword gap instead of waiting for the full analysis.
+        keyword_gap_analysis = analyzer.build_keyword_gap_analysis(resume_text, job_description)
+        analysis, questions = await asyncio.gather(
+            analyzer.analyze_resume(
+                resume_text=resume_text,
+                job_description=job_description,
+                use_cache=use_cache
+            ),
+            analyzer.generate_interview_questions(
+                resume_text=resume_text,
+                job_description=job_description,
+                analysis=keyword_gap_analysis,
+                count=5
+            )
         )
         
-        # Step 3: Generate interview questions based on analysis
-        questions = analyzer.generate_interview_questions(
+        session = await session_store.create(
             resume_text=resume_text,
             job_description=job_description,
             analysis=analysis,
-            count=5
+            questions=questions,
+            resume_id=record["resume_id"]
         )
         
         return {
+            "session_id": session["session_id"],
+            "resume_id": record["resume_id"],
             "resume_text": resume_text,
             "filename": file.filename,
             "analysis": analysis,
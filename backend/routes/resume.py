@@ -1,19 +1,52 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from services.pdf_parcer import extract_text_from_pdf
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
+from typing import Dict, Any, Optional
+from services.registry import get_resume_store
+from services.resume_store import ResumeStore
 
 router = APIRouter(prefix="/api/resume", tags=["Resume"])
 
+async def resolve_resume_text(
+    store: ResumeStore,
+    resume_text: Optional[str],
+    resume_id: Optional[str],
+    required: bool = True
+) -> Optional[str]:
+    """
+    Resume text for requests that send either resume_text or a resume_id from /upload
+    """
+    try:
+        text = await store.resolve_text(resume_text, resume_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Resume not found, upload it again")
+
+    if required and not (text or "").strip():
+        raise HTTPException(status_code=400, detail="Either resume_text or resume_id is required")
+    return text
+
 @router.post("/upload")
-async def upload_resume(file: UploadFile = File(...)):
+async def upload_resume(
+    file: UploadFile = File(...),
+    resume_store: ResumeStore = Depends(get_resume_store)
+):
     if file.content_type != "application/pdf":
         raise HTTPException(status_code=400, detail="Only PDF files are allowed")
 
     try:
-        text = extract_text_from_pdf(file)
+        record, cached = await resume_store.parse(await file.read(), filename=file.filename)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    return {
-        "filename": file.filename,
-        "resume_text": text
-    }
+    return {**record, "filename": file.filename, "cached": cached}
+
+@router.get("/{resume_id}")
+async def get_resume(
+    resume_id: str,
+    resume_store: ResumeStore = Depends(get_resume_store)
+) -> Dict[str, Any]:
+    """
+    Previously uploaded resume by its content hash
+    """
+    record = await resume_store.get(resume_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    return record
@@ -1,10 +1,37 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, Path
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from starlette.background import BackgroundTask
+from typing import Dict, Any, List, Literal, Optional
 from services.ai_analyzer import AIAnalyzer
-from services.pdf_generator import PDFScorecard
-import io
+from services.deadlines import latency_budget
+from services.registry import (
+    get_analyzer,
+    get_resume_store,
+    get_scorecard_cache,
+    get_scorecard_renderer,
+    get_session_store,
+)
+from services.resume_store import ResumeStore
+from services.response_models import StarRewrite
+from services.session_store import SessionStore
+from routes.resume import resolve_resume_text
+from routes.interview import load_session
+from services.scorecard_batch import (
+    MAX_BATCH_CANDIDATES,
+    MAX_COMBINED_PDF_CANDIDATES,
+    BatchCandidate,
+    build_combined_pdf,
+    stream_file,
+    stream_zip,
+)
+from services.scorecard_cache import ScorecardCache, etag_for, scorecard_fingerprint
+from services.scorecard_renderer import RendererBusy, ScorecardRenderer, iter_chunks
+from datetime import date
+import math
+import os
+import shutil
+import tempfile
 
 router = APIRouter(prefix="/api/rewriter", tags=["STAR Rewriter"])
 
@@ -12,14 +39,38 @@ class StarRewriteRequest(BaseModel):
     original_bullet: str
     job_description: str
     resume_context: Optional[str] = None
+    resume_id: Optional[str] = None  # Uploaded resume to use as context
 
 class ScorecardRequest(BaseModel):
-    analysis: Dict[str, Any]
+    session_id: Optional[str] = None  # Loads analysis and interview summary from the session
+    analysis: Optional[Dict[str, Any]] = None
     interview_summary: Optional[Dict[str, Any]] = None
     candidate_name: str = "Candidate"
 
-@router.post("/star-rewrite")
-async def rewrite_bullet_star(payload: StarRewriteRequest) -> Dict[str, Any]:
+class BatchScorecardRequest(BaseModel):
+    candidates: List[ScorecardRequest]
+    format: Literal["pdf", "zip"] = "pdf"  # One combined PDF with a ranking cover, or a zip of reports
+
+def pdf_attachment(pdf_bytes: bytes, filename: str, etag: Optional[str] = None) -> StreamingResponse:
+    """
+    Stream rendered PDF bytes as a download
+    Sent as memoryview slices of the one buffer, with its length known up front
+    """
+    headers = {
+        "Content-Disposition": f"attachment; filename={filename}",
+        "Content-Length": str(len(pdf_bytes))
+    }
+    if etag is not None:
+        headers.update({"ETag": etag, "Cache-Control": "private, no-cache"})
+    return StreamingResponse(iter_chunks(pdf_bytes), media_type="application/pdf", headers=headers)
+
+@router.post("/star-rewrite", response_model=StarRewrite, dependencies=[Depends(latency_budget("rewrite"))])
+async def rewrite_bullet_star(
+    payload: StarRewriteRequest,
+    use_cache: bool = True,
+    analyzer: AIAnalyzer = Depends(get_analyzer),
+    resume_store: ResumeStore = Depends(get_resume_store)
+) -> Dict[str, Any]:
     """
     Rewrite a resume bullet point using STAR framework
     Emphasizes impact over tasks
@@ -31,12 +82,16 @@ async def rewrite_bullet_star(payload: StarRewriteRequest) -> Dict[str, Any]:
     if not payload.job_description.strip():
         raise HTTPException(status_code=400, detail="Job description cannot be empty")
     
+    resume_context = await resolve_resume_text(
+        resume_store, payload.resume_context, payload.resume_id, required=False
+    )
+    
     try:
-        analyzer = AIAnalyzer()
-        result = analyzer.rewrite_bullet_with_star(
+        result = await analyzer.rewrite_bullet_with_star(
             original_bullet=payload.original_bullet,
             job_description=payload.job_description,
-            resume_context=payload.resume_context
+            resume_context=resume_context,
+            use_cache=use_cache
         )
         
         return result
@@ -48,32 +103,193 @@ async def rewrite_bullet_star(payload: StarRewriteRequest) -> Dict[str, Any]:
             detail=f"STAR rewrite failed: {str(e)}"
         )
 
+def scorecard_filename(candidate_name: str) -> str:
+    return f"HireSense_Scorecard_{candidate_name.replace(' ', '_')}.pdf"
+
+def scorecard_location(fingerprint: str) -> str:
+    return f"{router.prefix}/scorecards/{fingerprint}"
+
+async def render_scorecard(
+    renderer: ScorecardRenderer,
+    scorecard_cache: ScorecardCache,
+    fingerprint: str,
+    analysis: Dict[str, Any],
+    interview_summary: Optional[Dict[str, Any]],
+    candidate_name: str,
+    generated_on: date
+) -> bytes:
+    """
+    Scorecard PDF from the cache, rendered in the scorecard worker pool on a miss
+    Busy and failed renders become 503 and 500 responses
+    """
+    try:
+        return await scorecard_cache.get_or_render(
+            fingerprint,
+            lambda: renderer.render(
+                analysis=analysis,
+                interview_summary=interview_summary,
+                candidate_name=candidate_name,
+                generated_on=generated_on
+            )
+        )
+    
+    except RendererBusy as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))}
+        )
+    except Exception as e:
+        print(f"❌ PDF generation error: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"PDF generation failed: {str(e)}"
+        )
+
 @router.post("/generate-scorecard")
-async def generate_pdf_scorecard(payload: ScorecardRequest):
+async def generate_pdf_scorecard(
+    payload: ScorecardRequest,
+    session_store: SessionStore = Depends(get_session_store),
+    renderer: ScorecardRenderer = Depends(get_scorecard_renderer),
+    scorecard_cache: ScorecardCache = Depends(get_scorecard_cache)
+):
     """
     Generate downloadable PDF scorecard with analysis and interview results
+    Repeat downloads of the same inputs on the same day are served from the scorecard cache.
+    Content-Location names the GET resource for this exact report, which supports If-None-Match
     """
     
-    try:
-        generator = PDFScorecard()
-        pdf_bytes = generator.generate_full_scorecard(
-            analysis=payload.analysis,
-            interview_summary=payload.interview_summary,
-            candidate_name=payload.candidate_name
+    session = await load_session(session_store, payload.session_id) or {}
+    analysis = payload.analysis if payload.analysis is not None else session.get("analysis")
+    if analysis is None:
+        raise HTTPException(status_code=400, detail="Either analysis or session_id is required")
+    interview_summary = payload.interview_summary or session.get("summary")
+    
+    # Rendering is deterministic given the date, so the fingerprint identifies the exact bytes
+    generated_on = date.today()
+    fingerprint = scorecard_fingerprint(analysis, interview_summary, payload.candidate_name, generated_on)
+    pdf_bytes = await render_scorecard(
+        renderer, scorecard_cache, fingerprint,
+        analysis, interview_summary, payload.candidate_name, generated_on
+    )
+    
+    # Return as downloadable PDF
+    response = pdf_attachment(pdf_bytes, scorecard_filename(payload.candidate_name), etag=etag_for(fingerprint))
+    response.headers["Content-Location"] = scorecard_location(fingerprint)
+    return response
+
+@router.get("/scorecards/{fingerprint}")
+async def get_rendered_scorecard(
+    fingerprint: str = Path(pattern="^[0-9a-f]{64}$"),
+    if_none_match: Optional[str] = Header(default=None),
+    scorecard_cache: ScorecardCache = Depends(get_scorecard_cache)
+):
+    """
+    A scorecard rendered earlier, by the fingerprint in generate-scorecard's Content-Location
+    The content behind a fingerprint never changes, so a matching If-None-Match always gets a 304
+    """
+    if scorecard_cache.not_modified(if_none_match, fingerprint):
+        return Response(status_code=304, headers={"ETag": etag_for(fingerprint)})
+    
+    pdf_bytes = await scorecard_cache.get(fingerprint)
+    if pdf_bytes is None:
+        raise HTTPException(status_code=404, detail="Scorecard is no longer cached, generate it again")
+    return pdf_attachment(pdf_bytes, scorecard_filename("Candidate"), etag=etag_for(fingerprint))
+
+@router.get("/sessions/{session_id}/scorecard")
+async def get_session_scorecard(
+    session_id: str,
+    candidate_name: str = "Candidate",
+    if_none_match: Optional[str] = Header(default=None),
+    session_store: SessionStore = Depends(get_session_store),
+    renderer: ScorecardRenderer = Depends(get_scorecard_renderer),
+    scorecard_cache: ScorecardCache = Depends(get_scorecard_cache)
+):
+    """
+    Scorecard for a stored interview session's analysis and summary
+    Revalidates with If-None-Match: the ETag changes when the session's results or the date do
+    """
+    session = await load_session(session_store, session_id)
+    if session.get("analysis") is None:
+        raise HTTPException(status_code=404, detail="Session has no analysis yet")
+    
+    generated_on = date.today()
+    fingerprint = scorecard_fingerprint(session["analysis"], session.get("summary"), candidate_name, generated_on)
+    if scorecard_cache.not_modified(if_none_match, fingerprint):
+        return Response(status_code=304, headers={"ETag": etag_for(fingerprint)})
+    
+    pdf_bytes = await render_scorecard(
+        renderer, scorecard_cache, fingerprint,
+        session["analysis"], session.get("summary"), candidate_name, generated_on
+    )
+    return pdf_attachment(pdf_bytes, scorecard_filename(candidate_name), etag=etag_for(fingerprint))
+
+@router.post("/generate-scorecards")
+async def generate_batch_scorecards(
+    payload: BatchScorecardRequest,
+    session_store: SessionStore = Depends(get_session_store),
+    renderer: ScorecardRenderer = Depends(get_scorecard_renderer)
+):
+    """
+    Export scorecards for many candidates at once
+    format=pdf: one PDF starting with a ranking table, reports in ranking order (bookmarked)
+    format=zip: ranking.csv plus one PDF per candidate, streamed as reports finish
+    Reports render in parallel in the scorecard worker pool
+    """
+    
+    if not payload.candidates:
+        raise HTTPException(status_code=400, detail="At least one candidate is required")
+    
+    limit = MAX_COMBINED_PDF_CANDIDATES if payload.format == "pdf" else MAX_BATCH_CANDIDATES
+    if len(payload.candidates) > limit:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {limit} candidates per {payload.format} export"
+            + (", use format=zip for larger batches" if payload.format == "pdf" else "")
         )
-        
-        # Return as downloadable PDF
+    
+    candidates = []
+    for index, entry in enumerate(payload.candidates):
+        session = await load_session(session_store, entry.session_id) or {}
+        analysis = entry.analysis if entry.analysis is not None else session.get("analysis")
+        if analysis is None:
+            raise HTTPException(status_code=400, detail=f"Candidate {index}: either analysis or session_id is required")
+        candidates.append(BatchCandidate(
+            candidate_name=entry.candidate_name,
+            analysis=analysis,
+            interview_summary=entry.interview_summary or session.get("summary")
+        ))
+    
+    if payload.format == "zip":
         return StreamingResponse(
-            io.BytesIO(pdf_bytes),
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename=HireSense_Scorecard_{payload.candidate_name.replace(' ', '_')}.pdf"
-            }
+            stream_zip(renderer, candidates),
+            media_type="application/zip",
+            headers={"Content-Disposition": "attachment; filename=HireSense_Scorecards.zip"}
         )
     
+    directory = tempfile.mkdtemp(prefix="hiresense-scorecards-")
+    try:
+        pdf_path = await build_combined_pdf(renderer, candidates, directory)
     except Exception as e:
-        print(f"❌ PDF generation error: {str(e)}")
+        shutil.rmtree(directory, ignore_errors=True)
+        print(f"❌ Batch PDF generation error: {str(e)}")
         raise HTTPException(
             status_code=500,
-            detail=f"PDF generation failed: {str(e)}"
+            detail=f"Batch PDF generation failed: {str(e)}"
         )
+    except BaseException:
+        # Cancelled, e.g. the client went away while reports were rendering
+        shutil.rmtree(directory, ignore_errors=True)
+        raise
+    
+    # Streamed from disk; the temporary directory is removed after the response, even
+    # if the client disconnects before the body is read
+    return StreamingResponse(
+        stream_file(pdf_path),
+        media_type="application/pdf",
+        background=BackgroundTask(shutil.rmtree, directory, ignore_errors=True),
+        headers={
+            "Content-Disposition": "attachment; filename=HireSense_Scorecards.pdf",
+            "Content-Length": str(os.path.getsize(pdf_path))
+        }
+    )
@@ -0,0 +1,77 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form
+from typing import Dict, Any, List, Optional
+from services.registry import get_screener
+from services.screening import BulkScreener
+
+router = APIRouter(prefix="/api/screening", tags=["Bulk Screening"])
+
+@router.post("/jobs")
+async def create_screening_job(
+    files: List[UploadFile] = File(...),
+    job_description: str = Form(...),
+    min_prescore: Optional[float] = Form(None, ge=0, le=100),
+    screener: BulkScreener = Depends(get_screener)
+) -> Dict[str, Any]:
+    """
+    Start a bulk screening job for many resumes against one job description
+    Accepts multiple PDFs and/or zip archives of PDFs; poll the returned job for progress
+    Resumes scoring below min_prescore on the local keyword match are not sent to the LLM
+    """
+    if not job_description.strip():
+        raise HTTPException(status_code=400, detail="Job description cannot be empty")
+
+    uploads = [(file.filename or "resume.pdf", await file.read()) for file in files]
+
+    try:
+        return await screener.submit(job_description, uploads, min_prescore=min_prescore)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/jobs/{job_id}")
+async def get_screening_job(
+    job_id: str,
+    screener: BulkScreener = Depends(get_screener)
+) -> Dict[str, Any]:
+    """
+    Job status and per-status candidate counts
+    """
+    job = await asyncio.to_thread(screener.store.get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Screening job not found")
+    return job
+
+@router.get("/jobs/{job_id}/results")
+async def get_screening_results(
+    job_id: str,
+    limit: Optional[int] = Query(None, ge=1),
+    screener: BulkScreener = Depends(get_screener)
+) -> Dict[str, Any]:
+    """
+    Candidates ranked by match_score (unscored candidates last)
+    """
+    job = await asyncio.to_thread(screener.store.get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Screening job not found")
+
+    return {
+        "job": job,
+        "results": await asyncio.to_thread(screener.store.ranked_results, job_id, limit=limit)
+    }
+
+@router.post("/jobs/{job_id}/resume")
+async def resume_screening_job(
+    job_id: str,
+    screener: BulkScreener = Depends(get_screener)
+) -> Dict[str, Any]:
+    """
+    Continue an interrupted job from its persisted progress
+    Also retries candidates left 'retryable' because the LLM was unavailable
+    """
+    job = await asyncio.to_thread(screener.store.get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Screening job not found")
+
+    started = screener.start(job_id)
+    job = await asyncio.to_thread(screener.store.get_job, job_id)
+    return {**job, "resumed": started}
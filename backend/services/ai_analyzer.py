@@ -1,33 +1,288 @@
+import asyncio
 import json
 import os
-from typing import Dict, Any, List
-from cerebras.cloud.sdk import Cerebras
+from contextlib import aclosing
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple, Type
 from dotenv import load_dotenv
+from pydantic import BaseModel
+from services.deadlines import iterate_within_deadline, within_deadline
+from services.hedging import HedgedRequests
+from services.json_repair import CLEAN, TRUNCATED, OutputRepairStats, extract_json, invalid_fields
+from services.json_stream import IncrementalJSONParser
+from services.llm_cache import LLMCache, completion_cache_key
+from services.llm_providers import LLMProvider
+from services.llm_scheduler import LLMScheduler
+from services.prescorer import prescore
+from services.prompt_budget import PromptBudgeter, count_tokens
+from services.prompts import (
+    ANALYSIS_PROMPT,
+    EVALUATION_PROMPT,
+    MISSING_FIELDS_INSTRUCTIONS,
+    QUESTIONS_PROMPT,
+    REWRITE_PROMPT,
+    PROMPT_TEMPLATES,
+    PrefixCacheStats,
+)
+from services.resume_segmenter import segment_resume
+from services.response_models import AnalysisResult, AnswerFeedback, InterviewQuestion, StarRewrite
+from services.single_flight import SingleFlight
+from services.skill_taxonomy import AhoCorasick
 
 # Load environment variables
 load_dotenv()
 
+# Sampling parameters for resume analysis (shared by the blocking and streaming paths)
+ANALYSIS_TEMPERATURE = 0.2
+ANALYSIS_MAX_TOKENS = 2048
+
+# STAR signal phrases for the rule-based answer evaluation, compiled once into a single automaton
+STAR_SIGNALS = {
+    "situation": ["when", "while", "during", "at", "in my role"],
+    "task": ["needed to", "required", "had to", "was responsible", "objective"],
+    "action": ["i", "implemented", "developed", "created", "led", "managed"],
+    "result": ["resulted", "achieved", "improved", "increased", "reduced", "%"],
+}
+STAR_MATCHER = AhoCorasick(
+    (phrase, component) for component, phrases in STAR_SIGNALS.items() for phrase in phrases
+)
+
+ACTION_VERBS = ["Led", "Developed", "Implemented", "Managed", "Created", "Optimized", "Designed"]
+ACTION_VERB_MATCHER = AhoCorasick((verb, verb) for verb in ACTION_VERBS)
+
 class AIAnalyzer:
     """
-    AI-powered resume analysis service using Cerebras AI
+    AI-powered resume analysis service using Cerebras AI (or another LLMProvider)
     Returns structured JSON output for resume analysis
     """
     
-    def __init__(self):
-        # Load API key from environment variables
-        self.api_key = os.getenv("CEREBRAS_API_KEY", "")
-        self.model = os.getenv("CEREBRAS_MODEL", "llama-3.3-70b")
-        
-        # Initialize Cerebras client if API key exists
-        self.client = None
-        if self.api_key and self.api_key != "your-cerebras-api-key-here":
-            try:
-                self.client = Cerebras(api_key=self.api_key)
-            except Exception as e:
-                print(f"Warning: Failed to initialize Cerebras client: {e}")
-                self.client = None
+    def __init__(
+        self,
+        provider: Optional[LLMProvider] = None,
+        model: Optional[str] = None,
+        cache: Optional[LLMCache] = None,
+        scheduler: Optional[LLMScheduler] = None,
+        hedging: Optional[HedgedRequests] = None
+    ):
+        # The caller owns the provider and closes it; routes get the lifespan registry's
+        self.model = model or os.getenv("CEREBRAS_MODEL", "llama-3.3-70b")
+        
+        # Shared LLM provider (None if no API key is configured: local fallbacks are used)
+        self.provider = provider
+        
+        # Optional cache of parsed responses keyed on the request content
+        self.cache = cache
+        
+        # Concurrency, rate limits and retries for every request sent to the provider
+        self.scheduler = scheduler or LLMScheduler.from_env()
+        
+        # Optional backup requests for calls that outlive the recent p95 latency
+        self.hedging = hedging or HedgedRequests.from_env()
+        
+        # Keeps prompt inputs within per-call token budgets
+        self.budget = PromptBudgeter(self.model)
+        
+        # Prefix-cache eligibility of the prompts sent to the provider
+        self.prompt_cache = PrefixCacheStats(self.model)
+        
+        # Identical requests already in flight share one upstream call
+        self.single_flight = SingleFlight()
+        
+        # Repaired, truncated and refilled JSON responses
+        self.output_repair = OutputRepairStats()
+        
+        # Upper bound on parallel LLM calls when evaluating a whole interview session
+        self.eval_concurrency = int(os.getenv("INTERVIEW_EVAL_CONCURRENCY", "4"))
+        
+    async def _create_completion(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        """
+        Send a chat completion request through the shared LLM provider
+        Returns the raw message content
+        Raises DeadlineExceeded if the request's latency budget runs out first
+        """
+        self.prompt_cache.record(system_prompt, user_prompt)
+        reserved_tokens = count_tokens(system_prompt + user_prompt, self.model) + max_tokens
+        template = PROMPT_TEMPLATES.get(system_prompt)
+        
+        async def send() -> Any:
+            return await self.scheduler.run(
+                lambda: self.provider.complete(
+                    self.model,
+                    [
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                ),
+                tokens=reserved_tokens
+            )
+        
+        response = await within_deadline(
+            self.hedging.call(template.name if template is not None else "other", send)
+        )
+        
+        self.scheduler.settle(reserved_tokens, response.usage)
+        self.prompt_cache.record_usage(response.usage)
+        return response.choices[0].message.content
+    
+    async def _stream_completion(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        max_tokens: int
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion through the shared LLM provider
+        Yields content deltas as they arrive
+        The scheduler admits and retries the request until the stream is open, and
+        holds its concurrency slot until the stream ends or this generator is closed
+        """
+        self.prompt_cache.record(system_prompt, user_prompt)
+        stream = self.scheduler.stream(
+            lambda: self.provider.stream(
+                self.model,
+                [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens
+            ),
+            tokens=count_tokens(system_prompt + user_prompt, self.model) + max_tokens
+        )
+        
+        # Closing this generator early closes the scheduler's stream too, releasing the slot
+        async with aclosing(stream):
+            async for chunk in stream:
+                if getattr(chunk, "usage", None) is not None:
+                    self.prompt_cache.record_usage(chunk.usage)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+    
+    async def _complete_json(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        max_tokens: int,
+        use_cache: bool = True,
+        schema: Optional[Type[BaseModel]] = None,
+        shared: bool = True
+    ) -> Any:
+        """
+        Get a parsed JSON completion, served from the response cache when possible
+        use_cache=False skips the lookup but still stores the fresh result
+        Identical requests already in flight are coalesced into one upstream call
+        shared=False is for sampled output every caller should get its own draw of:
+        no cache lookup, no coalescing and nothing stored
+        With a schema, fields missing from the reply are re-requested on their own;
+        fields still missing after that are left out and the result isn't cached
+        """
+        key = completion_cache_key(self.model, system_prompt, user_prompt, temperature, max_tokens)
+        if self.cache is not None and use_cache and shared:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                print("💾 LLM cache hit")
+                return cached
+        
+        async def complete() -> Any:
+            content = await self._create_completion(
+                system_prompt,
+                user_prompt,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+            print(f"✅ Received response ({len(content)} chars)")
+            
+            result, status = self._parse_json_content(content)
+            cacheable = status != TRUNCATED
+            
+            if schema is not None and isinstance(result, dict):
+                missing = invalid_fields(result, schema)
+                if missing:
+                    result = await self._complete_missing_fields(
+                        system_prompt, user_prompt, temperature, max_tokens, result, missing, schema
+                    )
+                cacheable = not invalid_fields(result, schema)
+            
+            # Only complete responses reach the cache
+            if self.cache is not None and cacheable and shared:
+                await self.cache.set(key, result)
+            return result
+        
+        if not shared:
+            return await complete()
+        return await self.single_flight.do(key, complete)
+    
+    async def _complete_missing_fields(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        max_tokens: int,
+        partial: Dict[str, Any],
+        missing: List[str],
+        schema: Type[BaseModel]
+    ) -> Dict[str, Any]:
+        """
+        Ask only for the fields a truncated or malformed reply didn't deliver
+        The original prompts are reused unchanged as the prefix, so the follow-up is prefix-cache friendly
+        Returns partial with whatever valid fields the follow-up supplied
+        """
+        result = {field: value for field, value in partial.items() if field not in missing}
+        print(f"🔁 Re-requesting {len(missing)} missing field(s): {', '.join(missing)}")
         
-    def analyze_resume(self, resume_text: str, job_description: str) -> Dict[str, Any]:
+        try:
+            content = await self._create_completion(
+                system_prompt,
+                user_prompt + MISSING_FIELDS_INSTRUCTIONS.format(fields=", ".join(missing)),
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+            refill, _ = self._parse_json_content(content)
+        except Exception as e:
+            print(f"❌ Could not re-request missing fields: {type(e).__name__}: {e}")
+            return result
+        
+        if isinstance(refill, dict):
+            supplied = {field: refill[field] for field in missing if field in refill}
+            still_invalid = invalid_fields({**result, **supplied}, schema)
+            filled = {field: value for field, value in supplied.items() if field not in still_invalid}
+            result.update(filled)
+            self.output_repair.record_refill(len(filled))
+        return result
+    
+    def _parse_json_content(self, content: str) -> Tuple[Any, str]:
+        """
+        Parse JSON from an LLM response wherever it sits in the text
+        Returns (value, status); trailing commas and truncation are repaired
+        """
+        try:
+            result, status = extract_json(content)
+        except json.JSONDecodeError:
+            self.output_repair.record("unparseable")
+            print(f"Response preview: {content[:500]}...")
+            raise
+        
+        self.output_repair.record(status)
+        if status != CLEAN:
+            print(f"🩹 Recovered {status} JSON response")
+        return result, status
+    
+    async def analyze_resume(
+        self,
+        resume_text: str,
+        job_description: str,
+        use_cache: bool = True,
+        fallback: bool = True
+    ) -> Optional[Dict[str, Any]]:
         """
         Analyze resume against job description using AI
         Returns structured JSON output
@@ -35,6 +290,9 @@ class AIAnalyzer:
         Args:
             resume_text: Extracted text from resume
             job_description: Job description text
+            use_cache: Set False to bypass cached analyses
+            fallback: Set False to get None instead of any local keyword analysis,
+                when the LLM is unavailable or its reply is still incomplete
             
         Returns:
             Structured analysis with match_score, missing_keywords, and section_feedback
@@ -43,356 +301,325 @@ class AIAnalyzer:
         system_prompt, user_prompt = self._build_analysis_prompt(resume_text, job_description)
         
         # Call LLM with proper prompts
-        analysis = self._call_llm(system_prompt, user_prompt)
+        analysis = await self._call_llm(system_prompt, user_prompt, use_cache=use_cache)
+        
+        if not fallback and (analysis is None or invalid_fields(analysis, AnalysisResult)):
+            return None
+        
+        if analysis is None:
+            analysis = self._build_local_analysis(resume_text, job_description)
+        elif invalid_fields(analysis, AnalysisResult):
+            # Fields the model never delivered come from the local analysis
+            print("⚠️  Filling missing analysis fields from local keyword analysis")
+            analysis = {**self._build_local_analysis(resume_text, job_description), **analysis}
         
         return analysis
     
+    async def stream_analysis(
+        self,
+        resume_text: str,
+        job_description: str,
+        use_cache: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of analyze_resume
+        Yields a local "preview" score first, "token" events for raw deltas and
+        a "section" event as soon as each top-level field of the analysis JSON is complete
+        """
+        # Instant local preview while the model is still generating
+        yield {"event": "preview", "value": prescore(resume_text, job_description)}
+        
+        system_prompt, user_prompt = self._build_analysis_prompt(resume_text, job_description)
+        
+        if not self.provider:
+            print("⚠️  Warning: Using local keyword analysis. Set CEREBRAS_API_KEY in .env file to use real AI analysis")
+            for key, value in self._build_local_analysis(resume_text, job_description).items():
+                yield {"event": "section", "key": key, "value": value}
+            yield {"event": "done", "fallback": True}
+            return
+        
+        cache_key = None
+        if self.cache is not None:
+            cache_key = completion_cache_key(
+                self.model, system_prompt, user_prompt, ANALYSIS_TEMPERATURE, ANALYSIS_MAX_TOKENS
+            )
+            cached = await self.cache.get(cache_key) if use_cache else None
+            if cached is not None:
+                print("💾 LLM cache hit")
+                for key, value in cached.items():
+                    yield {"event": "section", "key": key, "value": value}
+                yield {"event": "done", "fallback": False}
+                return
+        
+        parser = IncrementalJSONParser()
+        try:
+            print("🤖 Streaming analysis from Cerebras AI API...")
+            # Stops at the request deadline; whatever hasn't arrived is filled in locally below
+            async for delta in iterate_within_deadline(self._stream_completion(
+                system_prompt,
+                user_prompt,
+                temperature=ANALYSIS_TEMPERATURE,
+                max_tokens=ANALYSIS_MAX_TOKENS
+            )):
+                yield {"event": "token", "text": delta}
+                for key, value in parser.feed(delta):
+                    yield {"event": "section", "key": key, "value": value}
+        except Exception as e:
+            print(f"❌ Error streaming from Cerebras AI API: {type(e).__name__}: {e}")
+        
+        if parser.finished and self.validate_analysis_output(parser.sections):
+            print(f"✅ Streamed analysis with keys: {list(parser.sections.keys())}")
+            if cache_key is not None:
+                await self.cache.set(cache_key, parser.sections)
+            yield {"event": "done", "fallback": False}
+            return
+        
+        # A stream cut off at the token limit: ask for just the sections it didn't deliver
+        missing = invalid_fields(parser.sections, AnalysisResult)
+        if parser.sections and missing:
+            refill = await self._complete_missing_fields(
+                system_prompt,
+                user_prompt,
+                ANALYSIS_TEMPERATURE,
+                ANALYSIS_MAX_TOKENS,
+                parser.sections,
+                missing,
+                AnalysisResult
+            )
+            for key in missing:
+                if key in refill:
+                    parser.sections[key] = refill[key]
+                    yield {"event": "section", "key": key, "value": refill[key]}
+            if self.validate_analysis_output(parser.sections):
+                if cache_key is not None:
+                    await self.cache.set(cache_key, parser.sections)
+                yield {"event": "done", "fallback": False}
+                return
+        
+        # Fill whatever the stream didn't deliver from the local analysis
+        print("⚠️  Stream incomplete, filling missing sections from local keyword analysis")
+        missing = set(invalid_fields(parser.sections, AnalysisResult))
+        for key, value in self._build_local_analysis(resume_text, job_description).items():
+            if key not in parser.sections or key in missing:
+                yield {"event": "section", "key": key, "value": value}
+        yield {"event": "done", "fallback": True}
+    
+    @staticmethod
+    def _resume_for_prompt(resume_text: str, sections: Optional[List[str]] = None) -> str:
+        """
+        Resume text for a prompt, reduced to the given sections when the resume has headings
+        Contact details are left out; unstructured text is passed through
+        """
+        resume = segment_resume(resume_text)
+        if not resume.is_structured:
+            return resume_text
+        return resume.render(sections, include_headline=sections is None)
+    
     def _build_analysis_prompt(self, resume_text: str, job_description: str) -> str:
         """
         Build the system and user prompts for LLM analysis
         Returns tuple of (system_prompt, user_prompt)
         """
         
-        system_prompt = """You are an expert career mentor and ATS specialist with 15+ years of experience in recruitment and career development.
-
-Your role is to act as a MENTOR, not just a scanner. When a resume doesn't pass, you must explain WHY it's failing and WHAT the candidate needs to understand about the gap between their profile and the job requirements.
-
-You MUST return ONLY a valid JSON object with no additional text, explanations, or markdown formatting.
-
-The JSON must follow this exact structure:
-{
-  "match_score": <number between 0-100>,
-  "overall_assessment": "<2-3 sentences explaining if this resume would pass ATS screening and why/why not>",
-  "why_not_passing": {
-    "main_reasons": [
-      "<Reason 1: Explain what's fundamentally wrong>",
-      "<Reason 2: Another critical issue>",
-      "<Reason 3: etc.>"
-    ],
-    "ats_perspective": "<Explain how an ATS system would view this resume - what it's looking for and what it's not finding>"
-  },
-  "missing_keywords": [
-    {
-      "keyword": "<missing keyword/skill>",
-      "importance": "<critical/high/medium>",
-      "why_matters": "<Explain WHY this keyword is important for this role and what impact its absence has>"
-    }
-  ],
-  "gap_analysis": {
-    "experience_gaps": "<Detailed explanation of experience mismatches - what the JD needs vs what the resume shows>",
-    "skills_gaps": "<Detailed explanation of technical/soft skill gaps and their significance>",
-    "qualification_gaps": "<Education, certifications, or other qualification gaps>"
-  },
-  "section_detailed_feedback": {
-    "summary": {
-      "current_state": "<What's currently there or missing>",
-      "problem": "<Why it's not working for this role>",
-      "impact": "<How this affects ATS screening>"
-    },
-    "experience": {
-      "current_state": "<What's currently there>",
-      "problem": "<Why it's not aligning with job requirements>",
-      "impact": "<How this affects candidacy>"
-    },
-    "skills": {
-      "current_state": "<What skills are listed>",
-      "problem": "<What's missing or not emphasized>",
-      "impact": "<How this affects technical screening>"
-    }
-  },
-  "actionable_next_steps": [
-    "<Step 1: Most critical action to take>",
-    "<Step 2: Next important action>",
-    "<Step 3: etc.>"
-  ]
-}
-
-IMPORTANT RULES:
-1. Be BRUTALLY HONEST but CONSTRUCTIVE - explain the real problems
-2. Think like an ATS system first, then like a hiring manager
-3. Explain WHY things matter, not just WHAT is missing
-4. Focus on the GAPS - what's preventing this resume from passing
-5. Provide clear, actionable explanations that help the candidate understand their weaknesses
-6. Match score should reflect realistic ATS pass rate (typically 60+ to pass initial screening)
-7. Use mentoring language - teach, don't just critique"""
-
-        user_prompt = f"""Analyze this resume as a MENTOR explaining why it may not pass the ATS screening:
-
-JOB DESCRIPTION:
-{job_description}
-
-RESUME:
-{resume_text}
-
-Provide a comprehensive analysis that:
-1. Explains if this resume would pass ATS screening (match_score)
-2. Details WHY it's not passing or what's holding it back
-3. Identifies missing critical keywords with explanations of their importance
-4. Analyzes the gaps between candidate profile and job requirements
-5. Gives detailed feedback for each resume section with current state, problem, and impact
-6. Provides actionable next steps
-
-Return ONLY the JSON object following the exact structure above."""
+        inputs = self.budget.fit("analysis", job_description, self._resume_for_prompt(resume_text))
+        
+        system_prompt, user_prompt = ANALYSIS_PROMPT.render(
+            job_description=inputs.job_description,
+            resume=inputs.resume
+        )
 
         return system_prompt, user_prompt
     
-    def _call_llm(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+    async def _call_llm(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        use_cache: bool = True
+    ) -> Optional[Dict[str, Any]]:
         """
         Call Cerebras AI API and parse JSON response
-        Falls back to mock data if API key not configured
+        Returns None if the API key is not configured or the call fails
         """
         
-        # If Cerebras client is configured, use it
-        if self.client:
+        # If an LLM provider is configured, use it
+        if self.provider:
             try:
                 print("🤖 Calling Cerebras AI API...")
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    max_completion_tokens=2048,
-                    temperature=0.2,
-                    top_p=1,
-                    stream=False
+                analysis = await self._complete_json(
+                    system_prompt,
+                    user_prompt,
+                    temperature=ANALYSIS_TEMPERATURE,
+                    max_tokens=ANALYSIS_MAX_TOKENS,
+                    use_cache=use_cache,
+                    schema=AnalysisResult
                 )
-                
-                # Parse the JSON response
-                content = response.choices[0].message.content
-                print(f"✅ Received response ({len(content)} chars)")
-                
-                # Try to extract JSON if wrapped in markdown
-                if "```json" in content:
-                    print("⚠️  Response contains markdown, extracting JSON...")
-                    content = content.split("```json")[1].split("```")[0].strip()
-                elif "```" in content:
-                    print("⚠️  Response contains code blocks, extracting content...")
-                    content = content.split("```")[1].split("```")[0].strip()
-                
-                analysis = json.loads(content)
                 print(f"✅ Successfully parsed JSON with keys: {list(analysis.keys())}")
                 
                 return analysis
                 
             except json.JSONDecodeError as e:
                 print(f"❌ Error: Failed to parse JSON from Cerebras response: {e}")
-                print(f"Response preview: {content[:500]}...")
-                print("⚠️  Falling back to mock response")
-                return self._get_mock_response()
+                print("⚠️  Falling back to local keyword analysis")
+                return None
             except Exception as e:
                 print(f"❌ Error calling Cerebras AI API: {type(e).__name__}: {e}")
-                print("⚠️  Falling back to mock response")
-                return self._get_mock_response()
+                print("⚠️  Falling back to local keyword analysis")
+                return None
         
-        # Fall back to mock response if no API key
-        print("⚠️  Warning: Using mock response. Set CEREBRAS_API_KEY in .env file to use real AI analysis")
-        return self._get_mock_response()
+        # Fall back to local analysis if no API key
+        print("⚠️  Warning: Using local keyword analysis. Set CEREBRAS_API_KEY in .env file to use real AI analysis")
+        return None
     
-    def _get_mock_response(self) -> Dict[str, Any]:
+    def _build_local_analysis(self, resume_text: str, job_description: str) -> Dict[str, Any]:
         """
-        Return mock response for development/testing with enhanced mentor-style feedback
+        Offline analysis from the local keyword scorer, used when the LLM is unavailable
+        Follows the same schema as the AI analysis
         """
-        mock_response = {
-            "match_score": 45,
-            "overall_assessment": "This resume would likely NOT pass initial ATS screening. The match score of 45% indicates significant gaps in technical keywords, relevant experience presentation, and alignment with the job requirements.",
+        result = prescore(resume_text, job_description)
+        summary = segment_resume(resume_text).get("summary")
+        match_score = result["match_score"]
+        matched = result["matched_keywords"]
+        missing = result["missing_keywords"][:10]
+        total_terms = len(matched) + len(result["missing_keywords"])
+        passing = match_score >= 60
+        top_missing = ", ".join(missing[:5]) if missing else "none"
+        
+        missing_keywords = []
+        for rank, keyword in enumerate(missing):
+            missing_keywords.append({
+                "keyword": keyword,
+                "importance": "critical" if rank < 3 else "high" if rank < 6 else "medium",
+                "why_matters": f"'{keyword}' is one of the most emphasised terms in the job description and does not appear anywhere in your resume. ATS keyword matching will count it as a gap."
+            })
+        
+        return {
+            "match_score": match_score,
+            "overall_assessment": (
+                f"This resume {'would likely pass' if passing else 'would likely NOT pass'} initial ATS keyword screening. "
+                f"It covers {len(matched)} of the {total_terms} key terms in the job description."
+            ),
             "why_not_passing": {
                 "main_reasons": [
-                    "Missing critical cloud infrastructure keywords that are essential for this role (Docker, Kubernetes, AWS services)",
-                    "Experience descriptions don't emphasize scalability, distributed systems, or microservices architecture",
-                    "No clear demonstration of DevOps practices or CI/CD pipeline experience"
+                    f"Missing high-priority job description terms: {top_missing}",
+                    f"Only {len(matched)} of {total_terms} key terms from the job description appear in the resume",
+                    "Keywords that do match may not be emphasised in the summary and skills sections"
+                ] if not passing else [
+                    f"Remaining keyword gaps: {top_missing}"
                 ],
-                "ats_perspective": "ATS systems scan for exact keyword matches and semantic relevance. This resume lacks 60% of the critical technical terms from the job description. The system would flag it as 'underqualified' because key technologies (containerization, orchestration, cloud platforms) are either absent or not prominently featured."
+                "ats_perspective": "An ATS ranks resumes by how many of the job description's terms they contain and how prominently. Each missing term lowers the ranking even when you have the underlying experience."
             },
-            "missing_keywords": [
-                {
-                    "keyword": "Docker",
-                    "importance": "critical",
-                    "why_matters": "Docker containerization is fundamental to modern DevOps practices. Its absence suggests you may not have hands-on experience with containerized deployments, which is a dealbreaker for this role."
-                },
-                {
-                    "keyword": "Kubernetes",
-                    "importance": "critical",
-                    "why_matters": "Kubernetes orchestration is explicitly mentioned as a required skill. Without it, the hiring team will assume you can't manage production-scale containerized applications."
-                },
-                {
-                    "keyword": "Microservices Architecture",
-                    "importance": "high",
-                    "why_matters": "The role requires designing and maintaining microservices. Not mentioning this suggests you may have only monolithic application experience, which doesn't meet the job's architectural needs."
-                },
-                {
-                    "keyword": "CI/CD Pipeline",
-                    "importance": "high",
-                    "why_matters": "Continuous integration and deployment is core to the DevOps workflow. Its absence indicates you might not be familiar with automated testing and deployment processes."
-                },
-                {
-                    "keyword": "AWS (Lambda, ECS, ECR)",
-                    "importance": "critical",
-                    "why_matters": "The company's infrastructure is AWS-based. Not showcasing specific AWS services means you'll need extensive onboarding, which they want to avoid."
-                }
-            ],
+            "missing_keywords": missing_keywords,
             "gap_analysis": {
-                "experience_gaps": "The job requires 3-5 years of DevOps experience with proven track record in cloud infrastructure. Your resume shows software development experience but doesn't clearly articulate infrastructure management, monitoring, or deployment automation responsibilities. Hiring managers need to see specific examples of infrastructure you've built, scaled, or maintained.",
-                "skills_gaps": "Critical technical gaps: No container orchestration tools mentioned, no infrastructure-as-code experience (Terraform, CloudFormation), no monitoring tools (Prometheus, Grafana). The job emphasizes these as day-1 requirements, and their absence suggests a fundamental skills mismatch.",
-                "qualification_gaps": "While you have a CS degree, there's no mention of relevant certifications (AWS Certified Solutions Architect, Kubernetes Admin) that would validate your cloud expertise. For senior roles, certifications help compensate for experience gaps."
+                "experience_gaps": "Compare each responsibility in the job description with your experience bullets and describe directly related work using the same terminology.",
+                "skills_gaps": f"Job description terms not found in the resume: {top_missing}",
+                "qualification_gaps": "Check the job description for required degrees or certifications and list any you hold explicitly."
             },
             "section_detailed_feedback": {
                 "summary": {
-                    "current_state": "Generic software engineer summary focusing on 'problem-solving' and 'team collaboration' without technical depth",
-                    "problem": "Doesn't position you as a DevOps/Cloud specialist. The summary should immediately signal your cloud infrastructure expertise and mention 2-3 of the critical technologies from the JD",
-                    "impact": "ATS scores summaries heavily. A generic summary means you're competing as a 'generalist' when this role needs a 'specialist'. This alone could drop your score by 15-20 points."
+                    "current_state": (
+                        f"Summary section found ({len(summary.text.split())} words)" if summary
+                        else "No summary section found"
+                    ),
+                    "problem": f"The summary should mention the role's core terms ({', '.join(missing[:3]) or 'already covered'})",
+                    "impact": "Summaries are scanned first by both ATS systems and recruiters"
                 },
                 "experience": {
-                    "current_state": "Experience bullets focus on feature development and team coordination but lack infrastructure/deployment specifics",
-                    "problem": "Job descriptions emphasize WHAT you built (infrastructure, pipelines, monitoring systems) not just development work. Your bullets don't show you've operated in a DevOps capacity",
-                    "impact": "Hiring managers will question if you've actually done the infrastructure work they need. Without deployment and scaling examples, you seem like a developer, not a DevOps engineer."
+                    "current_state": f"Matched terms: {', '.join(matched[:8]) or 'none'}",
+                    "problem": "Experience bullets should show hands-on use of the missing terms where you have it",
+                    "impact": "Keywords backed by experience carry more weight than a skills list alone"
                 },
                 "skills": {
-                    "current_state": "Skills list includes programming languages (Python, JavaScript) but minimal DevOps tools",
-                    "problem": "The skills section is where ATS does heavy keyword matching. You're missing 8+ critical keywords: Docker, K8s, Terraform, Jenkins, GitLab CI, CloudFormation, AWS services, monitoring tools",
-                    "impact": "ATS systems weight skills section at 40-50% of total score. Your current skills profile matches maybe 30% of requirements, significantly lowering your overall match score."
+                    "current_state": f"{len(matched)} of {total_terms} key terms present",
+                    "problem": f"Missing: {top_missing}",
+                    "impact": "The skills section is where ATS keyword matching is most direct"
                 }
             },
             "actionable_next_steps": [
-                "IMMEDIATE: Add a 'Cloud & DevOps Technologies' section listing: Docker, Kubernetes, AWS (EC2, ECS, Lambda, S3, RDS), CI/CD tools, Infrastructure as Code tools",
-                "REWRITE SUMMARY: Position yourself as 'DevOps Engineer with X years cloud infrastructure experience' and mention 3 key technologies from the JD in the first line",
-                "REVISE EXPERIENCE BULLETS: For each role, add 2-3 bullets specifically about infrastructure work - deployments, automation, scaling, monitoring. Use metrics (reduced deployment time by X%, managed infrastructure for Y users)",
-                "ADD PROJECTS SECTION: If lacking professional DevOps experience, include personal projects showing Docker/K8s/AWS work. Even side projects demonstrate capability.",
-                "GET CERTIFIED: Consider AWS Solutions Architect Associate or CKA (Certified Kubernetes Administrator) certification to validate your cloud skills"
-            ]
+                f"Add the missing skills you genuinely have to your skills section: {top_missing}",
+                "Rewrite your summary to mention the role title and its top 3 required technologies",
+                "Add experience bullets that show these technologies in use, with measurable results"
+            ],
+            "note": "⚠️ This is a local keyword-based analysis. For full AI-powered feedback, configure CEREBRAS_API_KEY in your .env file."
         }
+    
+    def build_keyword_gap_analysis(self, resume_text: str, job_description: str) -> Dict[str, Any]:
+        """
+        Fast local stand-in for analyze_resume, computed without an LLM call
+        Has the missing_keywords and gap_analysis shape generate_interview_questions reads
+        """
+        missing = prescore(resume_text, job_description)["missing_keywords"][:5]
         
-        return mock_response
+        return {
+            "missing_keywords": [
+                {
+                    "keyword": keyword,
+                    "importance": "high",
+                    "why_matters": "Mentioned in the job description but not found in the resume."
+                }
+                for keyword in missing
+            ],
+            "gap_analysis": {
+                "skills_gaps": f"Job description terms not found in the resume: {', '.join(missing)}" if missing else ""
+            }
+        }
     
     def validate_analysis_output(self, analysis: Dict[str, Any]) -> bool:
         """
         Validate that the analysis output matches expected mentor-style schema
         """
-        required_fields = [
-            "match_score", 
-            "overall_assessment",
-            "why_not_passing",
-            "missing_keywords",
-            "gap_analysis",
-            "section_detailed_feedback",
-            "actionable_next_steps"
-        ]
-        
-        # Check all required top-level fields exist
-        if not all(field in analysis for field in required_fields):
-            print(f"Missing required fields. Present: {list(analysis.keys())}")
-            return False
-        
-        # Validate match_score
-        if not isinstance(analysis["match_score"], (int, float)):
-            print("Invalid match_score type")
-            return False
-        
-        # Validate overall_assessment
-        if not isinstance(analysis["overall_assessment"], str):
-            print("Invalid overall_assessment type")
-            return False
-        
-        # Validate why_not_passing structure
-        if not isinstance(analysis["why_not_passing"], dict):
-            print("Invalid why_not_passing type")
-            return False
-        
-        # Validate missing_keywords (array of objects)
-        if not isinstance(analysis["missing_keywords"], list):
-            print("Invalid missing_keywords type")
-            return False
-        
-        # Validate gap_analysis
-        if not isinstance(analysis["gap_analysis"], dict):
-            print("Invalid gap_analysis type")
-            return False
-        
-        # Validate section_detailed_feedback
-        if not isinstance(analysis["section_detailed_feedback"], dict):
-            print("Invalid section_detailed_feedback type")
-            return False
-        
-        # Validate actionable_next_steps
-        if not isinstance(analysis["actionable_next_steps"], list):
-            print("Invalid actionable_next_steps type")
+        invalid = invalid_fields(analysis, AnalysisResult)
+        if invalid:
+            print(f"Missing or invalid fields: {invalid}. Present: {list(analysis.keys())}")
             return False
         
         return True
     
-    def generate_interview_questions(
+    async def generate_interview_questions(
         self, 
         resume_text: str, 
         job_description: str, 
         analysis: Dict[str, Any],
-        count: int = 5
+        count: int = 5,
+        use_cache: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Generate targeted interview questions based on analysis
         Focuses on weak areas and missing skills
+        Questions are sampled at a high temperature, so every call gets a fresh set
+        unless use_cache=True asks to reuse one generated for the same inputs
         """
         
         missing_keywords = analysis.get("missing_keywords", [])[:5]
         gap_analysis = analysis.get("gap_analysis", {})
-        
-        system_prompt = """You are an experienced technical recruiter conducting a mock interview.
-Your goal is to ask questions that specifically target the candidate's WEAK AREAS and MISSING SKILLS identified in their resume analysis.
-
-Generate interview questions that:
-1. Test knowledge in areas where the candidate is weak
-2. Allow the candidate to demonstrate understanding of missing concepts
-3. Are realistic questions a hiring manager would ask for this role
-4. Mix technical, behavioral, and situational questions
-5. Help the candidate practice explaining gaps in their experience
-
-Return ONLY a JSON array of question objects:
-[
-  {
-    "question": "<the interview question>",
-    "category": "technical|behavioral|situational",
-    "focus_area": "<which weakness/gap this targets>",
-    "why_asking": "<brief explanation of why this question matters for this role>"
-  }
-]"""
-
-        user_prompt = f"""Based on this analysis, generate {count} targeted interview questions:
-
-JOB DESCRIPTION:
-{job_description}
-
-CANDIDATE'S WEAK AREAS:
-Missing Keywords: {', '.join([k.get('keyword', '') for k in missing_keywords])}
-Experience Gaps: {gap_analysis.get('experience_gaps', 'None identified')}
-Skills Gaps: {gap_analysis.get('skills_gaps', 'None identified')}
-
-RESUME SUMMARY:
-{resume_text[:500]}...
-
-Generate {count} questions that will help the candidate:
-1. Practice explaining their experience in the context of missing skills
-2. Demonstrate problem-solving in areas they're weak
-3. Show transferable skills that could compensate for gaps
-
-Return ONLY the JSON array of question objects."""
+        inputs = self.budget.fit(
+            "questions",
+            job_description,
+            self._resume_for_prompt(resume_text, ["summary", "skills", "experience", "projects"])
+        )
+        
+        system_prompt, user_prompt = QUESTIONS_PROMPT.render(
+            job_description=inputs.job_description,
+            resume=inputs.resume,
+            missing_keywords=', '.join([k.get('keyword', '') for k in missing_keywords]),
+            experience_gaps=gap_analysis.get('experience_gaps', 'None identified'),
+            skills_gaps=gap_analysis.get('skills_gaps', 'None identified'),
+            count=count
+        )
 
         try:
-            if self.client:
+            if self.provider:
                 print("🤖 Generating interview questions with AI...")
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
+                questions = await self._complete_json(
+                    system_prompt,
+                    user_prompt,
                     temperature=0.8,
-                    max_tokens=2000
+                    max_tokens=2000,
+                    use_cache=use_cache,
+                    shared=use_cache
                 )
                 
-                content = response.choices[0].message.content.strip()
-                print(f"✅ Received {len(content)} chars from AI")
-                content = content.replace("```json", "").replace("```", "").strip()
-                questions = json.loads(content)
-                
+                if isinstance(questions, list):
+                    questions = [q for q in questions if not invalid_fields(q, InterviewQuestion)]
                 if isinstance(questions, list) and len(questions) > 0:
                     print(f"✅ Generated {len(questions)} questions")
                     return questions
@@ -464,68 +691,40 @@ Return ONLY the JSON array of question objects."""
         
         return questions[:count]
     
-    def evaluate_interview_answer(
+    async def evaluate_interview_answer(
         self,
         question: str,
         answer: str,
         job_description: str,
-        resume_context: str = None
+        resume_context: str = None,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Evaluate interview answer using STAR framework
         Provides constructive feedback
         """
         
-        system_prompt = """You are a professional interview coach providing feedback on interview answers.
-
-Evaluate the answer using the STAR framework:
-- Situation: Did they set up the context?
-- Task: Did they explain what needed to be done?
-- Action: Did they describe what THEY specifically did?
-- Result: Did they share the outcome/impact?
-
-Return ONLY a JSON object:
-{
-  "score": <0-100>,
-  "star_analysis": {
-    "situation": "<present/missing/weak>",
-    "task": "<present/missing/weak>",
-    "action": "<present/missing/weak>",
-    "result": "<present/missing/weak>"
-  },
-  "strengths": ["<strength 1>", "<strength 2>"],
-  "improvements": ["<improvement 1>", "<improvement 2>"],
-  "suggestion": "<How to improve this answer specifically>",
-  "example_reframe": "<Better way to phrase this answer>"
-}"""
-
-        user_prompt = f"""Evaluate this interview answer:
-
-QUESTION: {question}
-
-ANSWER: {answer}
-
-JOB CONTEXT: {job_description[:300]}
-
-Provide constructive feedback using STAR framework.
-Return ONLY the JSON object."""
+        inputs = self.budget.fit("evaluation", job_description)
+        
+        system_prompt, user_prompt = EVALUATION_PROMPT.render(
+            job_description=inputs.job_description,
+            question=question,
+            answer=answer
+        )
 
         try:
-            if self.client:
+            if self.provider:
                 print("🤖 Evaluating answer with AI...")
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
+                feedback = await self._complete_json(
+                    system_prompt,
+                    user_prompt,
                     temperature=0.7,
-                    max_tokens=1000
+                    max_tokens=1000,
+                    use_cache=use_cache,
+                    schema=AnswerFeedback
                 )
-                
-                content = response.choices[0].message.content.strip()
-                content = content.replace("```json", "").replace("```", "").strip()
-                feedback = json.loads(content)
+                if invalid_fields(feedback, AnswerFeedback):
+                    feedback = {**self._evaluate_answer_fallback(answer), **feedback}
                 print(f"✅ Evaluation complete: {feedback.get('score', 0)}/100")
                 return feedback
             else:
@@ -537,11 +736,36 @@ Return ONLY the JSON object."""
         # Fallback: Basic rule-based evaluation
         return self._evaluate_answer_fallback(answer)
     
+    async def evaluate_interview_answers(
+        self,
+        answers: List[Dict[str, str]],
+        job_description: str,
+        resume_context: str = None,
+        concurrency: Optional[int] = None,
+        use_cache: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate a full session of question/answer pairs concurrently
+        At most `concurrency` LLM calls are in flight; results keep the input order
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.eval_concurrency)
+        
+        async def evaluate(pair: Dict[str, str]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.evaluate_interview_answer(
+                    question=pair["question"],
+                    answer=pair["answer"],
+                    job_description=job_description,
+                    resume_context=resume_context,
+                    use_cache=use_cache
+                )
+        
+        return await asyncio.gather(*(evaluate(pair) for pair in answers))
+    
     def _evaluate_answer_fallback(self, answer: str) -> Dict[str, Any]:
         """
         Basic rule-based answer evaluation when AI is unavailable
         """
-        answer_lower = answer.lower()
         answer_length = len(answer.split())
         
         # Calculate score based on answer characteristics
@@ -554,25 +778,22 @@ Return ONLY the JSON object."""
             "result": "missing"
         }
         
-        # Check for STAR elements
-        situation_keywords = ["when", "while", "during", "at", "in my role"]
-        task_keywords = ["needed to", "required", "had to", "was responsible", "objective"]
-        action_keywords = ["i", "implemented", "developed", "created", "led", "managed"]
-        result_keywords = ["resulted", "achieved", "improved", "increased", "reduced", "%"]
+        # Check for STAR elements in a single pass over the answer
+        found = STAR_MATCHER.payloads(answer)
         
-        if any(kw in answer_lower for kw in situation_keywords):
+        if "situation" in found:
             star_components["situation"] = "present"
             score += 10
         
-        if any(kw in answer_lower for kw in task_keywords):
+        if "task" in found:
             star_components["task"] = "present"
             score += 10
         
-        if any(kw in answer_lower for kw in action_keywords):
+        if "action" in found:
             star_components["action"] = "present"
             score += 15
         
-        if any(kw in answer_lower for kw in result_keywords):
+        if "result" in found:
             star_components["result"] = "present"
             score += 15
         
@@ -671,86 +892,43 @@ Return ONLY the JSON object."""
             ]
         }
     
-    def rewrite_bullet_with_star(
+    async def rewrite_bullet_with_star(
         self,
         original_bullet: str,
         job_description: str,
-        resume_context: str = None
+        resume_context: str = None,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Rewrite a resume bullet point using STAR framework
         Emphasizes impact over tasks
         """
         
-        system_prompt = """You are an expert resume writer who specializes in transforming weak bullet points into impactful STAR-format accomplishments.
-
-Your goal is to take a task-oriented bullet and rewrite it to emphasize:
-- Situation/Context (briefly)
-- Task/Challenge 
-- Action (specific steps YOU took)
-- Result (quantifiable impact, metrics, outcomes)
-
-Return ONLY a JSON object:
-{
-  "original": "<the original bullet>",
-  "rewritten": "<the improved STAR-format bullet>",
-  "improvements": {
-    "before_issues": ["<issue 1>", "<issue 2>"],
-    "after_strengths": ["<strength 1>", "<strength 2>"]
-  },
-  "star_breakdown": {
-    "situation": "<what was the context>",
-    "task": "<what needed to be done>",
-    "action": "<what you specifically did>",
-    "result": "<quantifiable outcome>"
-  },
-  "keywords_added": ["<keyword 1>", "<keyword 2>"],
-  "impact_score_improvement": <0-100, how much better is this>
-}
-
-RULES:
-1. Start with an action verb (Led, Developed, Implemented, Optimized, etc.)
-2. Include specific metrics/numbers (%, $, time saved, users impacted)
-3. Focus on RESULTS and IMPACT, not just tasks
-4. Make it relevant to the target job description
-5. Keep it concise (1-2 lines max)
-6. Use industry-standard keywords from the JD"""
-
-        user_prompt = f"""Rewrite this resume bullet point using STAR framework:
-
-ORIGINAL BULLET:
-{original_bullet}
-
-TARGET JOB DESCRIPTION:
-{job_description[:400]}
-
-RESUME CONTEXT (for consistency):
-{resume_context[:300] if resume_context else 'Not provided'}
-
-Transform this into a powerful, results-oriented bullet that:
-1. Shows clear impact with metrics
-2. Uses relevant keywords from the JD
-3. Follows STAR framework
-4. Emphasizes what YOU accomplished
-
-Return ONLY the JSON object."""
+        inputs = self.budget.fit(
+            "rewrite",
+            job_description,
+            self._resume_for_prompt(resume_context, ["summary", "skills"]) if resume_context else None
+        )
+        
+        system_prompt, user_prompt = REWRITE_PROMPT.render(
+            job_description=inputs.job_description,
+            resume_context=inputs.resume or 'Not provided',
+            original_bullet=original_bullet
+        )
 
         try:
-            if self.client:
+            if self.provider:
                 print("🤖 Rewriting bullet with AI (STAR framework)...")
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
+                result = await self._complete_json(
+                    system_prompt,
+                    user_prompt,
                     temperature=0.7,
-                    max_tokens=1000
+                    max_tokens=1000,
+                    use_cache=use_cache,
+                    schema=StarRewrite
                 )
-                
-                content = response.choices[0].message.content.strip()
-                content = content.replace("```json", "").replace("```", "").strip()
-                result = json.loads(content)
+                if invalid_fields(result, StarRewrite):
+                    result = {**self._rewrite_bullet_fallback(original_bullet, job_description), **result}
                 print(f"✅ Successfully rewrote bullet")
                 return result
             else:
@@ -770,12 +948,9 @@ Return ONLY the JSON object."""
         """
         Template-based bullet rewrite when AI is unavailable
         """
-        # Extract key action verb or add one
-        action_verbs = ["Led", "Developed", "Implemented", "Managed", "Created", "Optimized", "Designed"]
-        
         # Simple enhancement: add action verb if missing and suggest metrics
         rewritten = original_bullet
-        if not any(verb.lower() in original_bullet.lower() for verb in action_verbs):
+        if not ACTION_VERB_MATCHER.contains_any(original_bullet):
             rewritten = f"Developed {original_bullet.lower()}"
         
         # Add metric suggestion if missing
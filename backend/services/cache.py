@@ -0,0 +1,328 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class LRUCache:
+    """
+    Bounded in-memory cache with LRU eviction and optional TTL expiry
+    With max_bytes set, values must support len() and the total size is bounded too
+    Safe to share between the event loop and worker threads
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: Optional[float] = None, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+
+        with self._lock:
+            self._remove(key)
+            if self.max_bytes is not None:
+                if len(value) > self.max_bytes:
+                    # Would evict everything else and still not fit
+                    return
+                self.bytes += len(value)
+            self._data[key] = (value, expires_at)
+            while len(self._data) > self.max_entries or (
+                self.max_bytes is not None and self.bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None and self.max_bytes is not None:
+            self.bytes -= len(entry[0])
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        stats = {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+        if self.max_bytes is not None:
+            stats.update(bytes=self.bytes, max_bytes=self.max_bytes)
+        return stats
+
+
+class SQLiteCache:
+    """
+    On-disk key/value tier backed by a single SQLite file
+    Values are stored as text with an absolute expiry timestamp
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = None, table: str = "cache"):
+        self.path = path
+        self.ttl = ttl
+        self.table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self.get_with_ttl(key)
+        return entry[0] if entry is not None else None
+
+    def get_with_ttl(self, key: str) -> Optional[Tuple[str, Optional[float]]]:
+        """(value, seconds until it expires or None), None on a miss"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = row
+            if expires_at is not None and expires_at <= time.time():
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return value, (expires_at - time.time() if expires_at is not None else None)
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.time() + ttl if ttl else None
+
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """Remove expired rows, returns number of rows deleted"""
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (time.time(),),
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        return {"path": self.path, "entries": entries, "hits": self.hits, "misses": self.misses}
+
+
+class FileCache:
+    """
+    On-disk tier for binary values, one file per key in a directory
+    The total size is bounded by max_bytes; the least recently read files are removed first
+    """
+
+    def __init__(self, directory: str, max_bytes: int, suffix: str = ".bin"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Pick up files from earlier runs, oldest access first
+        entries = []
+        for name in os.listdir(directory):
+            if name.endswith(suffix):
+                stat = os.stat(os.path.join(directory, name))
+                entries.append((stat.st_mtime, name[:-len(suffix)], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._sizes[key] = size
+            self.bytes += size
+        self._evict()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.suffix)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            if key not in self._sizes:
+                self.misses += 1
+                return None
+            try:
+                with open(self._path(key), "rb") as file:
+                    value = file.read()
+                # mtime doubles as last access, so recency survives a restart
+                os.utime(self._path(key))
+            except OSError:
+                self.bytes -= self._sizes.pop(key)
+                self.misses += 1
+                return None
+
+            self._sizes.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """Store value under key; meant for content-addressed keys, so ttl is ignored"""
+        if len(value) > self.max_bytes:
+            return
+
+        with self._lock:
+            # Written to a temporary file first so readers never see a partial value
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as file:
+                file.write(value)
+            os.replace(temp_path, self._path(key))
+
+            self.bytes -= self._sizes.pop(key, 0)
+            self._sizes[key] = len(value)
+            self.bytes += len(value)
+            self._evict()
+
+    def _evict(self) -> None:
+        while self.bytes > self.max_bytes and self._sizes:
+            key, size = self._sizes.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._sizes:
+                self.bytes -= self._sizes.pop(key)
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+
+    def close(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "directory": self.directory,
+            "entries": len(self._sizes),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class TieredCache:
+    """
+    Memory LRU in front of an optional SQLite tier
+    Disk calls run in a worker thread, off the event loop; disk hits are promoted
+    into memory with whatever lifetime they had left
+    """
+
+    def __init__(self, memory: LRUCache, disk: Optional[SQLiteCache] = None):
+        self.memory = memory
+        self.disk = disk
+        # Disk writes are applied in call order, so a slow write can't overwrite a newer one
+        self._write_lock = asyncio.Lock()
+
+    async def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is not None or self.disk is None:
+            return value
+
+        entry = await asyncio.to_thread(self.disk.get_with_ttl, key)
+        if entry is None:
+            return None
+        value, ttl = entry
+        self.memory.set(key, value, ttl)
+        return value
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        self.memory.set(key, value, ttl)
+        if self.disk is not None:
+            async with self._write_lock:
+                await asyncio.to_thread(self.disk.set, key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        if self.disk is not None:
+            async with self._write_lock:
+                await asyncio.to_thread(self.disk.delete, key)
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "memory": self.memory.stats(),
+            "disk": self.disk.stats() if self.disk is not None else None,
+        }
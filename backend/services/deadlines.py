@@ -0,0 +1,113 @@
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Awaitable, Callable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Default end-to-end latency budgets in seconds, overridable with LATENCY_BUDGET_<NAME>
+ENDPOINT_BUDGETS = {
+    "analysis": 45.0,
+    "questions": 20.0,
+    "evaluation": 12.0,
+    "session_evaluation": 30.0,
+    "rewrite": 12.0,
+    "start_interview": 60.0,
+}
+
+# Time kept back from the LLM call so the local fallback can still answer within the budget
+FALLBACK_RESERVE = float(os.getenv("LATENCY_FALLBACK_RESERVE", "0.25"))
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request's latency budget ran out before the LLM answered"""
+
+
+def remaining() -> Optional[float]:
+    """Seconds left until the current deadline, None if there is no deadline"""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def set_deadline(seconds: float) -> None:
+    """Set the deadline for the rest of the current context, never extending an existing one"""
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    _deadline.set(deadline if current is None else min(current, deadline))
+
+
+def clear_deadline() -> None:
+    """Drop the deadline for the rest of the current context (e.g. work shared by several requests)"""
+    _deadline.set(None)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Scoped deadline for calls made inside the block"""
+    token = _deadline.set(_deadline.get())
+    set_deadline(seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def budget_for(name: str) -> float:
+    return float(os.getenv(f"LATENCY_BUDGET_{name.upper()}", ENDPOINT_BUDGETS[name]))
+
+
+def latency_budget(name: str) -> Callable[[], Awaitable[float]]:
+    """
+    FastAPI dependency that starts the endpoint's latency budget
+    Async so the deadline is set in the request's own context and reaches AIAnalyzer
+    """
+    async def start_budget() -> float:
+        seconds = budget_for(name)
+        set_deadline(seconds)
+        return seconds
+
+    return start_budget
+
+
+async def within_deadline(awaitable: Awaitable[T], reserve: float = FALLBACK_RESERVE) -> T:
+    """
+    Await with whatever is left of the current deadline (minus reserve)
+    Raises DeadlineExceeded instead of starting work that can't finish in time
+    """
+    left = remaining()
+    if left is None:
+        return await awaitable
+
+    left -= reserve
+    if left <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded("Latency budget exhausted before the LLM call")
+
+    try:
+        return await asyncio.wait_for(awaitable, left)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded(f"LLM call did not finish within the remaining {left:.1f}s budget")
+
+
+async def iterate_within_deadline(iterator: AsyncIterator[T], reserve: float = FALLBACK_RESERVE) -> AsyncIterator[T]:
+    """
+    Items from an async iterator until it ends, raising DeadlineExceeded if the deadline passes first
+    Only the wait for each item is timed, never the consumer
+    """
+    iterator = iterator.__aiter__()
+    try:
+        while True:
+            try:
+                item = await within_deadline(iterator.__anext__(), reserve)
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -0,0 +1,105 @@
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class HedgedRequests:
+    """
+    Tail-latency hedging: when a request outlives the recent p95 latency for its
+    kind, an identical backup request is sent and whichever answers first wins
+    Hedges are capped at max_ratio of all requests so a slow provider isn't hit twice as hard
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        percentile: float = 0.95,
+        min_samples: int = 20,
+        window: int = 200,
+        max_ratio: float = 0.1
+    ):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.window = window
+        self.max_ratio = max_ratio
+        self._latencies: Dict[str, Deque[float]] = {}
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    @classmethod
+    def from_env(cls) -> "HedgedRequests":
+        return cls(
+            enabled=os.getenv("LLM_HEDGE_ENABLED", "false").lower() in ("1", "true", "yes"),
+            percentile=float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95")),
+            min_samples=int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20")),
+            max_ratio=float(os.getenv("LLM_HEDGE_MAX_RATIO", "0.1")),
+        )
+
+    def hedge_delay(self, kind: str) -> Optional[float]:
+        """Recent latency percentile for kind, None until there are enough samples"""
+        samples = self._latencies.get(kind)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(self.percentile * len(ordered)))]
+
+    def _record(self, kind: str, seconds: float) -> None:
+        self._latencies.setdefault(kind, deque(maxlen=self.window)).append(seconds)
+
+    async def _timed(self, kind: str, send: Callable[[], Awaitable[T]]) -> T:
+        started = time.monotonic()
+        result = await send()
+        self._record(kind, time.monotonic() - started)
+        return result
+
+    async def call(self, kind: str, send: Callable[[], Awaitable[T]]) -> T:
+        self.requests += 1
+        if not self.enabled:
+            return await self._timed(kind, send)
+
+        tasks: List[asyncio.Task] = [asyncio.ensure_future(self._timed(kind, send))]
+        try:
+            delay = self.hedge_delay(kind)
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done and self.hedged < self.max_ratio * self.requests:
+                    self.hedged += 1
+                    print(f"🔀 {kind} request slower than p{int(self.percentile * 100)} ({delay:.1f}s), sending a hedge")
+                    tasks.append(asyncio.ensure_future(self._timed(kind, send)))
+            return await self._first_success(tasks)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _first_success(self, tasks: List[asyncio.Task]) -> Any:
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is not tasks[0]:
+                        self.hedge_wins += 1
+                    return task.result()
+                error = error or task.exception()
+        raise error
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "hedge_delay_seconds": {
+                kind: round(delay, 3)
+                for kind in self._latencies
+                if (delay := self.hedge_delay(kind)) is not None
+            },
+        }
@@ -0,0 +1,158 @@
+import json
+import threading
+from typing import Any, Dict, List, Tuple, Type
+from pydantic import BaseModel, ValidationError
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+# How extract_json got its value
+CLEAN = "clean"
+REPAIRED = "repaired"
+TRUNCATED = "truncated"
+
+
+# Openers tried when prose before the JSON contains brackets of its own
+MAX_START_CANDIDATES = 3
+
+
+def _json_start(text: str, offset: int = 0) -> int:
+    """Index of the first { or [ from offset (after a ```json fence if there is one), -1 if none"""
+    fence = text.find("```json", offset)
+    if fence != -1:
+        offset = fence + len("```json")
+    starts = [index for index in (text.find("{", offset), text.find("[", offset)) if index != -1]
+    return min(starts) if starts else -1
+
+
+def repair_json(text: str, start: int = 0) -> Tuple[str, bool, int]:
+    """
+    Single pass over text returning (json_text, truncated, end) for the first JSON object or array in it
+    Prose and markdown fences around it are skipped and trailing or doubled commas dropped;
+    a value cut off at the token limit is closed after its last complete top-level member
+    """
+    start = _json_start(text, start)
+    if start == -1:
+        raise json.JSONDecodeError("No JSON object or array found", text, 0)
+
+    out: List[str] = []
+    stack: List[str] = []
+    # Length of out after the last complete top-level member (0 before the value opens)
+    checkpoint = 0
+    in_string = False
+    escape = False
+
+    for index in range(start, len(text)):
+        char = text[index]
+
+        if in_string:
+            out.append(char)
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char in "{[":
+            stack.append(_CLOSERS[char])
+            out.append(char)
+            if len(stack) == 1:
+                checkpoint = len(out)
+            continue
+
+        if char in "}]":
+            while out and out[-1] in " \t\r\n,":
+                out.pop()
+            # The expected closer, even if the model wrote the other kind
+            out.append(stack.pop())
+            if not stack:
+                return "".join(out), False, index + 1
+            if len(stack) == 1:
+                checkpoint = len(out)
+            continue
+
+        if char == '"':
+            in_string = True
+        elif char == ",":
+            last = next((c for c in reversed(out) if c not in " \t\r\n"), "")
+            if last in ",{[":
+                continue
+            if len(stack) == 1:
+                checkpoint = len(out)
+        out.append(char)
+
+    if not checkpoint:
+        raise json.JSONDecodeError("JSON value is truncated before it opens", text, start)
+    # Partial members are dropped whole so nothing half-written passes validation
+    return "".join(out[:checkpoint]).rstrip(" \t\r\n,") + stack[0], True, len(text)
+
+
+def extract_json(text: str) -> Tuple[Any, str]:
+    """
+    Parse the JSON value in an LLM response
+    Returns (value, status) where status is CLEAN, REPAIRED or TRUNCATED
+    Raises json.JSONDecodeError if no usable JSON is found
+    """
+    stripped = text.strip()
+    if stripped[:1] in ("{", "["):
+        try:
+            return json.loads(stripped), CLEAN
+        except json.JSONDecodeError:
+            pass
+
+    start = 0
+    for _ in range(MAX_START_CANDIDATES):
+        repaired, truncated, start = repair_json(text, start)
+        try:
+            # strict=False accepts raw newlines inside strings, which models often emit
+            return json.loads(repaired, strict=False), TRUNCATED if truncated else REPAIRED
+        except json.JSONDecodeError as e:
+            # Bracketed prose (e.g. "[note]") isn't the JSON; look after it, never inside it
+            error = e
+            if start >= len(text):
+                break
+    raise error
+
+
+def invalid_fields(value: Any, model: Type[BaseModel]) -> List[str]:
+    """Top-level fields of model that are missing from value or fail validation, in model order"""
+    try:
+        model.model_validate(value)
+    except ValidationError as e:
+        failed = {str(error["loc"][0]) for error in e.errors() if error["loc"]}
+        if not failed:
+            # Not an object at all
+            return list(model.model_fields)
+        return [field for field in model.model_fields if field in failed]
+    return []
+
+
+class OutputRepairStats:
+    """
+    How LLM responses were recovered: parsed as-is, repaired, truncated,
+    completed by re-requesting missing fields, or lost to an unparseable reply
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {CLEAN: 0, REPAIRED: 0, TRUNCATED: 0, "unparseable": 0}
+        self.refill_requests = 0
+        self.refilled_fields = 0
+
+    def record(self, status: str) -> None:
+        with self._lock:
+            self.counts[status] += 1
+
+    def record_refill(self, fields: int) -> None:
+        with self._lock:
+            self.refill_requests += 1
+            self.refilled_fields += fields
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.counts,
+                "refill_requests": self.refill_requests,
+                "refilled_fields": self.refilled_fields,
+            }
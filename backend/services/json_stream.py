@@ -0,0 +1,85 @@
+import json
+from typing import Any, List, Tuple
+from services.json_repair import extract_json
+
+
+class IncrementalJSONParser:
+    """
+    Incremental parser for a streamed JSON object
+    Feed text chunks as they arrive; each call returns the top-level
+    members (key, value) that became complete in that chunk
+    """
+
+    def __init__(self):
+        self._member: List[str] = []
+        self._started = False
+        self._finished = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.sections: dict = {}
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        completed = []
+
+        for char in chunk:
+            if self._finished:
+                break
+
+            # Skip any prose or markdown fence before the opening brace
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                self._member.append(char)
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+
+            # A comma or the closing brace at the top level ends a member
+            if self._depth == 1 and char == ",":
+                completed.extend(self._flush_member())
+                continue
+            if self._depth == 0:
+                completed.extend(self._flush_member())
+                self._finished = True
+                continue
+
+            self._member.append(char)
+
+        return completed
+
+    def _flush_member(self) -> List[Tuple[str, Any]]:
+        text = "".join(self._member).strip()
+        self._member = []
+        if not text:
+            return []
+
+        try:
+            # Repairs defects such as trailing commas inside the member
+            member, _ = extract_json("{" + text + "}")
+        except json.JSONDecodeError:
+            print(f"⚠️  Skipping unparseable section: {text[:80]}...")
+            return []
+
+        items = list(member.items())
+        self.sections.update(member)
+        return items
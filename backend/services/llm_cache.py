@@ -0,0 +1,72 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+from services.cache import LRUCache, SQLiteCache, TieredCache
+
+
+def completion_cache_key(
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    temperature: float,
+    max_tokens: int
+) -> str:
+    """
+    Content-addressed key for a chat completion request
+    Identical model, prompts and sampling parameters map to the same key
+    """
+    payload = json.dumps(
+        {
+            "model": model,
+            "system": system_prompt,
+            "user": user_prompt,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Cache of parsed LLM responses
+    Values are kept as JSON text so both tiers hand back fresh objects
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl: Optional[float] = 3600,
+        path: Optional[str] = None
+    ):
+        disk = SQLiteCache(path, ttl=ttl, table="llm_cache") if path else None
+        self.store = TieredCache(LRUCache(max_entries=max_entries, ttl=ttl), disk)
+
+    @classmethod
+    def from_env(cls) -> Optional["LLMCache"]:
+        """Build the cache from LLM_CACHE_* variables, None if disabled"""
+        if os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+            return None
+
+        ttl = float(os.getenv("LLM_CACHE_TTL", "3600"))
+        return cls(
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512")),
+            ttl=ttl if ttl > 0 else None,
+            path=os.getenv("LLM_CACHE_PATH") or None,
+        )
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self.store.get(key)
+        return json.loads(value) if value is not None else None
+
+    async def set(self, key: str, value: Any) -> None:
+        await self.store.set(key, json.dumps(value, ensure_ascii=False))
+
+    def close(self) -> None:
+        self.store.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return self.store.stats()
@@ -0,0 +1,77 @@
+import os
+from dataclasses import dataclass
+from typing import Optional
+import httpx
+from cerebras.cloud.sdk import AsyncCerebras, DefaultAsyncHttpxClient
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+@dataclass
+class LLMSettings:
+    """
+    LLM provider and Cerebras client configuration
+    Pool sizing and timeouts can be tuned through environment variables
+    """
+    api_key: str = ""
+    model: str = "llama-3.3-70b"
+    provider: str = "cerebras"
+    # Another server speaking the chat-completions protocol, e.g. mock_llm_server.py
+    base_url: Optional[str] = None
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    timeout: float = 60.0
+    connect_timeout: float = 5.0
+
+    @classmethod
+    def from_env(cls) -> "LLMSettings":
+        return cls(
+            api_key=os.getenv("CEREBRAS_API_KEY", ""),
+            model=os.getenv("CEREBRAS_MODEL", "llama-3.3-70b"),
+            provider=os.getenv("LLM_PROVIDER", "cerebras"),
+            base_url=os.getenv("LLM_BASE_URL") or None,
+            max_connections=int(os.getenv("CEREBRAS_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("CEREBRAS_MAX_KEEPALIVE_CONNECTIONS", "20")),
+            keepalive_expiry=float(os.getenv("CEREBRAS_KEEPALIVE_EXPIRY", "30")),
+            timeout=float(os.getenv("CEREBRAS_TIMEOUT", "60")),
+            connect_timeout=float(os.getenv("CEREBRAS_CONNECT_TIMEOUT", "5")),
+        )
+
+    @property
+    def api_key_configured(self) -> bool:
+        return bool(self.api_key) and self.api_key != "your-cerebras-api-key-here"
+
+
+def create_async_client(settings: LLMSettings) -> Optional[AsyncCerebras]:
+    """
+    Build an async Cerebras client with its own pooled HTTP connections
+    Returns None when no API key is configured
+    """
+    if not settings.api_key_configured:
+        return None
+
+    try:
+        http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=settings.max_connections,
+                max_keepalive_connections=settings.max_keepalive_connections,
+                keepalive_expiry=settings.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(settings.timeout, connect=settings.connect_timeout),
+        )
+        return AsyncCerebras(
+            api_key=settings.api_key,
+            base_url=settings.base_url,
+            http_client=http_client,
+            # Retries are handled by LLMScheduler, which also honours Retry-After
+            max_retries=0,
+            # Warming opens a separate sync connection that the async pool can't reuse
+            warm_tcp_connection=False,
+        )
+    except Exception as e:
+        print(f"Warning: Failed to initialize Cerebras client: {e}")
+        return None
+
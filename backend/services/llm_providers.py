@@ -0,0 +1,131 @@
+import importlib
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from cerebras.cloud.sdk import AsyncCerebras
+from services.llm_client import LLMSettings, create_async_client
+
+Messages = List[Dict[str, str]]
+
+
+class LLMProvider(ABC):
+    """
+    Chat-completions backend behind every call AIAnalyzer makes
+    complete() returns a response with choices[0].message.content and usage;
+    stream() returns once the stream is open, then yields chunks with
+    choices[0].delta.content (usage may arrive on the last chunk)
+    Failures are raised as the cerebras.cloud.sdk error types LLMScheduler retries on
+    (RateLimitError, InternalServerError, APIConnectionError, APITimeoutError)
+    """
+
+    name = "provider"
+
+    @abstractmethod
+    async def complete(self, model: str, messages: Messages, temperature: float, max_tokens: int) -> Any:
+        ...
+
+    @abstractmethod
+    async def stream(
+        self,
+        model: str,
+        messages: Messages,
+        temperature: float,
+        max_tokens: int
+    ) -> AsyncIterator[Any]:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+
+class CerebrasProvider(LLMProvider):
+    """
+    Cerebras Cloud, or any server speaking the same chat-completions protocol
+    (e.g. mock_llm_server.py) when LLM_BASE_URL points elsewhere
+    """
+
+    name = "cerebras"
+
+    def __init__(self, client: AsyncCerebras):
+        self.client = client
+
+    @classmethod
+    def from_settings(cls, settings: LLMSettings) -> Optional["CerebrasProvider"]:
+        client = create_async_client(settings)
+        return cls(client) if client is not None else None
+
+    async def complete(self, model: str, messages: Messages, temperature: float, max_tokens: int) -> Any:
+        return await self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            max_completion_tokens=max_tokens,
+            temperature=temperature,
+            top_p=1,
+            stream=False
+        )
+
+    async def stream(
+        self,
+        model: str,
+        messages: Messages,
+        temperature: float,
+        max_tokens: int
+    ) -> AsyncIterator[Any]:
+        return await self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            max_completion_tokens=max_tokens,
+            temperature=temperature,
+            top_p=1,
+            stream=True
+        )
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+# LLM_PROVIDER names one of these, or a "package.module:ClassName" with the same from_settings
+PROVIDERS: Dict[str, Callable[[LLMSettings], Optional[LLMProvider]]] = {
+    "cerebras": CerebrasProvider.from_settings,
+}
+
+
+def create_provider(settings: LLMSettings) -> Optional[LLMProvider]:
+    """
+    Build the configured provider
+    Returns None when it isn't usable (e.g. no API key), so callers use their local fallbacks
+    """
+    factory = PROVIDERS.get(settings.provider)
+    if factory is None:
+        module_name, _, class_name = settings.provider.partition(":")
+        try:
+            factory = getattr(importlib.import_module(module_name), class_name).from_settings
+        except (ImportError, AttributeError, ValueError) as e:
+            print(f"Warning: Unknown LLM provider {settings.provider!r}: {e}")
+            return None
+    return factory(settings)
+
+
+# Provider for scripts that run outside the app lifespan; they pass it to AIAnalyzer and close it
+_provider: Optional[LLMProvider] = None
+
+
+def get_default_provider() -> Optional[LLMProvider]:
+    """
+    Return the process-wide provider, creating it on first use
+    Returns None when no provider is configured
+    """
+    global _provider
+
+    if _provider is None:
+        _provider = create_provider(LLMSettings.from_env())
+
+    return _provider
+
+
+async def close_default_provider() -> None:
+    """Close the process-wide provider and release its pooled connections"""
+    global _provider
+
+    if _provider is not None:
+        await _provider.close()
+        _provider = None
@@ -0,0 +1,359 @@
+import asyncio
+import email.utils
+import heapq
+import itertools
+import os
+import random
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, TypeVar
+from cerebras.cloud.sdk import (
+    APIConnectionError,
+    APIStatusError,
+    APITimeoutError,
+    InternalServerError,
+    RateLimitError,
+)
+from services.deadlines import remaining
+
+T = TypeVar("T")
+
+# Errors worth retrying; anything else (bad request, auth) fails immediately
+RETRYABLE_ERRORS = (RateLimitError, InternalServerError, APIConnectionError, APITimeoutError)
+
+
+class Priority(IntEnum):
+    """Lower value is served first when requests queue for a slot"""
+    INTERACTIVE = 0
+    BULK = 1
+
+
+_priority: ContextVar[Priority] = ContextVar("llm_priority", default=Priority.INTERACTIVE)
+
+
+def current_priority() -> Priority:
+    return _priority.get()
+
+
+def set_priority(priority: Priority) -> None:
+    """Priority for LLM calls made in the rest of the current context"""
+    _priority.set(priority)
+
+
+@contextmanager
+def llm_priority(priority: Priority) -> Iterator[None]:
+    """
+    Run LLM calls made in this context (and tasks spawned from it) at the given priority
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit: grows by about one slot per window of successful calls
+    and is cut by backoff_ratio when the provider signals overload
+    Queued callers are admitted in priority order
+    """
+
+    def __init__(
+        self,
+        initial: int = 8,
+        minimum: int = 1,
+        maximum: int = 64,
+        backoff_ratio: float = 0.5,
+        cooldown: float = 2.0
+    ):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff_ratio = backoff_ratio
+        # Many calls fail together when the quota runs out; only cut the limit once per cooldown
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._waiters: List[tuple] = []
+        self._order = itertools.count()
+        self._last_decrease = 0.0
+
+    async def acquire(self, priority: Priority = Priority.INTERACTIVE) -> None:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._order), waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if not waiter.cancelled():
+                # Admitted just as we were cancelled: hand the slot on
+                self.release()
+            raise
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            _, _, waiter = heapq.heappop(self._waiters)
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+    def on_success(self) -> None:
+        if self.limit < self.maximum:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._wake()
+
+    def on_overload(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease >= self.cooldown:
+            self.limit = max(self.minimum, self.limit * self.backoff_ratio)
+            self._last_decrease = now
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, _, waiter in self._waiters if not waiter.done())
+
+
+class TokenBucket:
+    """
+    Per-minute rate limit; takers wait (in arrival order) until enough capacity has refilled
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60
+        self.capacity = capacity or per_minute
+        self.available = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def take(self, amount: float) -> None:
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.available < amount:
+                await asyncio.sleep((amount - self.available) / self.rate)
+                self._refill()
+            self.available -= amount
+
+    def refund(self, amount: float) -> None:
+        """Return over-reserved capacity (e.g. completion tokens that weren't used)"""
+        self._refill()
+        self.available = min(self.capacity, self.available + amount)
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Delay the provider asked for in Retry-After (seconds, milliseconds or HTTP date)"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+
+    headers = response.headers
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        try:
+            parsed = email.utils.parsedate_to_datetime(headers["retry-after"])
+            return max(0.0, parsed.timestamp() - time.time())
+        except (KeyError, TypeError, ValueError):
+            pass
+    return None
+
+
+class LLMScheduler:
+    """
+    Admission control for every chat completion request:
+    adaptive concurrency, request/token rate limits, priorities and retries
+    with jittered exponential backoff that honours Retry-After
+    """
+
+    def __init__(
+        self,
+        initial_concurrency: int = 8,
+        min_concurrency: int = 1,
+        max_concurrency: int = 64,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0
+    ):
+        self.limiter = AdaptiveLimiter(initial_concurrency, min_concurrency, max_concurrency)
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.requests = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.failures = 0
+
+    @classmethod
+    def from_env(cls) -> "LLMScheduler":
+        return cls(
+            initial_concurrency=int(os.getenv("LLM_CONCURRENCY_INITIAL", "8")),
+            min_concurrency=int(os.getenv("LLM_CONCURRENCY_MIN", "1")),
+            max_concurrency=int(os.getenv("LLM_CONCURRENCY_MAX", "64")),
+            requests_per_minute=float(os.getenv("LLM_REQUESTS_PER_MINUTE", "0")) or None,
+            tokens_per_minute=float(os.getenv("LLM_TOKENS_PER_MINUTE", "0")) or None,
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", "4")),
+            base_delay=float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5")),
+            max_delay=float(os.getenv("LLM_RETRY_MAX_DELAY", "30")),
+        )
+
+    async def reserve(self, tokens: int = 0) -> None:
+        """
+        Take the rate-limit budget for one logical request, before it queues for a slot
+        so a throttled request doesn't sit on a slot while it waits; retries reuse it
+        """
+        if self.request_bucket is not None:
+            await self.request_bucket.take(1)
+        if self.token_bucket is not None and tokens:
+            await self.token_bucket.take(tokens)
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority) -> AsyncIterator[None]:
+        """Hold one concurrency slot for a single attempt"""
+        await self.limiter.acquire(priority)
+        try:
+            yield
+        finally:
+            self.limiter.release()
+
+    async def run(
+        self,
+        request: Callable[[], Awaitable[T]],
+        tokens: int = 0,
+        priority: Optional[Priority] = None
+    ) -> T:
+        """
+        Send request() once a slot and rate budget are available, retrying transient failures
+        tokens is the estimated prompt + completion size charged to the token bucket;
+        it is charged once however many attempts it takes, and refunded if all of them fail
+        """
+        await self.reserve(tokens)
+        for attempt in range(self.max_retries + 1):
+            # Read per attempt: a coalesced call can be raised to a waiting caller's priority
+            async with self.slot(current_priority() if priority is None else priority):
+                self.requests += 1
+                try:
+                    result = await request()
+                except Exception as e:
+                    error = e
+                    delay = self._retry_delay(e, attempt)
+                    if delay is None:
+                        self.failures += 1
+                        self.refund(tokens)
+                        raise
+                else:
+                    self.limiter.on_success()
+                    return result
+
+            self.retries += 1
+            print(f"⏳ LLM request failed ({type(error).__name__}), retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def stream(
+        self,
+        request: Callable[[], Awaitable[AsyncIterator[Any]]],
+        tokens: int = 0,
+        priority: Optional[Priority] = None
+    ) -> AsyncIterator[Any]:
+        """
+        Open a streaming request like run() and yield its chunks
+        The concurrency slot is held until the stream is consumed or closed, so running
+        generations count against the limit; usage on the final chunk settles the tokens
+        """
+        await self.reserve(tokens)
+        for attempt in range(self.max_retries + 1):
+            async with self.slot(current_priority() if priority is None else priority):
+                self.requests += 1
+                try:
+                    stream = await request()
+                except Exception as e:
+                    error = e
+                    delay = self._retry_delay(e, attempt)
+                    if delay is None:
+                        self.failures += 1
+                        self.refund(tokens)
+                        raise
+                else:
+                    usage = None
+                    try:
+                        async for chunk in stream:
+                            if getattr(chunk, "usage", None) is not None:
+                                usage = chunk.usage
+                            yield chunk
+                    finally:
+                        # Stop the generation upstream if the consumer went away early
+                        close = getattr(stream, "close", None)
+                        if close is not None:
+                            await close()
+                    self.limiter.on_success()
+                    self.settle(tokens, usage)
+                    return
+
+            self.retries += 1
+            print(f"⏳ LLM stream failed to open ({type(error).__name__}), retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying, None if the error shouldn't be retried"""
+        if isinstance(error, RateLimitError) or (isinstance(error, APIStatusError) and error.status_code == 503):
+            self.rate_limited += 1
+            self.limiter.on_overload()
+
+        if not isinstance(error, RETRYABLE_ERRORS) or attempt >= self.max_retries:
+            return None
+
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            delay = min(self.max_delay, retry_after)
+        else:
+            # Full jitter keeps clients that failed together from retrying together
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+        # Don't wait for a retry the request's deadline won't allow
+        left = remaining()
+        if left is not None and delay >= left:
+            return None
+        return delay
+
+    def settle(self, reserved_tokens: int, usage: Any) -> None:
+        """Refund the token bucket for completion tokens that were reserved but not used"""
+        used = getattr(usage, "total_tokens", None)
+        if self.token_bucket is not None and used is not None and used < reserved_tokens:
+            self.token_bucket.refund(reserved_tokens - used)
+
+    def refund(self, reserved_tokens: int) -> None:
+        """Return the whole token reservation of a request that never got a response"""
+        if self.token_bucket is not None and reserved_tokens:
+            self.token_bucket.refund(reserved_tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency_limit": round(self.limiter.limit, 2),
+            "in_flight": self.limiter.in_flight,
+            "queued": self.limiter.queued,
+            "requests": self.requests,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "failures": self.failures,
+        }
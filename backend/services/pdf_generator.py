@@ -1,106 +1,272 @@
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, StyleSheet1
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import BaseDocTemplate, Frame, PageTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+from reportlab.platypus.doctemplate import NotAtTopPageBreak
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
-from datetime import datetime
-from typing import Dict, Any
+from datetime import date
+from typing import Dict, Any, List, Optional
 import io
+from xml.sax.saxutils import escape
+
+PAGE_SIZE = letter
+MARGIN = 0.75 * inch
+# Room taken by the title block drawn on the first page / the running header on later pages
+FIRST_PAGE_HEADER = 1.1 * inch
+LATER_PAGE_HEADER = 0.35 * inch
+
+SCORE_COLORS = {
+    "good": colors.HexColor('#10b981'),  # Green
+    "moderate": colors.HexColor('#f59e0b'),  # Orange
+    "weak": colors.HexColor('#ef4444'),  # Red
+}
+
+
+def _build_styles() -> StyleSheet1:
+    """Sample stylesheet plus the scorecard's custom paragraph styles"""
+    styles = getSampleStyleSheet()
+
+    # Title style
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#1f2937'),
+        spaceAfter=30,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    ))
+
+    # Section header
+    styles.add(ParagraphStyle(
+        name='SectionHeader',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#2563eb'),
+        spaceAfter=12,
+        spaceBefore=20,
+        fontName='Helvetica-Bold'
+    ))
+
+    # Body text ('BodyText' already exists in the sample stylesheet and is used as is)
+
+    # Bullet points
+    styles.add(ParagraphStyle(
+        name='BulletPoint',
+        parent=styles['Normal'],
+        fontSize=10,
+        textColor=colors.HexColor('#4b5563'),
+        leftIndent=20,
+        spaceAfter=8
+    ))
+
+    return styles
+
+
+def _score_table_style(score_color: colors.Color, background: str, grid: bool) -> TableStyle:
+    commands = [
+        ('BACKGROUND', (0, 0), (0, 0), score_color),
+        ('BACKGROUND', (1, 0), (1, 0), colors.HexColor(background)),
+        ('ALIGN', (0, 0), (0, 0), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (0, 0), 36),
+        ('TEXTCOLOR', (0, 0), (0, 0), colors.white),
+        ('PADDING', (0, 0), (-1, -1), 12),
+        ('BOX', (0, 0), (-1, -1), 2, colors.HexColor('#e5e7eb')),
+    ]
+    if grid:
+        commands.append(('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb')))
+    return TableStyle(commands)
+
+
+# Built once per process: styles and table styles are identical for every scorecard
+# (TableStyle and ParagraphStyle objects are only read while rendering, so sharing them is safe)
+STYLES = _build_styles()
+
+METADATA_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#6b7280')),
+    ('TEXTCOLOR', (1, 0), (1, -1), colors.HexColor('#1f2937')),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+])
+
+KEYWORD_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2563eb')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')]),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e5e7eb')),
+    ('PADDING', (0, 0), (-1, -1), 8),
+])
+
+RANKING_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2563eb')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+    ('ALIGN', (2, 0), (3, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')]),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e5e7eb')),
+    ('PADDING', (0, 0), (-1, -1), 6),
+])
+
+# Score boxes only differ by the score colour, so every variant is prebuilt
+ANALYSIS_SCORE_STYLES = {
+    band: _score_table_style(color, '#f9fafb', grid=True) for band, color in SCORE_COLORS.items()
+}
+INTERVIEW_SCORE_STYLES = {
+    band: _score_table_style(color, '#f0f9ff', grid=False) for band, color in SCORE_COLORS.items()
+}
+
+
+def _score_band(score: int) -> str:
+    if score >= 70:
+        return "good"
+    elif score >= 50:
+        return "moderate"
+    return "weak"
+
+
+def _trim_trailing_space(story: List[Any]) -> None:
+    """Drop spacers at the end of the story, which would otherwise spill onto an empty page"""
+    while story and isinstance(story[-1], Spacer):
+        story.pop()
+
+
+def _draw_static_furniture(canvas: Canvas) -> None:
+    """
+    Define the parts of the page header/footer that never change as PDF form XObjects
+    Each form is written once per document and then placed on every page by reference
+    """
+    width, height = PAGE_SIZE
+    title = STYLES['CustomTitle']
+    subtitle = STYLES['Heading2']
+
+    canvas.beginForm("first_page_header")
+    canvas.setFillColor(title.textColor)
+    canvas.setFont(title.fontName, title.fontSize)
+    canvas.drawCentredString(width / 2, height - MARGIN - title.fontSize, "HireSense")
+    canvas.setFillColor(subtitle.textColor)
+    canvas.setFont(subtitle.fontName, subtitle.fontSize)
+    canvas.drawString(MARGIN, height - MARGIN - title.fontSize - 36, "Job Readiness Scorecard")
+    canvas.endForm()
+
+    canvas.beginForm("running_header")
+    canvas.setFillColor(colors.HexColor('#6b7280'))
+    canvas.setFont('Helvetica-Bold', 9)
+    canvas.drawString(MARGIN, height - MARGIN + 6, "HireSense • Job Readiness Scorecard")
+    canvas.setStrokeColor(colors.HexColor('#e5e7eb'))
+    canvas.setLineWidth(0.5)
+    canvas.line(MARGIN, height - MARGIN, width - MARGIN, height - MARGIN)
+    canvas.endForm()
+
+    canvas.beginForm("footer_rule")
+    canvas.setStrokeColor(colors.HexColor('#e5e7eb'))
+    canvas.setLineWidth(0.5)
+    canvas.line(MARGIN, MARGIN - 12, width - MARGIN, MARGIN - 12)
+    canvas.endForm()
+
+
+def _draw_page(canvas: Canvas, doc: "ScorecardDocTemplate", header: str) -> None:
+    if not canvas.hasForm("footer_rule"):
+        _draw_static_furniture(canvas)
+
+    canvas.saveState()
+    canvas.doForm(header)
+    canvas.doForm("footer_rule")
+
+    # The only per-page drawing: generation time and page number
+    canvas.setFillColor(colors.HexColor('#6b7280'))
+    canvas.setFont('Helvetica-Oblique', 8)
+    canvas.drawString(MARGIN, MARGIN - 24, doc.footer_text)
+    canvas.drawRightString(PAGE_SIZE[0] - MARGIN, MARGIN - 24, f"Page {doc.page}")
+    canvas.restoreState()
+
+
+def _on_first_page(canvas: Canvas, doc: "ScorecardDocTemplate") -> None:
+    _draw_page(canvas, doc, "first_page_header")
+
+
+def _on_later_page(canvas: Canvas, doc: "ScorecardDocTemplate") -> None:
+    _draw_page(canvas, doc, "running_header")
+
+
+class ScorecardDocTemplate(BaseDocTemplate):
+    """
+    Letter document whose header and footer are page furniture rather than story content
+    The first page carries the title block; later pages a running header
+    Built in invariant mode: no wall-clock timestamp or random document ID is embedded,
+    so the same inputs and generated_on date always produce the same bytes
+    """
+
+    def __init__(self, buffer: io.BytesIO, generated_on: date):
+        super().__init__(buffer, pagesize=PAGE_SIZE, topMargin=MARGIN, bottomMargin=MARGIN, invariant=1)
+        self.footer_text = f"Generated by HireSense AI • {generated_on.strftime('%B %d, %Y')}"
+
+        # Frames carry layout state while building, so each document gets its own
+        width, height = PAGE_SIZE
+        first_frame = Frame(
+            self.leftMargin, self.bottomMargin,
+            self.width, height - self.topMargin - self.bottomMargin - FIRST_PAGE_HEADER,
+            id='first'
+        )
+        later_frame = Frame(
+            self.leftMargin, self.bottomMargin,
+            self.width, height - self.topMargin - self.bottomMargin - LATER_PAGE_HEADER,
+            id='later'
+        )
+        self.addPageTemplates([
+            PageTemplate(id='First', frames=[first_frame], onPage=_on_first_page, autoNextPageTemplate='Later'),
+            PageTemplate(id='Later', frames=[later_frame], onPage=_on_later_page),
+        ])
+
 
 class PDFScorecard:
     """
     Generate professional PDF scorecards for resume analysis and interview performance
+    Styles, table styles and page furniture are shared module-level state,
+    so a generator is cheap to create and only lays out the variable content
     """
     
     def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
-    
-    def _setup_custom_styles(self):
-        """Setup custom paragraph styles"""
-        
-        # Title style
-        if 'CustomTitle' not in self.styles:
-            self.styles.add(ParagraphStyle(
-                name='CustomTitle',
-                parent=self.styles['Heading1'],
-                fontSize=24,
-                textColor=colors.HexColor('#1f2937'),
-                spaceAfter=30,
-                alignment=TA_CENTER,
-                fontName='Helvetica-Bold'
-            ))
-        
-        # Section header
-        if 'SectionHeader' not in self.styles:
-            self.styles.add(ParagraphStyle(
-                name='SectionHeader',
-                parent=self.styles['Heading2'],
-                fontSize=16,
-                textColor=colors.HexColor('#2563eb'),
-                spaceAfter=12,
-                spaceBefore=20,
-                fontName='Helvetica-Bold'
-            ))
-        
-        # Body text
-        if 'BodyText' not in self.styles:
-            self.styles.add(ParagraphStyle(
-                name='BodyText',
-                parent=self.styles['Normal'],
-                fontSize=11,
-                textColor=colors.HexColor('#374151'),
-                spaceAfter=10,
-                alignment=TA_JUSTIFY
-            ))
-        
-        # Bullet points
-        if 'BulletPoint' not in self.styles:
-            self.styles.add(ParagraphStyle(
-                name='BulletPoint',
-                parent=self.styles['Normal'],
-                fontSize=10,
-                textColor=colors.HexColor('#4b5563'),
-                leftIndent=20,
-                spaceAfter=8
-            ))
+        self.styles = STYLES
     
     def generate_full_scorecard(
         self,
         analysis: Dict[str, Any],
         interview_summary: Dict[str, Any] = None,
-        candidate_name: str = "Candidate"
+        candidate_name: str = "Candidate",
+        generated_on: Optional[date] = None
     ) -> bytes:
         """
         Generate comprehensive PDF scorecard with analysis and interview results
+        generated_on is the report date (today by default); output is deterministic given it
         """
         
         buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.75*inch, bottomMargin=0.75*inch)
-        story = []
-        
-        # Header
-        story.append(Paragraph("HireSense", self.styles['CustomTitle']))
-        story.append(Paragraph("Job Readiness Scorecard", self.styles['Heading2']))
-        story.append(Spacer(1, 0.2*inch))
+        generated_on = generated_on or date.today()
+        doc = ScorecardDocTemplate(buffer, generated_on)
+        story: List[Any] = []
         
         # Metadata table
         metadata = [
             ["Candidate:", candidate_name],
-            ["Date:", datetime.now().strftime("%B %d, %Y")],
+            ["Date:", generated_on.strftime("%B %d, %Y")],
             ["Report Type:", "Resume Analysis & Interview Performance"]
         ]
         
         metadata_table = Table(metadata, colWidths=[2*inch, 4*inch])
-        metadata_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#6b7280')),
-            ('TEXTCOLOR', (1, 0), (1, -1), colors.HexColor('#1f2937')),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ]))
+        metadata_table.setStyle(METADATA_TABLE_STYLE)
         story.append(metadata_table)
         story.append(Spacer(1, 0.3*inch))
         
@@ -109,28 +275,16 @@ class PDFScorecard:
         
         # Match Score Box
         match_score = analysis.get('match_score', 0)
-        score_color = self._get_score_color(match_score)
         score_label = self._get_score_label(match_score)
         
         score_data = [[
             Paragraph(f"<b>{match_score}%</b>", self.styles['Heading1']),
-            Paragraph(f"<b>{score_label}</b><br/>{analysis.get('overall_assessment', '')[:200]}...", 
+            Paragraph(f"<b>{score_label}</b><br/>{analysis.get('overall_assessment', '')[:200]}...",
                      self.styles['BodyText'])
         ]]
         
         score_table = Table(score_data, colWidths=[1.5*inch, 4.5*inch])
-        score_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, 0), score_color),
-            ('BACKGROUND', (1, 0), (1, 0), colors.HexColor('#f9fafb')),
-            ('ALIGN', (0, 0), (0, 0), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (0, 0), 36),
-            ('TEXTCOLOR', (0, 0), (0, 0), colors.white),
-            ('PADDING', (0, 0), (-1, -1), 12),
-            ('BOX', (0, 0), (-1, -1), 2, colors.HexColor('#e5e7eb')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb')),
-        ]))
+        score_table.setStyle(ANALYSIS_SCORE_STYLES[_score_band(match_score)])
         story.append(score_table)
         story.append(Spacer(1, 0.2*inch))
         
@@ -156,17 +310,7 @@ class PDFScorecard:
                 ])
             
             keyword_table = Table(keyword_data, colWidths=[1.5*inch, 1*inch, 3.5*inch])
-            keyword_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2563eb')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')]),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e5e7eb')),
-                ('PADDING', (0, 0), (-1, -1), 8),
-            ]))
+            keyword_table.setStyle(KEYWORD_TABLE_STYLE)
             story.append(keyword_table)
             story.append(Spacer(1, 0.2*inch))
         
@@ -180,7 +324,9 @@ class PDFScorecard:
         
         # === INTERVIEW PERFORMANCE (if available) ===
         if interview_summary:
-            story.append(PageBreak())
+            # No blank page when the analysis already filled the previous one
+            _trim_trailing_space(story)
+            story.append(NotAtTopPageBreak())
             story.append(Paragraph("🎤 Interview Performance", self.styles['SectionHeader']))
             
             # Overall Interview Score
@@ -189,22 +335,12 @@ class PDFScorecard:
             
             interview_score_data = [[
                 Paragraph(f"<b>{interview_score}%</b>", self.styles['Heading1']),
-                Paragraph(f"<b>Performance Level: {perf_level}</b><br/>Mock interview completed with detailed feedback", 
+                Paragraph(f"<b>Performance Level: {perf_level}</b><br/>Mock interview completed with detailed feedback",
                          self.styles['BodyText'])
             ]]
             
             interview_table = Table(interview_score_data, colWidths=[1.5*inch, 4.5*inch])
-            interview_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (0, 0), self._get_score_color(interview_score)),
-                ('BACKGROUND', (1, 0), (1, 0), colors.HexColor('#f0f9ff')),
-                ('ALIGN', (0, 0), (0, 0), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (0, 0), 36),
-                ('TEXTCOLOR', (0, 0), (0, 0), colors.white),
-                ('PADDING', (0, 0), (-1, -1), 12),
-                ('BOX', (0, 0), (-1, -1), 2, colors.HexColor('#e5e7eb')),
-            ]))
+            interview_table.setStyle(INTERVIEW_SCORE_STYLES[_score_band(interview_score)])
             story.append(interview_table)
             story.append(Spacer(1, 0.2*inch))
             
@@ -231,14 +367,54 @@ class PDFScorecard:
                 for idx, step in enumerate(next_steps[:4], 1):
                     story.append(Paragraph(f"<b>{idx}.</b> {step}", self.styles['BulletPoint']))
         
-        # Footer
-        story.append(Spacer(1, 0.3*inch))
-        story.append(Paragraph(
-            f"<i>Generated by HireSense AI • {datetime.now().strftime('%B %d, %Y at %I:%M %p')}</i>",
-            self.styles['Normal']
-        ))
+        # Build PDF (header and footer are drawn by the page templates)
+        _trim_trailing_space(story)
+        doc.build(story)
+        pdf_bytes = buffer.getvalue()
+        buffer.close()
+        
+        return pdf_bytes
+    
+    def generate_ranking_summary(self, rows: List[Dict[str, Any]]) -> bytes:
+        """
+        Cover page for a batch export: candidates ranked by resume match, then interview score
+        Each row has rank, candidate_name, match_score, interview_score, performance_level and top_gaps
+        """
+        
+        buffer = io.BytesIO()
+        doc = ScorecardDocTemplate(buffer, date.today())
+        
+        story: List[Any] = [
+            Paragraph("🏆 Candidate Ranking", self.styles['SectionHeader']),
+            Paragraph(
+                f"{len(rows)} candidates, ranked by resume match score and then interview score. "
+                f"Individual scorecards follow in ranking order.",
+                self.styles['BodyText']
+            ),
+            Spacer(1, 0.15*inch),
+        ]
+        
+        table_data = [['#', 'Candidate', 'Match', 'Interview', 'Level', 'Top Gaps']]
+        for row in rows:
+            interview_score = row.get('interview_score')
+            table_data.append([
+                str(row['rank']),
+                Paragraph(escape(row['candidate_name']), self.styles['BodyText']),
+                f"{row.get('match_score', 0)}%",
+                f"{interview_score}%" if interview_score is not None else "-",
+                row.get('performance_level') or "-",
+                Paragraph(escape(", ".join(row.get('top_gaps', []))) or "-", self.styles['BodyText']),
+            ])
+        
+        # repeatRows keeps the header on every page of a long ranking
+        ranking_table = Table(
+            table_data,
+            colWidths=[0.4*inch, 1.8*inch, 0.7*inch, 0.8*inch, 1.1*inch, 2.2*inch],
+            repeatRows=1
+        )
+        ranking_table.setStyle(RANKING_TABLE_STYLE)
+        story.append(ranking_table)
         
-        # Build PDF
         doc.build(story)
         pdf_bytes = buffer.getvalue()
         buffer.close()
@@ -247,12 +423,7 @@ class PDFScorecard:
     
     def _get_score_color(self, score: int) -> colors.Color:
         """Get color based on score"""
-        if score >= 70:
-            return colors.HexColor('#10b981')  # Green
-        elif score >= 50:
-            return colors.HexColor('#f59e0b')  # Orange
-        else:
-            return colors.HexColor('#ef4444')  # Red
+        return SCORE_COLORS[_score_band(score)]
     
     def _get_score_label(self, score: int) -> str:
         """Get label based on score"""
@@ -1,7 +1,17 @@
 from pypdf import PdfReader
 from fastapi import UploadFile
 from io import BytesIO
-from typing import Union
+from typing import Any, Dict, List, Optional, Tuple, Union
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+import asyncio
+import os
+import time
+from services.llm_scheduler import Priority, current_priority
+from services.process_pool import RestartablePool
+
+# Pages handled per worker task; longer documents are split across workers
+PAGES_PER_CHUNK = 8
 
 def extract_text_from_pdf(file: Union[UploadFile, bytes]) -> str:
     """
@@ -16,14 +26,142 @@ def extract_text_from_pdf(file: Union[UploadFile, bytes]) -> str:
         pdf_file = BytesIO(file)
     else:
         pdf_file = file.file
-    
-    reader = PdfReader(pdf_file)
-    extracted_text = ""
 
-    for page in reader.pages:
-        extracted_text += page.extract_text() or ""
+    reader = PdfReader(pdf_file)
+    extracted_text = "".join(page.extract_text() or "" for page in reader.pages)
 
     if not extracted_text.strip():
         raise ValueError("No readable text found in PDF")
 
     return extracted_text
+
+def _extract_page_range(content: bytes, start: int, end: Optional[int]) -> Tuple[int, List[Tuple[str, float]]]:
+    """
+    Worker-process entry point: extract pages [start, end)
+    Returns the document's page count and (text, seconds) for each page
+    """
+    reader = PdfReader(BytesIO(content))
+    page_count = len(reader.pages)
+    pages = []
+
+    for index in range(start, min(end or page_count, page_count)):
+        started = time.perf_counter()
+        text = reader.pages[index].extract_text() or ""
+        pages.append((text, time.perf_counter() - started))
+
+    return page_count, pages
+
+@dataclass
+class PDFExtraction:
+    text: str
+    page_count: int
+    page_timings: List[float] = field(default_factory=list)
+    elapsed: float = 0.0
+
+class PDFExtractor:
+    """
+    Extracts PDF text off the event loop in a bounded process pool
+    Long documents are split into page chunks parsed in parallel; each chunk has a
+    hard timeout that starts once a worker picks it up, so time spent queued behind
+    other documents doesn't count
+    Bulk work (calls made at Priority.BULK) gets at most bulk_max_pending of the
+    slots, so a large screening job can't crowd out interactive uploads
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        timeout: float = 30.0,
+        max_pending: int = 32,
+        bulk_max_pending: Optional[int] = None
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        # Bounds queued + running documents so a burst of uploads can't grow the queue unbounded
+        self._slots = asyncio.Semaphore(max_pending)
+        # Bulk documents queue here first; by default they can occupy at most half the workers
+        self.bulk_max_pending = bulk_max_pending or max(1, self.workers // 2)
+        self._bulk_slots = asyncio.Semaphore(self.bulk_max_pending)
+        self.pool = RestartablePool(self.workers)
+        self.timeouts = 0
+
+    @classmethod
+    def from_env(cls) -> "PDFExtractor":
+        return cls(
+            workers=int(os.getenv("PDF_PARSE_WORKERS", "0")) or None,
+            timeout=float(os.getenv("PDF_PARSE_TIMEOUT", "30")),
+            max_pending=int(os.getenv("PDF_PARSE_MAX_PENDING", "32")),
+            bulk_max_pending=int(os.getenv("PDF_PARSE_BULK_MAX_PENDING", "0")) or None,
+        )
+
+    @asynccontextmanager
+    async def _slot(self):
+        if current_priority() >= Priority.BULK:
+            async with self._bulk_slots, self._slots:
+                yield
+        else:
+            async with self._slots:
+                yield
+
+    async def extract(self, content: bytes) -> PDFExtraction:
+        """
+        Extract text from PDF bytes
+        Raises ValueError for unreadable PDFs and TimeoutError if parsing takes too long
+        """
+        async with self._slot():
+            started = time.perf_counter()
+            try:
+                page_count, pages = await self._extract_pages(content)
+            except asyncio.TimeoutError:
+                # The pool has retired the stuck worker; it is replaced once the
+                # other documents in its pool have finished
+                self.timeouts += 1
+                raise TimeoutError(f"PDF parsing timed out after {self.timeout:.0f}s")
+
+        text = "".join(text for text, _ in pages)
+        if not text.strip():
+            raise ValueError("No readable text found in PDF")
+
+        return PDFExtraction(
+            text=text,
+            page_count=page_count,
+            page_timings=[seconds for _, seconds in pages],
+            elapsed=time.perf_counter() - started,
+        )
+
+    async def _extract_pages(self, content: bytes) -> Tuple[int, List[Tuple[str, float]]]:
+        # The first chunk also tells us how many pages there are
+        page_count, pages = await self.pool.run(
+            _extract_page_range, content, 0, PAGES_PER_CHUNK, timeout=self.timeout
+        )
+        if page_count <= PAGES_PER_CHUNK:
+            return page_count, pages
+
+        tasks = [
+            asyncio.ensure_future(self.pool.run(
+                _extract_page_range, content, start, start + PAGES_PER_CHUNK, timeout=self.timeout
+            ))
+            for start in range(PAGES_PER_CHUNK, page_count, PAGES_PER_CHUNK)
+        ]
+        try:
+            chunks = await asyncio.gather(*tasks)
+        except BaseException:
+            # Don't leave the document's other chunks holding workers
+            for task in tasks:
+                task.cancel()
+            raise
+        for _, chunk_pages in chunks:
+            pages.extend(chunk_pages)
+
+        return page_count, pages
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "timeout": self.timeout,
+            "timeouts": self.timeouts,
+            "bulk_max_pending": self.bulk_max_pending,
+            **self.pool.stats(),
+        }
+
+    def close(self) -> None:
+        self.pool.close()
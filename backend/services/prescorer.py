@@ -0,0 +1,100 @@
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List
+from services.skill_taxonomy import get_skill_matcher
+from services.text_cleaner import STOPWORDS, clean_job_description, strip_boilerplate
+
+# BM25 saturation parameters
+K1 = 1.2
+B = 0.75
+# Resume length (in terms) treated as "average" for length normalisation
+AVERAGE_RESUME_TERMS = 400
+# Taxonomy skills carry the score; plain JD words only nudge it, since most are
+# generic ("collaborate", "fast-paced") rather than screening criteria
+SKILL_WEIGHT = 2.0
+WORD_WEIGHT = 0.25
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased content terms, with the same normalisation as clean_job_description"""
+    return [
+        word for word in re.findall(r"[a-z][a-z0-9]+", clean_job_description(text))
+        if word not in STOPWORDS
+    ]
+
+
+def extract_terms(text: str) -> Counter:
+    """
+    Term counts for scoring: canonical taxonomy skills plus remaining plain words
+    Text covered by a skill mention isn't counted again as words, so "k8s" and
+    "Kubernetes" both count as the single term "Kubernetes"
+    """
+    mentions = get_skill_matcher().find(text)
+    terms = Counter(skill for _, _, skill in mentions)
+
+    remainder = []
+    position = 0
+    for start, end, _ in mentions:
+        remainder.append(text[position:start])
+        position = end
+    remainder.append(text[position:])
+
+    terms.update(tokenize(" ".join(remainder)))
+    return terms
+
+
+class KeywordScorer:
+    """
+    Deterministic resume/JD keyword match scorer
+    The job description is compiled once, so scoring many resumes against it is cheap.
+    EEO/benefits boilerplate is stripped first, and only taxonomy skills are reported as
+    matched/missing keywords (plain words only when the JD names no known skill)
+    """
+
+    def __init__(self, job_description: str, max_terms: int = 40):
+        skills = set(get_skill_matcher().taxonomy)
+        counts = extract_terms(strip_boilerplate(job_description))
+
+        # Term weight grows with how often the JD repeats it, damped logarithmically
+        weights = {
+            term: (SKILL_WEIGHT if term in skills else WORD_WEIGHT) * (1.0 + math.log(count))
+            for term, count in counts.items()
+        }
+        top_terms = sorted(weights, key=lambda term: (-weights[term], term))[:max_terms]
+        self.weights: Dict[str, float] = {term: weights[term] for term in top_terms}
+        self.skills = [term for term in top_terms if term in skills]
+        self.keywords = set(self.skills or top_terms)
+        self._max_total = sum(self.weights.values())
+
+    def score(self, resume_text: str) -> Dict[str, Any]:
+        """
+        Score a resume against the compiled job description
+        Returns match_score (0-100) plus matched and missing keywords, highest weight first
+        """
+        counts = extract_terms(resume_text)
+        length_norm = K1 * (1 - B + B * sum(counts.values()) / AVERAGE_RESUME_TERMS)
+
+        total = 0.0
+        matched = []
+        missing = []
+        for term, weight in self.weights.items():
+            tf = counts.get(term, 0)
+            if tf:
+                # BM25 term saturation, capped so one mention in an average-length resume earns full weight
+                total += weight * min(1.0, tf * (K1 + 1) / (tf + length_norm))
+            if term in self.keywords:
+                (matched if tf else missing).append(term)
+
+        match_score = round(100 * total / self._max_total) if self._max_total else 0
+
+        return {
+            "match_score": min(100, match_score),
+            "matched_keywords": matched,
+            "missing_keywords": missing,
+        }
+
+
+def prescore(resume_text: str, job_description: str) -> Dict[str, Any]:
+    """One-off local score of a resume against a job description"""
+    return KeywordScorer(job_description).score(resume_text)
@@ -0,0 +1,151 @@
+import asyncio
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def _register_worker(
+    pids: "multiprocessing.SimpleQueue",
+    initializer: Optional[Callable[..., None]],
+    initargs: Tuple[Any, ...]
+) -> None:
+    """Worker initializer: report this process's pid, then run the caller's initializer"""
+    pids.put(os.getpid())
+    if initializer is not None:
+        initializer(*initargs)
+
+
+class RestartablePool:
+    """
+    Process pool whose stuck workers can be dropped without failing unrelated work
+    At most `workers` calls are submitted at once, so a call starts running as soon as
+    it is submitted and run()'s timeout measures work, not time queued behind others.
+    A worker busy past its caller's timeout can't be cancelled. retire() sends new work
+    to a fresh pool and terminates the old one only once the rest of its in-flight
+    work has finished, so concurrent callers aren't broken by someone else's timeout.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: Tuple[Any, ...] = ()
+    ):
+        self.workers = workers
+        self.initializer = initializer
+        self.initargs = initargs
+        self._slots = asyncio.Semaphore(workers)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Futures still awaited, per pool (current and retiring)
+        self._in_flight: Dict[ProcessPoolExecutor, int] = {}
+        self._retiring: Dict[ProcessPoolExecutor, None] = {}
+        # Each pool's workers report their pids here as they start
+        self._pid_queues: Dict[ProcessPoolExecutor, "multiprocessing.SimpleQueue"] = {}
+        self.restarts = 0
+        self.timeouts = 0
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        # A worker that crashed breaks the whole executor; start over with a new one
+        if self._pool is not None and getattr(self._pool, "_broken", False):
+            self._retire_pool()
+        if self._pool is None:
+            pids = multiprocessing.SimpleQueue()
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_register_worker,
+                initargs=(pids, self.initializer, self.initargs)
+            )
+            self._in_flight[self._pool] = 0
+            self._pid_queues[self._pool] = pids
+        return self._pool
+
+    def submit(self, fn: Callable[..., T], *args: Any) -> "asyncio.Future[T]":
+        """Run fn(*args) in a worker; cancelling the returned future abandons the call"""
+        pool = self.executor
+        future = asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+        self._in_flight[pool] += 1
+        future.add_done_callback(lambda _: self._finished(pool))
+        return future
+
+    async def run(self, fn: Callable[..., T], *args: Any, timeout: Optional[float] = None) -> T:
+        """
+        Wait for a free worker, then run fn(*args) on it
+        Raises asyncio.TimeoutError if the call itself runs longer than timeout;
+        the worker is then retired
+        """
+        async with self._slots:
+            try:
+                return await asyncio.wait_for(self.submit(fn, *args), timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                self.retire()
+                raise
+
+    def retire(self) -> None:
+        """Route new work to a fresh pool; the current one is reaped once its other work is done"""
+        if self._pool is not None:
+            self.restarts += 1
+            self._retire_pool()
+
+    def _retire_pool(self) -> None:
+        pool, self._pool = self._pool, None
+        self._retiring[pool] = None
+        self._reap(pool)
+
+    def _finished(self, pool: ProcessPoolExecutor) -> None:
+        if pool not in self._in_flight:
+            # Already shut down by close()
+            return
+        self._in_flight[pool] -= 1
+        if pool in self._retiring:
+            self._reap(pool)
+
+    def _reap(self, pool: ProcessPoolExecutor) -> None:
+        # Timed-out callers cancelled their futures, so only abandoned work can still be running
+        if self._in_flight[pool] > 0:
+            return
+        del self._retiring[pool]
+        del self._in_flight[pool]
+        self._terminate(pool)
+
+    def _terminate(self, pool: ProcessPoolExecutor) -> None:
+        for pid in self._worker_pids(pool):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except (ProcessLookupError, PermissionError):
+                pass
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _worker_pids(self, pool: ProcessPoolExecutor) -> Set[int]:
+        pids = self._pid_queues.pop(pool, None)
+        if pids is None:
+            return set()
+        found = set()
+        while not pids.empty():
+            found.add(pids.get())
+        pids.close()
+        return found
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "restarts": self.restarts,
+            "worker_timeouts": self.timeouts,
+            "retiring_pools": len(self._retiring),
+        }
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pid_queues.pop(self._pool, None)
+            self._pool = None
+        for pool in list(self._retiring):
+            self._terminate(pool)
+        self._retiring.clear()
+        self._in_flight.clear()
+        self._pid_queues.clear()
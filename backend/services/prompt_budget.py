@@ -0,0 +1,165 @@
+import math
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from services.prescorer import KeywordScorer, extract_terms
+from services.text_cleaner import strip_boilerplate
+
+# Approximate characters per token for each model family (no tokenizer dependency needed)
+CHARS_PER_TOKEN = {
+    "llama": 3.8,
+    "qwen": 3.5,
+    "gpt-oss": 4.0,
+}
+DEFAULT_CHARS_PER_TOKEN = 4.0
+
+# Token budgets for the variable inputs of each prompt: (job description, resume)
+PROMPT_BUDGETS: Dict[str, Tuple[int, int]] = {
+    "analysis": (1200, 3000),
+    "questions": (600, 450),
+    "evaluation": (100, 0),
+    "rewrite": (120, 100),
+}
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9•\-])")
+
+
+def chars_per_token(model: Optional[str]) -> float:
+    name = (model or "").lower()
+    for family, ratio in CHARS_PER_TOKEN.items():
+        if family in name:
+            return ratio
+    return DEFAULT_CHARS_PER_TOKEN
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Estimated prompt tokens for text on the given model"""
+    return math.ceil(len(text) / chars_per_token(model)) if text else 0
+
+
+def _units(text: str) -> List[str]:
+    """Lines, with long prose lines split into sentences"""
+    units = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        if len(line) > 200:
+            units.extend(part for part in _SENTENCE_SPLIT.split(line) if part.strip())
+        else:
+            units.append(line)
+    return units
+
+
+def select_units(text: str, max_tokens: int, weights: Dict[str, float], model: Optional[str] = None) -> str:
+    """
+    Keep the highest-signal lines/sentences of text that fit in max_tokens, in their original order
+    Signal is the weight of job description terms a unit mentions per token; headings
+    (lines ending in ":") are kept whenever something under them is
+    """
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text, model) <= max_tokens:
+        return text
+
+    units = _units(text)
+    ranked = []
+    for index, unit in enumerate(units):
+        if unit.rstrip().endswith(":"):
+            continue
+        terms = extract_terms(unit)
+        signal = sum(weights.get(term, 0.0) for term in terms)
+        if re.search(r"\d", unit):
+            # Metrics and dates make bullets concrete
+            signal += 0.5
+        ranked.append((signal / math.sqrt(count_tokens(unit, model) or 1), index))
+
+    selected = set()
+    used = 0
+    for _, index in sorted(ranked, key=lambda item: (-item[0], item[1])):
+        cost = count_tokens(units[index], model) + 1
+        if used + cost <= max_tokens:
+            selected.add(index)
+            used += cost
+
+    if not selected:
+        # A single unit larger than the whole budget: hard cut
+        return text[:int(max_tokens * chars_per_token(model))]
+
+    kept = []
+    heading = None
+    for index, unit in enumerate(units):
+        if unit.rstrip().endswith(":"):
+            heading = unit
+        elif index in selected:
+            if heading is not None:
+                kept.append(heading)
+                heading = None
+            kept.append(unit)
+    return "\n".join(kept)
+
+
+@dataclass
+class BudgetedInputs:
+    job_description: str
+    resume: str
+    original_tokens: int
+    tokens: int
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.original_tokens - self.tokens
+
+
+class PromptBudgeter:
+    """
+    Fits job description and resume text into a per-prompt token budget
+    Boilerplate is dropped first, then the lowest-signal sentences
+    """
+
+    def __init__(self, model: Optional[str] = None, budgets: Optional[Dict[str, Tuple[int, int]]] = None):
+        self.model = model
+        self.budgets = budgets or PROMPT_BUDGETS
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.original_tokens = 0
+        self.sent_tokens = 0
+
+    def count(self, text: str) -> int:
+        return count_tokens(text, self.model)
+
+    def fit(self, kind: str, job_description: str, resume: Optional[str] = None) -> BudgetedInputs:
+        """
+        Job description and (already sectioned) resume text trimmed to the budget for kind
+        """
+        jd_budget, resume_budget = self.budgets[kind]
+        resume = resume or ""
+
+        cleaned_jd = strip_boilerplate(job_description)
+        weights = KeywordScorer(cleaned_jd).weights
+        fitted = BudgetedInputs(
+            job_description=select_units(cleaned_jd, jd_budget, weights, self.model),
+            resume=select_units(resume, resume_budget, weights, self.model) if resume else "",
+            original_tokens=self.count(job_description) + self.count(resume),
+            tokens=0,
+        )
+        fitted.tokens = self.count(fitted.job_description) + self.count(fitted.resume)
+
+        with self._lock:
+            self.calls += 1
+            self.original_tokens += fitted.original_tokens
+            self.sent_tokens += fitted.tokens
+
+        if fitted.saved_tokens > 0:
+            print(f"✂️  {kind} prompt inputs: {fitted.original_tokens} → {fitted.tokens} tokens (saved {fitted.saved_tokens})")
+        return fitted
+
+    def stats(self) -> Dict[str, Any]:
+        saved = self.original_tokens - self.sent_tokens
+        return {
+            "calls": self.calls,
+            "original_tokens": self.original_tokens,
+            "sent_tokens": self.sent_tokens,
+            "saved_tokens": saved,
+            "saved_ratio": round(saved / self.original_tokens, 4) if self.original_tokens else 0.0,
+        }
@@ -0,0 +1,320 @@
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+from services.prompt_budget import count_tokens
+
+# Prompt templates are built once at import. Every user prompt puts its static
+# instructions first and the per-request fields last, so the system prompt plus
+# the start of the user prompt form a byte-identical prefix that provider-side
+# prompt caching can reuse across calls.
+
+# Shortest prefix providers will cache (provider-specific)
+PROMPT_CACHE_MIN_TOKENS = int(os.getenv("PROMPT_CACHE_MIN_TOKENS", "128"))
+
+
+class PromptTemplate:
+    """
+    Static system prompt plus a str.format user template whose fields come after its instructions
+    """
+
+    def __init__(self, name: str, system: str, user: str):
+        self.name = name
+        self.system = system
+        self.user = user
+        # Everything up to the first field is identical on every call
+        self.static_user_prefix = user[:user.index("{")]
+
+    def render(self, **fields: Any) -> Tuple[str, str]:
+        """(system_prompt, user_prompt) for one request"""
+        return self.system, self.user.format(**fields)
+
+
+ANALYSIS_PROMPT = PromptTemplate(
+    "analysis",
+    system="""You are an expert career mentor and ATS specialist with 15+ years of experience in recruitment and career development.
+
+Your role is to act as a MENTOR, not just a scanner. When a resume doesn't pass, you must explain WHY it's failing and WHAT the candidate needs to understand about the gap between their profile and the job requirements.
+
+You MUST return ONLY a valid JSON object with no additional text, explanations, or markdown formatting.
+
+The JSON must follow this exact structure:
+{
+  "match_score": <number between 0-100>,
+  "overall_assessment": "<2-3 sentences explaining if this resume would pass ATS screening and why/why not>",
+  "why_not_passing": {
+    "main_reasons": [
+      "<Reason 1: Explain what's fundamentally wrong>",
+      "<Reason 2: Another critical issue>",
+      "<Reason 3: etc.>"
+    ],
+    "ats_perspective": "<Explain how an ATS system would view this resume - what it's looking for and what it's not finding>"
+  },
+  "missing_keywords": [
+    {
+      "keyword": "<missing keyword/skill>",
+      "importance": "<critical/high/medium>",
+      "why_matters": "<Explain WHY this keyword is important for this role and what impact its absence has>"
+    }
+  ],
+  "gap_analysis": {
+    "experience_gaps": "<Detailed explanation of experience mismatches - what the JD needs vs what the resume shows>",
+    "skills_gaps": "<Detailed explanation of technical/soft skill gaps and their significance>",
+    "qualification_gaps": "<Education, certifications, or other qualification gaps>"
+  },
+  "section_detailed_feedback": {
+    "summary": {
+      "current_state": "<What's currently there or missing>",
+      "problem": "<Why it's not working for this role>",
+      "impact": "<How this affects ATS screening>"
+    },
+    "experience": {
+      "current_state": "<What's currently there>",
+      "problem": "<Why it's not aligning with job requirements>",
+      "impact": "<How this affects candidacy>"
+    },
+    "skills": {
+      "current_state": "<What skills are listed>",
+      "problem": "<What's missing or not emphasized>",
+      "impact": "<How this affects technical screening>"
+    }
+  },
+  "actionable_next_steps": [
+    "<Step 1: Most critical action to take>",
+    "<Step 2: Next important action>",
+    "<Step 3: etc.>"
+  ]
+}
+
+IMPORTANT RULES:
+1. Be BRUTALLY HONEST but CONSTRUCTIVE - explain the real problems
+2. Think like an ATS system first, then like a hiring manager
+3. Explain WHY things matter, not just WHAT is missing
+4. Focus on the GAPS - what's preventing this resume from passing
+5. Provide clear, actionable explanations that help the candidate understand their weaknesses
+6. Match score should reflect realistic ATS pass rate (typically 60+ to pass initial screening)
+7. Use mentoring language - teach, don't just critique""",
+    user="""Analyze the resume below as a MENTOR explaining why it may not pass the ATS screening.
+
+Provide a comprehensive analysis that:
+1. Explains if this resume would pass ATS screening (match_score)
+2. Details WHY it's not passing or what's holding it back
+3. Identifies missing critical keywords with explanations of their importance
+4. Analyzes the gaps between candidate profile and job requirements
+5. Gives detailed feedback for each resume section with current state, problem, and impact
+6. Provides actionable next steps
+
+Return ONLY the JSON object following the exact structure above.
+
+JOB DESCRIPTION:
+{job_description}
+
+RESUME:
+{resume}""",
+)
+
+QUESTIONS_PROMPT = PromptTemplate(
+    "questions",
+    system="""You are an experienced technical recruiter conducting a mock interview.
+Your goal is to ask questions that specifically target the candidate's WEAK AREAS and MISSING SKILLS identified in their resume analysis.
+
+Generate interview questions that:
+1. Test knowledge in areas where the candidate is weak
+2. Allow the candidate to demonstrate understanding of missing concepts
+3. Are realistic questions a hiring manager would ask for this role
+4. Mix technical, behavioral, and situational questions
+5. Help the candidate practice explaining gaps in their experience
+
+Return ONLY a JSON array of question objects:
+[
+  {
+    "question": "<the interview question>",
+    "category": "technical|behavioral|situational",
+    "focus_area": "<which weakness/gap this targets>",
+    "why_asking": "<brief explanation of why this question matters for this role>"
+  }
+]""",
+    user="""Based on the analysis below, generate the requested number of targeted interview questions that will help the candidate:
+1. Practice explaining their experience in the context of missing skills
+2. Demonstrate problem-solving in areas they're weak
+3. Show transferable skills that could compensate for gaps
+
+Return ONLY the JSON array of question objects.
+
+JOB DESCRIPTION:
+{job_description}
+
+RELEVANT RESUME SECTIONS:
+{resume}
+
+CANDIDATE'S WEAK AREAS:
+Missing Keywords: {missing_keywords}
+Experience Gaps: {experience_gaps}
+Skills Gaps: {skills_gaps}
+
+NUMBER OF QUESTIONS: {count}""",
+)
+
+EVALUATION_PROMPT = PromptTemplate(
+    "evaluation",
+    system="""You are a professional interview coach providing feedback on interview answers.
+
+Evaluate the answer using the STAR framework:
+- Situation: Did they set up the context?
+- Task: Did they explain what needed to be done?
+- Action: Did they describe what THEY specifically did?
+- Result: Did they share the outcome/impact?
+
+Return ONLY a JSON object:
+{
+  "score": <0-100>,
+  "star_analysis": {
+    "situation": "<present/missing/weak>",
+    "task": "<present/missing/weak>",
+    "action": "<present/missing/weak>",
+    "result": "<present/missing/weak>"
+  },
+  "strengths": ["<strength 1>", "<strength 2>"],
+  "improvements": ["<improvement 1>", "<improvement 2>"],
+  "suggestion": "<How to improve this answer specifically>",
+  "example_reframe": "<Better way to phrase this answer>"
+}""",
+    user="""Evaluate the interview answer below and provide constructive feedback using STAR framework.
+Return ONLY the JSON object.
+
+JOB CONTEXT: {job_description}
+
+QUESTION: {question}
+
+ANSWER: {answer}""",
+)
+
+REWRITE_PROMPT = PromptTemplate(
+    "rewrite",
+    system="""You are an expert resume writer who specializes in transforming weak bullet points into impactful STAR-format accomplishments.
+
+Your goal is to take a task-oriented bullet and rewrite it to emphasize:
+- Situation/Context (briefly)
+- Task/Challenge 
+- Action (specific steps YOU took)
+- Result (quantifiable impact, metrics, outcomes)
+
+Return ONLY a JSON object:
+{
+  "original": "<the original bullet>",
+  "rewritten": "<the improved STAR-format bullet>",
+  "improvements": {
+    "before_issues": ["<issue 1>", "<issue 2>"],
+    "after_strengths": ["<strength 1>", "<strength 2>"]
+  },
+  "star_breakdown": {
+    "situation": "<what was the context>",
+    "task": "<what needed to be done>",
+    "action": "<what you specifically did>",
+    "result": "<quantifiable outcome>"
+  },
+  "keywords_added": ["<keyword 1>", "<keyword 2>"],
+  "impact_score_improvement": <0-100, how much better is this>
+}
+
+RULES:
+1. Start with an action verb (Led, Developed, Implemented, Optimized, etc.)
+2. Include specific metrics/numbers (%, $, time saved, users impacted)
+3. Focus on RESULTS and IMPACT, not just tasks
+4. Make it relevant to the target job description
+5. Keep it concise (1-2 lines max)
+6. Use industry-standard keywords from the JD""",
+    user="""Rewrite the resume bullet point below using STAR framework.
+
+Transform it into a powerful, results-oriented bullet that:
+1. Shows clear impact with metrics
+2. Uses relevant keywords from the JD
+3. Follows STAR framework
+4. Emphasizes what YOU accomplished
+
+Return ONLY the JSON object.
+
+TARGET JOB DESCRIPTION:
+{job_description}
+
+RESUME CONTEXT (for consistency):
+{resume_context}
+
+ORIGINAL BULLET:
+{original_bullet}""",
+)
+
+# Appended to the original user prompt when a reply came back without some of its fields,
+# so the follow-up shares the original request's cacheable prefix
+MISSING_FIELDS_INSTRUCTIONS = """
+
+Your previous reply was cut off or incomplete. Return ONLY a JSON object containing just these fields, following the same structure: {fields}"""
+
+PROMPT_TEMPLATES = {
+    template.system: template
+    for template in (ANALYSIS_PROMPT, QUESTIONS_PROMPT, EVALUATION_PROMPT, REWRITE_PROMPT)
+}
+
+
+class PrefixCacheStats:
+    """
+    Per-template prefix-cache eligibility of the prompts actually sent to the provider
+    A call is eligible when its static prefix is byte-identical to the template's and
+    at least PROMPT_CACHE_MIN_TOKENS long; shared_prefix_tokens also counts request
+    fields (e.g. the same job description) repeated from the previous call
+    """
+
+    def __init__(self, model: Optional[str] = None, min_tokens: int = PROMPT_CACHE_MIN_TOKENS):
+        self.model = model
+        self.min_tokens = min_tokens
+        self._lock = threading.Lock()
+        self._last_prompt: Dict[str, str] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self.provider_cached_tokens = 0
+
+    def record(self, system_prompt: str, user_prompt: str) -> None:
+        template = PROMPT_TEMPLATES.get(system_prompt)
+        name = template.name if template is not None else "other"
+        prompt = system_prompt + user_prompt
+
+        static_tokens = 0
+        if template is not None and user_prompt.startswith(template.static_user_prefix):
+            static_tokens = count_tokens(system_prompt + template.static_user_prefix, self.model)
+
+        with self._lock:
+            previous = self._last_prompt.get(name, "")
+            self._last_prompt[name] = prompt
+            shared = os.path.commonprefix([previous, prompt])
+
+            entry = self._stats.setdefault(name, {
+                "calls": 0, "eligible_calls": 0, "prompt_tokens": 0,
+                "static_prefix_tokens": 0, "shared_prefix_tokens": 0,
+            })
+            entry["calls"] += 1
+            entry["eligible_calls"] += static_tokens >= self.min_tokens
+            entry["prompt_tokens"] += count_tokens(prompt, self.model)
+            entry["static_prefix_tokens"] += static_tokens
+            entry["shared_prefix_tokens"] += count_tokens(shared, self.model)
+
+    def record_usage(self, usage: Any) -> None:
+        """Add cached prompt tokens reported by the provider, if it reports them"""
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None)
+        if cached:
+            with self._lock:
+                self.provider_cached_tokens += cached
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            templates = {}
+            for name, entry in self._stats.items():
+                templates[name] = {
+                    **entry,
+                    "eligible_rate": round(entry["eligible_calls"] / entry["calls"], 4),
+                    "cacheable_ratio": round(entry["shared_prefix_tokens"] / entry["prompt_tokens"], 4)
+                    if entry["prompt_tokens"] else 0.0,
+                }
+            return {
+                "min_tokens": self.min_tokens,
+                "provider_cached_tokens": self.provider_cached_tokens,
+                "templates": templates,
+            }
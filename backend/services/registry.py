@@ -0,0 +1,107 @@
+from typing import Any, Dict, Optional
+from fastapi import Request
+from services.ai_analyzer import AIAnalyzer
+from services.llm_cache import LLMCache
+from services.llm_client import LLMSettings
+from services.llm_providers import create_provider
+from services.hedging import HedgedRequests
+from services.llm_scheduler import LLMScheduler
+from services.pdf_parcer import PDFExtractor
+from services.resume_store import ResumeStore
+from services.scorecard_cache import ScorecardCache
+from services.scorecard_renderer import ScorecardRenderer
+from services.screening import BulkScreener
+from services.session_store import SessionStore
+from services.skill_taxonomy import get_skill_matcher
+
+
+class ServiceRegistry:
+    """
+    Process-wide services created once in the application lifespan
+    Routes receive them through FastAPI dependencies instead of building their own
+    """
+
+    def __init__(self, settings: Optional[LLMSettings] = None):
+        self.settings = settings or LLMSettings.from_env()
+        # Compile the skill taxonomy automaton up front rather than on the first request
+        self.skill_matcher = get_skill_matcher()
+        self.provider = create_provider(self.settings)
+        self.llm_cache = LLMCache.from_env()
+        self.scheduler = LLMScheduler.from_env()
+        self.analyzer = AIAnalyzer(
+            provider=self.provider,
+            model=self.settings.model,
+            cache=self.llm_cache,
+            scheduler=self.scheduler,
+            hedging=HedgedRequests.from_env()
+        )
+        self.pdf_extractor = PDFExtractor.from_env()
+        self.resume_store = ResumeStore.from_env(self.pdf_extractor)
+        self.session_store = SessionStore.from_env()
+        self.screener = BulkScreener.from_env(self.analyzer, self.pdf_extractor)
+        self.scorecard_renderer = ScorecardRenderer.from_env()
+        self.scorecard_cache = ScorecardCache.from_env()
+
+    async def close(self) -> None:
+        """Release pooled connections and cache handles on shutdown"""
+        await self.screener.close()
+        self.pdf_extractor.close()
+        self.scorecard_renderer.close()
+        self.scorecard_cache.close()
+        self.resume_store.close()
+        self.session_store.close()
+        if self.provider is not None:
+            await self.provider.close()
+            self.provider = None
+        if self.llm_cache is not None:
+            self.llm_cache.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "llm_cache": self.llm_cache.stats() if self.llm_cache is not None else None,
+            "llm_scheduler": self.scheduler.stats(),
+            "hedging": self.analyzer.hedging.stats(),
+            "prompt_budget": self.analyzer.budget.stats(),
+            "prompt_cache": self.analyzer.prompt_cache.stats(),
+            "single_flight": self.analyzer.single_flight.stats(),
+            "output_repair": self.analyzer.output_repair.stats(),
+            "screening": self.screener.stats(),
+            "pdf_extractor": self.pdf_extractor.stats(),
+            "scorecard_renderer": self.scorecard_renderer.stats(),
+            "scorecard_cache": self.scorecard_cache.stats(),
+            "resume_store": self.resume_store.stats(),
+            "sessions": self.session_store.stats(),
+        }
+
+
+def get_registry(request: Request) -> ServiceRegistry:
+    return request.app.state.services
+
+
+def get_analyzer(request: Request) -> AIAnalyzer:
+    """FastAPI dependency returning the shared AIAnalyzer"""
+    return get_registry(request).analyzer
+
+
+def get_pdf_extractor(request: Request) -> PDFExtractor:
+    return get_registry(request).pdf_extractor
+
+
+def get_resume_store(request: Request) -> ResumeStore:
+    return get_registry(request).resume_store
+
+
+def get_session_store(request: Request) -> SessionStore:
+    return get_registry(request).session_store
+
+
+def get_screener(request: Request) -> BulkScreener:
+    return get_registry(request).screener
+
+
+def get_scorecard_renderer(request: Request) -> ScorecardRenderer:
+    return get_registry(request).scorecard_renderer
+
+
+def get_scorecard_cache(request: Request) -> ScorecardCache:
+    return get_registry(request).scorecard_cache
@@ -0,0 +1,135 @@
+from typing import Any, Dict, List, Optional, Union
+from pydantic import BaseModel, ConfigDict
+
+# Typed shapes of the JSON the analyzer returns
+# Validation runs in pydantic-core and the routes serialize through these models
+# instead of the generic encoder. Extra keys (e.g. the fallback "note") are kept.
+
+Score = Union[int, float]
+
+
+class ResponseModel(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class MissingKeyword(ResponseModel):
+    keyword: str
+    importance: str = "medium"
+    why_matters: str = ""
+
+
+class WhyNotPassing(ResponseModel):
+    main_reasons: List[str] = []
+    ats_perspective: str = ""
+
+
+class GapAnalysis(ResponseModel):
+    experience_gaps: str = ""
+    skills_gaps: str = ""
+    qualification_gaps: str = ""
+
+
+class SectionFeedback(ResponseModel):
+    current_state: str = ""
+    problem: str = ""
+    impact: str = ""
+
+
+class AnalysisResult(ResponseModel):
+    match_score: Score
+    overall_assessment: str
+    why_not_passing: WhyNotPassing
+    missing_keywords: List[MissingKeyword]
+    gap_analysis: GapAnalysis
+    section_detailed_feedback: Dict[str, SectionFeedback]
+    actionable_next_steps: List[str]
+
+
+class InterviewQuestion(ResponseModel):
+    question: str
+    category: str = "technical"
+    focus_area: str = ""
+    why_asking: str = ""
+
+
+class QuestionsResponse(BaseModel):
+    questions: List[InterviewQuestion]
+    total: int
+    # Passed through from the caller's analysis, which isn't validated on the way in
+    focus_areas: List[Any]
+
+
+class AnswerFeedback(ResponseModel):
+    score: Score
+    star_analysis: Dict[str, str]
+    strengths: List[str]
+    improvements: List[str]
+    suggestion: str
+    example_reframe: str
+
+
+class EvaluatedAnswer(ResponseModel):
+    question: str
+    answer: str
+    feedback: AnswerFeedback
+
+
+class InterviewSummary(ResponseModel):
+    overall_score: Score
+    performance_level: str
+    strengths: List[str]
+    improvements: List[str]
+    recommendations: List[str]
+    next_steps: List[str]
+
+
+class SessionEvaluationResponse(BaseModel):
+    evaluations: List[EvaluatedAnswer]
+    summary: InterviewSummary
+
+
+class RewriteImprovements(ResponseModel):
+    before_issues: List[str] = []
+    after_strengths: List[str] = []
+
+
+class StarBreakdown(ResponseModel):
+    situation: str = ""
+    task: str = ""
+    action: str = ""
+    result: str = ""
+
+
+class StarRewrite(ResponseModel):
+    original: str
+    rewritten: str
+    improvements: RewriteImprovements
+    star_breakdown: StarBreakdown
+    keywords_added: List[str]
+    impact_score_improvement: Score
+
+
+class InterviewKickoff(BaseModel):
+    questions: List[InterviewQuestion]
+    focus_areas: List[MissingKeyword]
+
+
+class StartInterviewResponse(BaseModel):
+    session_id: str
+    resume_id: Optional[str] = None
+    resume_text: str
+    filename: Optional[str] = None
+    analysis: AnalysisResult
+    interview: InterviewKickoff
+
+
+class SessionView(BaseModel):
+    """Stored interview session as returned to clients; the raw resume stays server-side"""
+    session_id: str
+    resume_id: Optional[str] = None
+    analysis: Optional[Dict[str, Any]] = None
+    questions: List[Any] = []
+    answers: List[Dict[str, Any]] = []
+    summary: Optional[Dict[str, Any]] = None
+    created_at: Optional[float] = None
+    updated_at: Optional[float] = None
@@ -0,0 +1,172 @@
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+# Canonical section name -> headings that introduce it (lowercase, without trailing colon)
+SECTION_HEADINGS: Dict[str, List[str]] = {
+    "summary": [
+        "summary", "professional summary", "career summary", "executive summary", "profile",
+        "professional profile", "objective", "career objective", "about", "about me", "overview",
+    ],
+    "experience": [
+        "experience", "work experience", "professional experience", "relevant experience",
+        "employment", "employment history", "work history", "career history", "internships",
+        "internship experience",
+    ],
+    "skills": [
+        "skills", "technical skills", "key skills", "core skills", "core competencies",
+        "competencies", "technologies", "tech stack", "tools", "skills and tools",
+        "skills & tools", "technical proficiencies", "areas of expertise",
+    ],
+    "education": [
+        "education", "academic background", "academics", "education and training",
+        "education & training", "qualifications", "academic qualifications",
+    ],
+    "projects": ["projects", "personal projects", "key projects", "selected projects", "academic projects"],
+    "certifications": [
+        "certifications", "certificates", "licenses", "licenses and certifications",
+        "licenses & certifications", "courses", "training",
+    ],
+    "achievements": ["achievements", "awards", "honors", "honours", "awards and achievements", "accomplishments"],
+}
+
+# Order sections are rendered in when building prompts
+SECTION_ORDER = ["summary", "skills", "experience", "projects", "education", "certifications", "achievements"]
+
+_HEADING_LOOKUP = {heading: name for name, headings in SECTION_HEADINGS.items() for heading in headings}
+_CONTACT_PATTERN = re.compile(r"@|https?://|www\.|linkedin|github\.com|\d{3}[\s.-]?\d{3,4}", re.IGNORECASE)
+_BULLET_PATTERN = re.compile(r"^\s*(?:[•●▪■◦‣∙·*\-–—]|\d{1,2}[.)])\s+")
+# Longest heading is a few words; anything longer is body text
+_MAX_HEADING_LENGTH = 40
+
+
+@dataclass
+class ResumeSection:
+    name: str
+    heading: str
+    lines: List[str] = field(default_factory=list)
+    bullets: List[str] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+
+@dataclass
+class SegmentedResume:
+    """
+    Resume text split into canonical sections
+    preamble holds whatever comes before the first heading (usually name and contact details)
+    """
+    preamble: str = ""
+    sections: Dict[str, ResumeSection] = field(default_factory=dict)
+
+    def get(self, name: str) -> Optional[ResumeSection]:
+        return self.sections.get(name)
+
+    @property
+    def is_structured(self) -> bool:
+        return bool(self.sections)
+
+    @property
+    def headline(self) -> str:
+        """Preamble without contact details (name and job title, typically)"""
+        return "\n".join(
+            line for line in self.preamble.splitlines() if not _CONTACT_PATTERN.search(line)
+        )
+
+    def render(
+        self,
+        names: Optional[Iterable[str]] = None,
+        max_chars: Optional[int] = None,
+        include_headline: bool = False
+    ) -> str:
+        """
+        Selected sections as "HEADING:\\ntext" blocks, in SECTION_ORDER unless names is given
+        Text is cut at max_chars, on a line boundary where possible
+        """
+        blocks = [self.headline] if include_headline and self.headline else []
+        for name in names or SECTION_ORDER:
+            section = self.sections.get(name)
+            if section is not None and section.lines:
+                blocks.append(f"{name.upper()}:\n{section.text}")
+        text = "\n\n".join(blocks)
+
+        if max_chars is not None and len(text) > max_chars:
+            cut = text.rfind("\n", 0, max_chars)
+            text = text[:cut if cut > max_chars // 2 else max_chars].rstrip()
+        return text
+
+    def outline(self) -> Dict[str, Dict[str, Any]]:
+        """Per-section heading, bullet count and size, for clients and logs"""
+        return {
+            name: {"heading": section.heading, "bullets": len(section.bullets), "chars": len(section.text)}
+            for name, section in self.sections.items()
+        }
+
+
+def _heading_for(line: str) -> Optional[tuple]:
+    """
+    (section_name, heading, inline_text) if the line starts a section
+    Handles headings on their own line and "Skills: Python, AWS" style inline ones
+    """
+    stripped = line.strip()
+    if not stripped or len(stripped) > 200:
+        return None
+
+    head, _, rest = stripped.partition(":")
+    candidate = re.sub(r"\s+", " ", head.strip(" \t-–—|#*")).lower()
+    if len(candidate) > _MAX_HEADING_LENGTH:
+        return None
+
+    name = _HEADING_LOOKUP.get(candidate)
+    if name is None:
+        return None
+    return name, head.strip(), rest.strip()
+
+
+def _add_line(section: ResumeSection, line: str) -> None:
+    bullet = _BULLET_PATTERN.match(line)
+    if bullet:
+        text = line[bullet.end():].strip()
+        section.bullets.append(text)
+        section.lines.append(f"- {text}")
+    elif section.bullets and line[:1].islower():
+        # Wrapped continuation of the previous bullet
+        section.bullets[-1] = f"{section.bullets[-1]} {line}"
+        section.lines[-1] = f"{section.lines[-1]} {line}"
+    else:
+        section.lines.append(line)
+
+
+@lru_cache(maxsize=256)
+def segment_resume(resume_text: str) -> SegmentedResume:
+    """
+    Split extracted resume text into sections in a single pass over its lines
+    Repeated headings (e.g. a second "Experience" block) are merged into one section
+    """
+    resume = SegmentedResume()
+    preamble = []
+    current: Optional[ResumeSection] = None
+
+    for raw_line in resume_text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+
+        heading = _heading_for(line)
+        if heading is not None:
+            name, title, inline_text = heading
+            current = resume.sections.setdefault(name, ResumeSection(name=name, heading=title))
+            if inline_text:
+                _add_line(current, inline_text)
+            continue
+
+        if current is None:
+            preamble.append(line)
+        else:
+            _add_line(current, line)
+
+    resume.preamble = "\n".join(preamble)
+    return resume
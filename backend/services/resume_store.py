@@ -0,0 +1,114 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+from services.cache import LRUCache, SQLiteCache, TieredCache
+from services.pdf_parcer import PDFExtractor
+from services.resume_segmenter import segment_resume
+
+
+def resume_id_for(content: bytes) -> str:
+    """Content hash of an uploaded PDF, used as its resume_id"""
+    return hashlib.sha256(content).hexdigest()
+
+
+class ResumeStore:
+    """
+    Parsed resumes keyed by the SHA-256 of the uploaded PDF
+    Re-uploading the same file skips parsing, and later requests can send
+    resume_id instead of the full resume text
+    """
+
+    def __init__(
+        self,
+        extractor: PDFExtractor,
+        max_entries: int = 256,
+        ttl: Optional[float] = None,
+        path: Optional[str] = None
+    ):
+        self.extractor = extractor
+        disk = SQLiteCache(path, ttl=ttl, table="parsed_resumes") if path else None
+        self.store = TieredCache(LRUCache(max_entries=max_entries, ttl=ttl), disk)
+        # Parses in progress, so identical concurrent uploads share one parse
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.parses = 0
+        self.reuses = 0
+
+    @classmethod
+    def from_env(cls, extractor: PDFExtractor) -> "ResumeStore":
+        ttl = float(os.getenv("RESUME_CACHE_TTL", "0"))
+        return cls(
+            extractor,
+            max_entries=int(os.getenv("RESUME_CACHE_MAX_ENTRIES", "256")),
+            ttl=ttl if ttl > 0 else None,
+            path=os.getenv("RESUME_CACHE_PATH") or None,
+        )
+
+    async def get(self, resume_id: str) -> Optional[Dict[str, Any]]:
+        value = await self.store.get(resume_id)
+        return json.loads(value) if value is not None else None
+
+    async def parse(self, content: bytes, filename: Optional[str] = None) -> Tuple[Dict[str, Any], bool]:
+        """
+        Parsed resume for PDF bytes, extracting only if this content hasn't been seen
+        Returns (record, cached)
+        """
+        resume_id = resume_id_for(content)
+
+        record = await self.get(resume_id)
+        if record is not None:
+            self.reuses += 1
+            return record, True
+
+        pending = self._inflight.get(resume_id)
+        if pending is not None:
+            self.reuses += 1
+            return await asyncio.shield(pending), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[resume_id] = future
+        try:
+            extraction = await self.extractor.extract(content)
+            record = {
+                "resume_id": resume_id,
+                "filename": filename,
+                "resume_text": extraction.text,
+                "page_count": extraction.page_count,
+                "sections": segment_resume(extraction.text).outline(),
+                "page_timings_ms": [round(seconds * 1000, 2) for seconds in extraction.page_timings],
+                "parsed_at": time.time(),
+            }
+            await self.store.set(resume_id, json.dumps(record, ensure_ascii=False))
+            self.parses += 1
+            future.set_result(record)
+            return record, False
+        except BaseException as e:
+            future.set_exception(e)
+            # Waiters re-raise it; mark it retrieved in case there are none
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(resume_id, None)
+
+    async def resolve_text(self, resume_text: Optional[str], resume_id: Optional[str]) -> Optional[str]:
+        """
+        Resume text from a request that sends either the text itself or a resume_id
+        Raises KeyError for an unknown resume_id
+        """
+        if resume_text:
+            return resume_text
+        if not resume_id:
+            return None
+
+        record = await self.get(resume_id)
+        if record is None:
+            raise KeyError(resume_id)
+        return record["resume_text"]
+
+    def close(self) -> None:
+        self.store.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"parses": self.parses, "reuses": self.reuses, **self.store.stats()}
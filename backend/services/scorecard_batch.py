@@ -0,0 +1,240 @@
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+import asyncio
+import csv
+import io
+import os
+import re
+import time
+import zipfile
+from pypdf import PdfWriter
+from services.pdf_generator import PDFScorecard
+from services.scorecard_renderer import STREAM_CHUNK_SIZE, ScorecardRenderer
+
+T = TypeVar("T")
+
+# Largest batch accepted; zip exports stream, so only the request body grows with it
+MAX_BATCH_CANDIDATES = int(os.getenv("SCORECARD_BATCH_MAX_CANDIDATES", "500"))
+# A combined PDF is merged in one worker, whose memory grows with the page count
+MAX_COMBINED_PDF_CANDIDATES = int(os.getenv("SCORECARD_BATCH_MAX_PDF_CANDIDATES", "100"))
+
+# Seconds allowed for merging a combined PDF, per candidate
+MERGE_SECONDS_PER_CANDIDATE = 0.5
+
+
+@dataclass
+class BatchCandidate:
+    candidate_name: str
+    analysis: Dict[str, Any]
+    interview_summary: Optional[Dict[str, Any]] = None
+
+
+def _number(value: Any) -> float:
+    return float(value) if isinstance(value, (int, float)) else 0.0
+
+
+def rank_candidates(candidates: List[BatchCandidate]) -> List[Tuple[int, BatchCandidate]]:
+    """(rank, candidate) ordered by resume match score, then interview score; ties keep input order"""
+    ordered = sorted(
+        candidates,
+        key=lambda c: (-_number(c.analysis.get("match_score")),
+                       -_number((c.interview_summary or {}).get("overall_score")))
+    )
+    return list(enumerate(ordered, 1))
+
+
+def ranking_rows(ranked: List[Tuple[int, BatchCandidate]]) -> List[Dict[str, Any]]:
+    rows = []
+    for rank, candidate in ranked:
+        summary = candidate.interview_summary or {}
+        rows.append({
+            "rank": rank,
+            "candidate_name": candidate.candidate_name,
+            "match_score": candidate.analysis.get("match_score", 0),
+            "interview_score": summary.get("overall_score"),
+            "performance_level": summary.get("performance_level"),
+            "top_gaps": [
+                keyword.get("keyword", "") for keyword in candidate.analysis.get("missing_keywords", [])[:3]
+                if isinstance(keyword, dict)
+            ],
+        })
+    return rows
+
+
+def report_filename(rank: int, candidate_name: str) -> str:
+    safe_name = re.sub(r"[^A-Za-z0-9._-]+", "_", candidate_name).strip("_") or "Candidate"
+    return f"{rank:03d}_HireSense_Scorecard_{safe_name}.pdf"
+
+
+# Worker-process entry points: documents go to disk, only paths come back
+
+def _render_scorecard_file(path: str, candidate: BatchCandidate) -> str:
+    pdf_bytes = PDFScorecard().generate_full_scorecard(
+        analysis=candidate.analysis,
+        interview_summary=candidate.interview_summary,
+        candidate_name=candidate.candidate_name
+    )
+    with open(path, "wb") as file:
+        file.write(pdf_bytes)
+    return path
+
+
+def _render_ranking_file(path: str, rows: List[Dict[str, Any]]) -> str:
+    with open(path, "wb") as file:
+        file.write(PDFScorecard().generate_ranking_summary(rows))
+    return path
+
+
+def _merge_pdf_files(parts: List[Tuple[str, str]], output_path: str) -> int:
+    """Concatenate (bookmark title, path) parts into output_path, returning its size"""
+    writer = PdfWriter()
+    for title, path in parts:
+        writer.append(path, outline_item=title)
+    with open(output_path, "wb") as file:
+        writer.write(file)
+    writer.close()
+    return os.path.getsize(output_path)
+
+
+async def as_completed_bounded(jobs: Iterable[Callable[[], Awaitable[T]]], window: int) -> AsyncIterator[T]:
+    """
+    Run at most window jobs at a time, yielding results as they finish
+    Jobs are only started as earlier ones complete, so results held in memory stay bounded
+    """
+    jobs = iter(jobs)
+    pending = set()
+    try:
+        while True:
+            for job in jobs:
+                pending.add(asyncio.ensure_future(job()))
+                if len(pending) >= window:
+                    break
+            if not pending:
+                return
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def build_combined_pdf(
+    renderer: ScorecardRenderer,
+    candidates: List[BatchCandidate],
+    directory: str
+) -> str:
+    """
+    Render every scorecard in parallel and merge them behind a ranking cover page
+    Parts are written to directory by the workers; returns the path of the combined PDF
+    """
+    ranked = rank_candidates(candidates)
+    cover = os.path.join(directory, "000_ranking.pdf")
+    paths = {rank: os.path.join(directory, report_filename(rank, c.candidate_name)) for rank, c in ranked}
+
+    jobs = [lambda: renderer.run(_render_ranking_file, cover, ranking_rows(ranked), wait=True)]
+    jobs.extend(
+        (lambda rank=rank, candidate=candidate:
+            renderer.run(_render_scorecard_file, paths[rank], candidate, wait=True))
+        for rank, candidate in ranked
+    )
+    async for _ in as_completed_bounded(jobs, renderer.workers):
+        pass
+
+    output_path = os.path.join(directory, "HireSense_Scorecards.pdf")
+    parts = [("Candidate Ranking", cover)] + [
+        (f"{rank}. {candidate.candidate_name}", paths[rank]) for rank, candidate in ranked
+    ]
+    await renderer.run(
+        _merge_pdf_files, parts, output_path,
+        wait=True, timeout=renderer.timeout + MERGE_SECONDS_PER_CANDIDATE * len(candidates)
+    )
+    return output_path
+
+
+async def stream_file(path: str) -> AsyncIterator[bytes]:
+    """Read a file in chunks for a StreamingResponse; disk reads run in a worker thread"""
+    file = await asyncio.to_thread(open, path, "rb")
+    try:
+        while chunk := await asyncio.to_thread(file.read, STREAM_CHUNK_SIZE):
+            yield chunk
+    finally:
+        await asyncio.to_thread(file.close)
+
+
+class _ZipSink:
+    """Write-only, unseekable target for ZipFile; the written pieces are handed out by drain()"""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._parts.append(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> List[bytes]:
+        parts, self._parts = self._parts, []
+        return parts
+
+
+def _ranking_csv(rows: List[Dict[str, Any]]) -> bytes:
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(["rank", "candidate", "match_score", "interview_score", "performance_level", "top_gaps", "file"])
+    for row in rows:
+        writer.writerow([
+            row["rank"], row["candidate_name"], row["match_score"],
+            "" if row["interview_score"] is None else row["interview_score"],
+            row["performance_level"] or "", "; ".join(row["top_gaps"]),
+            report_filename(row["rank"], row["candidate_name"]),
+        ])
+    return output.getvalue().encode("utf-8")
+
+
+async def stream_zip(renderer: ScorecardRenderer, candidates: List[BatchCandidate]) -> AsyncIterator[bytes]:
+    """
+    Zip of every scorecard plus ranking.csv, streamed as reports finish rendering
+    At most renderer.workers reports are held in memory at once; entries are stored
+    uncompressed (PDF streams are already compressed) with data descriptors, so nothing seeks
+    """
+    ranked = rank_candidates(candidates)
+    sink = _ZipSink()
+    timestamp = time.localtime()[:6]
+    failures = []
+
+    async def render(rank: int, candidate: BatchCandidate) -> Tuple[int, BatchCandidate, Optional[bytes]]:
+        try:
+            return rank, candidate, await renderer.render(
+                candidate.analysis, candidate.interview_summary, candidate.candidate_name, wait=True
+            )
+        except Exception as e:
+            print(f"❌ Batch scorecard for {candidate.candidate_name} failed: {type(e).__name__}: {e}")
+            return rank, candidate, None
+
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+        archive.writestr(zipfile.ZipInfo("ranking.csv", timestamp), _ranking_csv(ranking_rows(ranked)))
+        for part in sink.drain():
+            yield part
+
+        jobs = [(lambda rank=rank, candidate=candidate: render(rank, candidate)) for rank, candidate in ranked]
+        async for rank, candidate, pdf_bytes in as_completed_bounded(jobs, renderer.workers):
+            if pdf_bytes is None:
+                failures.append(f"{rank}. {candidate.candidate_name}")
+                continue
+            archive.writestr(zipfile.ZipInfo(report_filename(rank, candidate.candidate_name), timestamp), pdf_bytes)
+            for part in sink.drain():
+                yield part
+
+        if failures:
+            archive.writestr(
+                zipfile.ZipInfo("errors.txt", timestamp),
+                ("Scorecards that could not be rendered:\n" + "\n".join(failures) + "\n").encode("utf-8")
+            )
+
+    # Closing the archive wrote the central directory
+    for part in sink.drain():
+        yield part
@@ -0,0 +1,138 @@
+import asyncio
+import hashlib
+import json
+import os
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, Optional
+from services.cache import FileCache, LRUCache
+from services.single_flight import SingleFlight
+
+# Part of every fingerprint; bump it when the scorecard layout in pdf_generator changes
+# so PDFs rendered by older code (e.g. in the disk tier) stop matching
+SCORECARD_LAYOUT_VERSION = 1
+
+
+def scorecard_fingerprint(
+    analysis: Dict[str, Any],
+    interview_summary: Optional[Dict[str, Any]],
+    candidate_name: str,
+    generated_on: date
+) -> str:
+    """
+    Content hash of everything a rendered scorecard depends on
+    Key order and whitespace in the payload don't matter; the report date does
+    """
+    payload = json.dumps(
+        {
+            "layout": SCORECARD_LAYOUT_VERSION,
+            "analysis": analysis,
+            "interview_summary": interview_summary,
+            "candidate_name": candidate_name,
+            "generated_on": generated_on.isoformat(),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def etag_for(fingerprint: str) -> str:
+    return f'"{fingerprint}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header names etag (weak validators compare equal)"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class ScorecardCache:
+    """
+    Rendered scorecard PDFs keyed by scorecard_fingerprint
+    Memory holds the hottest reports up to max_bytes; with a directory set, a larger
+    on-disk tier survives restarts. Concurrent misses for one fingerprint share a render.
+    Disk reads and writes run in a worker thread, off the event loop.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        directory: Optional[str] = None,
+        max_disk_bytes: int = 512 * 1024 * 1024
+    ):
+        self.enabled = enabled
+        self.memory = LRUCache(max_entries=max_entries, max_bytes=max_bytes) if enabled else None
+        self.disk = FileCache(directory, max_bytes=max_disk_bytes, suffix=".pdf") if enabled and directory else None
+        self.single_flight = SingleFlight()
+        self.renders = 0
+        self.not_modified_responses = 0
+
+    @classmethod
+    def from_env(cls) -> "ScorecardCache":
+        megabyte = 1024 * 1024
+        return cls(
+            enabled=os.getenv("SCORECARD_CACHE_ENABLED", "true").lower() not in ("0", "false", "no"),
+            max_entries=int(os.getenv("SCORECARD_CACHE_MAX_ENTRIES", "256")),
+            max_bytes=int(float(os.getenv("SCORECARD_CACHE_MEMORY_MB", "64")) * megabyte),
+            directory=os.getenv("SCORECARD_CACHE_DIR") or None,
+            max_disk_bytes=int(float(os.getenv("SCORECARD_CACHE_DISK_MB", "512")) * megabyte),
+        )
+
+    def not_modified(self, if_none_match: Optional[str], fingerprint: str) -> bool:
+        """True when the client already holds this exact report"""
+        if etag_matches(if_none_match, etag_for(fingerprint)):
+            self.not_modified_responses += 1
+            return True
+        return False
+
+    async def get(self, fingerprint: str) -> Optional[bytes]:
+        """Cached PDF bytes, None if this fingerprint isn't cached; disk hits are promoted"""
+        if self.memory is None:
+            return None
+        pdf_bytes = self.memory.get(fingerprint)
+        if pdf_bytes is None and self.disk is not None:
+            pdf_bytes = await asyncio.to_thread(self.disk.get, fingerprint)
+            if pdf_bytes is not None:
+                self.memory.set(fingerprint, pdf_bytes)
+        return pdf_bytes
+
+    async def set(self, fingerprint: str, pdf_bytes: bytes) -> None:
+        if self.memory is None:
+            return
+        self.memory.set(fingerprint, pdf_bytes)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, fingerprint, pdf_bytes)
+
+    async def get_or_render(self, fingerprint: str, render: Callable[[], Awaitable[bytes]]) -> bytes:
+        """Cached PDF bytes for fingerprint, calling render() once on a miss"""
+        pdf_bytes = await self.get(fingerprint)
+        if pdf_bytes is not None:
+            return pdf_bytes
+
+        async def render_and_store() -> bytes:
+            pdf_bytes = await render()
+            self.renders += 1
+            await self.set(fingerprint, pdf_bytes)
+            return pdf_bytes
+
+        return await self.single_flight.do(fingerprint, render_and_store)
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "renders": self.renders,
+            "not_modified": self.not_modified_responses,
+            "coalesced": self.single_flight.coalesced,
+            "memory": self.memory.stats() if self.memory is not None else None,
+            "disk": self.disk.stats() if self.disk is not None else None,
+        }
@@ -0,0 +1,157 @@
+from datetime import date
+from typing import Any, AsyncIterator, Callable, Dict, Optional, TypeVar
+import asyncio
+import os
+import time
+from services.pdf_generator import PDFScorecard
+from services.process_pool import RestartablePool
+
+T = TypeVar("T")
+
+# Size of the slices a rendered PDF is sent in (memoryview slices, so nothing is copied)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class RendererBusy(Exception):
+    """Every render slot stayed taken for the whole queue timeout"""
+
+    def __init__(self, retry_after: float):
+        super().__init__("Scorecard renderer is busy, try again shortly")
+        self.retry_after = retry_after
+
+
+def _lower_priority(niceness: int) -> None:
+    """Worker initializer: render at lower CPU priority than the API process"""
+    if niceness and hasattr(os, "nice"):
+        os.nice(niceness)
+
+
+def _render_scorecard(
+    analysis: Dict[str, Any],
+    interview_summary: Optional[Dict[str, Any]],
+    candidate_name: str,
+    generated_on: Optional[date] = None
+) -> bytes:
+    """Worker-process entry point"""
+    return PDFScorecard().generate_full_scorecard(
+        analysis=analysis,
+        interview_summary=interview_summary,
+        candidate_name=candidate_name,
+        generated_on=generated_on
+    )
+
+
+async def iter_chunks(data: bytes, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[memoryview]:
+    """
+    Zero-copy slices of data for a StreamingResponse
+    Async so Starlette doesn't hop to its threadpool for every chunk
+    """
+    view = memoryview(data)
+    for start in range(0, len(view), chunk_size):
+        yield view[start:start + chunk_size]
+
+
+class ScorecardRenderer:
+    """
+    Renders PDF scorecards in a small dedicated process pool
+    ReportLab layout is CPU-bound, so it runs off the event loop and apart from the
+    PDF extraction pool; at most max_pending renders are queued or running, and
+    callers that can't get a slot within queue_timeout are turned away
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        timeout: float = 30.0,
+        max_pending: int = 16,
+        queue_timeout: float = 5.0,
+        niceness: int = 5
+    ):
+        # Leave most cores to interactive traffic by default
+        self.workers = workers or max(1, (os.cpu_count() or 2) // 2)
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+        self.niceness = niceness
+        self._slots = asyncio.Semaphore(max_pending)
+        self.pool = RestartablePool(self.workers, initializer=_lower_priority, initargs=(niceness,))
+        self.pending = 0
+        self.rendered = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.render_seconds = 0.0
+
+    @classmethod
+    def from_env(cls) -> "ScorecardRenderer":
+        return cls(
+            workers=int(os.getenv("SCORECARD_RENDER_WORKERS", "0")) or None,
+            timeout=float(os.getenv("SCORECARD_RENDER_TIMEOUT", "30")),
+            max_pending=int(os.getenv("SCORECARD_RENDER_MAX_PENDING", "16")),
+            queue_timeout=float(os.getenv("SCORECARD_RENDER_QUEUE_TIMEOUT", "5")),
+            niceness=int(os.getenv("SCORECARD_RENDER_NICENESS", "5")),
+        )
+
+    async def render(
+        self,
+        analysis: Dict[str, Any],
+        interview_summary: Optional[Dict[str, Any]] = None,
+        candidate_name: str = "Candidate",
+        generated_on: Optional[date] = None,
+        wait: bool = False
+    ) -> bytes:
+        """
+        PDF bytes for one scorecard
+        Raises RendererBusy when the queue is full and TimeoutError if rendering takes too long
+        """
+        pdf_bytes = await self.run(
+            _render_scorecard, analysis, interview_summary, candidate_name, generated_on, wait=wait
+        )
+        self.rendered += 1
+        return pdf_bytes
+
+    async def run(
+        self,
+        fn: Callable[..., T],
+        *args: Any,
+        wait: bool = False,
+        timeout: Optional[float] = None
+    ) -> T:
+        """
+        Run fn(*args) in the render pool once a slot is free
+        Interactive callers give up after queue_timeout (RendererBusy); batch
+        exports pass wait=True and queue for as long as it takes
+        """
+        try:
+            await asyncio.wait_for(self._slots.acquire(), None if wait else self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise RendererBusy(retry_after=self.queue_timeout)
+
+        self.pending += 1
+        started = time.perf_counter()
+        try:
+            return await self.pool.run(fn, *args, timeout=timeout or self.timeout)
+        except asyncio.TimeoutError:
+            # The pool has retired the stuck worker; it is replaced once the other
+            # renders in it (e.g. a batch export in progress) have finished
+            self.timeouts += 1
+            raise TimeoutError(f"Scorecard rendering timed out after {timeout or self.timeout:.0f}s")
+        finally:
+            self.pending -= 1
+            self._slots.release()
+            self.render_seconds += time.perf_counter() - started
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "rendered": self.rendered,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "render_seconds": round(self.render_seconds, 3),
+            "pool_restarts": self.pool.restarts,
+        }
+
+    def close(self) -> None:
+        self.pool.close()
@@ -0,0 +1,372 @@
+import asyncio
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zipfile
+from typing import Any, Dict, List, Optional, Tuple
+from services.ai_analyzer import AIAnalyzer
+from services.llm_scheduler import Priority, llm_priority
+from services.pdf_parcer import PDFExtractor
+from services.prescorer import KeywordScorer
+
+
+def expand_uploads(uploads: List[Tuple[str, bytes]]) -> List[Tuple[str, bytes]]:
+    """
+    Flatten uploaded files into (filename, pdf_bytes) pairs
+    Zip archives are unpacked and only their PDF members kept
+    """
+    documents = []
+    for filename, content in uploads:
+        if filename.lower().endswith(".zip"):
+            with zipfile.ZipFile(io.BytesIO(content)) as archive:
+                for member in archive.infolist():
+                    name = os.path.basename(member.filename)
+                    if not member.is_dir() and name.lower().endswith(".pdf") and not name.startswith("."):
+                        documents.append((name, archive.read(member)))
+        else:
+            documents.append((filename, content))
+    return documents
+
+
+class ScreeningJobStore:
+    """
+    SQLite persistence for bulk screening jobs
+    Raw PDFs are kept until parsed so an interrupted job can be resumed
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS screening_jobs (
+                id TEXT PRIMARY KEY,
+                job_description TEXT NOT NULL,
+                min_prescore REAL,
+                status TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS screening_candidates (
+                job_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                filename TEXT NOT NULL,
+                status TEXT NOT NULL,
+                pdf BLOB,
+                resume_text TEXT,
+                prescore REAL,
+                match_score REAL,
+                analysis TEXT,
+                error TEXT,
+                PRIMARY KEY (job_id, idx)
+            );
+            """
+        )
+        self._conn.commit()
+
+    def create_job(
+        self,
+        job_description: str,
+        documents: List[Tuple[str, bytes]],
+        min_prescore: Optional[float] = None
+    ) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO screening_jobs (id, job_description, min_prescore, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, 'pending', ?, ?)",
+                (job_id, job_description, min_prescore, now, now),
+            )
+            self._conn.executemany(
+                "INSERT INTO screening_candidates (job_id, idx, filename, status, pdf) "
+                "VALUES (?, ?, ?, 'pending', ?)",
+                [(job_id, idx, filename, content) for idx, (filename, content) in enumerate(documents)],
+            )
+            self._conn.commit()
+        return job_id
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._conn.execute(
+                "SELECT id, job_description, min_prescore, status, created_at, updated_at "
+                "FROM screening_jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+            if job is None:
+                return None
+            counts = self._conn.execute(
+                "SELECT status, COUNT(*) FROM screening_candidates WHERE job_id = ? GROUP BY status",
+                (job_id,),
+            ).fetchall()
+        progress = {status: count for status, count in counts}
+        return {**dict(job), "total": sum(progress.values()), "progress": progress}
+
+    def set_job_status(self, job_id: str, status: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE screening_jobs SET status = ?, updated_at = ? WHERE id = ?",
+                (status, time.time(), job_id),
+            )
+            self._conn.commit()
+
+    def candidates(
+        self,
+        job_id: str,
+        statuses: Tuple[str, ...],
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        placeholders = ", ".join("?" for _ in statuses)
+        query = (
+            f"SELECT idx, filename, pdf, resume_text FROM screening_candidates "
+            f"WHERE job_id = ? AND status IN ({placeholders}) ORDER BY idx"
+        )
+        params: Tuple[Any, ...] = (job_id, *statuses)
+        if limit:
+            query += " LIMIT ?"
+            params += (limit,)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def mark_parsed(self, job_id: str, idx: int, resume_text: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE screening_candidates SET status = 'parsed', resume_text = ?, pdf = NULL "
+                "WHERE job_id = ? AND idx = ?",
+                (resume_text, job_id, idx),
+            )
+            self._conn.commit()
+
+    def mark_prescored(self, job_id: str, idx: int, prescore: float, filtered: bool) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE screening_candidates SET prescore = ?, status = ? WHERE job_id = ? AND idx = ?",
+                (prescore, "filtered" if filtered else "parsed", job_id, idx),
+            )
+            self._conn.commit()
+
+    def mark_scored(self, job_id: str, idx: int, analysis: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE screening_candidates SET status = 'scored', match_score = ?, analysis = ? "
+                "WHERE job_id = ? AND idx = ?",
+                (analysis.get("match_score", 0), json.dumps(analysis), job_id, idx),
+            )
+            self._conn.commit()
+
+    def mark_retryable(self, job_id: str, idx: int, error: str) -> None:
+        """Leave a parsed candidate unscored; resuming the job scores it again"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE screening_candidates SET status = 'retryable', match_score = NULL, analysis = NULL, "
+                "error = ? WHERE job_id = ? AND idx = ?",
+                (error, job_id, idx),
+            )
+            self._conn.commit()
+
+    def mark_failed(self, job_id: str, idx: int, error: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE screening_candidates SET status = 'failed', error = ?, pdf = NULL "
+                "WHERE job_id = ? AND idx = ?",
+                (error, job_id, idx),
+            )
+            self._conn.commit()
+
+    def ranked_results(self, job_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        query = (
+            "SELECT idx, filename, status, prescore, match_score, analysis, error FROM screening_candidates "
+            "WHERE job_id = ? ORDER BY match_score IS NULL, match_score DESC, prescore DESC, idx"
+        )
+        params: Tuple[Any, ...] = (job_id,)
+        if limit:
+            query += " LIMIT ?"
+            params += (limit,)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        results = []
+        for rank, row in enumerate(rows, 1):
+            result = dict(row)
+            result["rank"] = rank if result["match_score"] is not None else None
+            result["analysis"] = json.loads(result["analysis"]) if result["analysis"] else None
+            results.append(result)
+        return results
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class BulkScreener:
+    """
+    Runs screening jobs in the background
+    PDFs are parsed in the shared extractor's process pool, parse_batch_size at a
+    time, and scored with a bounded number of LLM calls. SQLite and zip work runs
+    in worker threads so the event loop keeps serving requests.
+    """
+
+    def __init__(
+        self,
+        analyzer: AIAnalyzer,
+        store: ScreeningJobStore,
+        pdf_extractor: PDFExtractor,
+        llm_concurrency: int = 8,
+        parse_batch_size: int = 32
+    ):
+        self.analyzer = analyzer
+        self.store = store
+        self.pdf_extractor = pdf_extractor
+        self.llm_concurrency = llm_concurrency
+        self.parse_batch_size = parse_batch_size
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    @classmethod
+    def from_env(cls, analyzer: AIAnalyzer, pdf_extractor: PDFExtractor) -> "BulkScreener":
+        return cls(
+            analyzer,
+            ScreeningJobStore(os.getenv("SCREENING_DB_PATH", "screening.db")),
+            pdf_extractor,
+            llm_concurrency=int(os.getenv("SCREENING_LLM_CONCURRENCY", "8")),
+            parse_batch_size=int(os.getenv("SCREENING_PARSE_BATCH_SIZE", "32")),
+        )
+
+    async def submit(
+        self,
+        job_description: str,
+        uploads: List[Tuple[str, bytes]],
+        min_prescore: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Persist a new job and start processing it in the background
+        Candidates whose local keyword score is below min_prescore skip the LLM
+        """
+        documents = await asyncio.to_thread(expand_uploads, uploads)
+        if not documents:
+            raise ValueError("No PDF files found in upload")
+
+        job_id = await asyncio.to_thread(self.store.create_job, job_description, documents, min_prescore)
+        self.start(job_id)
+        return await asyncio.to_thread(self.store.get_job, job_id)
+
+    def start(self, job_id: str) -> bool:
+        """Start (or resume) a job, returns False if it is already running"""
+        task = self._tasks.get(job_id)
+        if task is not None and not task.done():
+            return False
+
+        # The task copies this context, so its LLM calls queue behind interactive requests
+        with llm_priority(Priority.BULK):
+            task = asyncio.create_task(self._run(job_id))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._forget(job_id, task))
+        return True
+
+    def _forget(self, job_id: str, task: asyncio.Task) -> None:
+        # A resumed job may already have replaced this task
+        if self._tasks.get(job_id) is task:
+            del self._tasks[job_id]
+
+    async def _run(self, job_id: str) -> None:
+        job = await asyncio.to_thread(self.store.get_job, job_id)
+        await asyncio.to_thread(self.store.set_job_status, job_id, "running")
+        print(f"📋 Screening job {job_id}: {job['total']} resumes")
+
+        try:
+            await self._parse_pending(job_id)
+            await self._score_parsed(job_id, job["job_description"], job["min_prescore"])
+            await asyncio.to_thread(self.store.set_job_status, job_id, "completed")
+            print(f"✅ Screening job {job_id} completed")
+        except asyncio.CancelledError:
+            # Leave the job as 'running' so it can be resumed later
+            raise
+        except Exception as e:
+            print(f"❌ Screening job {job_id} failed: {type(e).__name__}: {e}")
+            await asyncio.to_thread(self.store.set_job_status, job_id, "failed")
+
+    async def _parse_pending(self, job_id: str) -> None:
+        async def parse(candidate: Dict[str, Any]) -> None:
+            try:
+                extraction = await self.pdf_extractor.extract(candidate["pdf"])
+            except Exception as e:
+                await asyncio.to_thread(
+                    self.store.mark_failed, job_id, candidate["idx"], f"PDF parsing failed: {e}"
+                )
+                return
+            await asyncio.to_thread(self.store.mark_parsed, job_id, candidate["idx"], extraction.text)
+
+        # Only one batch of PDF blobs is held in memory; parsed rows drop out of the next query
+        while True:
+            pending = await asyncio.to_thread(
+                self.store.candidates, job_id, ("pending",), self.parse_batch_size
+            )
+            if not pending:
+                break
+            await asyncio.gather(*(parse(candidate) for candidate in pending))
+
+    async def _score_parsed(
+        self,
+        job_id: str,
+        job_description: str,
+        min_prescore: Optional[float] = None
+    ) -> None:
+        semaphore = asyncio.Semaphore(self.llm_concurrency)
+        scorer = KeywordScorer(job_description)
+
+        # Local pre-score: drop clear mismatches and send the strongest candidates to the LLM first
+        parsed = []
+        for candidate in await asyncio.to_thread(self.store.candidates, job_id, ("parsed", "retryable")):
+            candidate["prescore"] = scorer.score(candidate["resume_text"])["match_score"]
+            filtered = min_prescore is not None and candidate["prescore"] < min_prescore
+            await asyncio.to_thread(
+                self.store.mark_prescored, job_id, candidate["idx"], candidate["prescore"], filtered
+            )
+            if not filtered:
+                parsed.append(candidate)
+        parsed.sort(key=lambda candidate: candidate["prescore"], reverse=True)
+
+        async def score(candidate: Dict[str, Any]) -> None:
+            async with semaphore:
+                try:
+                    # The local keyword analysis isn't comparable with LLM scores, so it never gets ranked
+                    analysis = await self.analyzer.analyze_resume(
+                        resume_text=candidate["resume_text"],
+                        job_description=job_description,
+                        fallback=False
+                    )
+                except Exception as e:
+                    await asyncio.to_thread(
+                        self.store.mark_failed, job_id, candidate["idx"], f"Scoring failed: {e}"
+                    )
+                    return
+                if analysis is None:
+                    await asyncio.to_thread(
+                        self.store.mark_retryable, job_id, candidate["idx"], "LLM analysis unavailable or incomplete, resume the job to retry"
+                    )
+                else:
+                    await asyncio.to_thread(self.store.mark_scored, job_id, candidate["idx"], analysis)
+
+        await asyncio.gather(*(score(candidate) for candidate in parsed))
+
+    async def close(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.store.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active_jobs": len(self._tasks),
+            "llm_concurrency": self.llm_concurrency,
+        }
@@ -0,0 +1,96 @@
+import json
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+from services.cache import LRUCache, SQLiteCache, TieredCache
+
+
+class SessionStore:
+    """
+    Server-side interview sessions: resume, job description, analysis, questions and answers
+    Clients pass a session_id instead of re-sending all of it on every call
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: Optional[float] = 24 * 3600,
+        path: Optional[str] = None
+    ):
+        disk = SQLiteCache(path, ttl=ttl, table="interview_sessions") if path else None
+        self.store = TieredCache(LRUCache(max_entries=max_entries, ttl=ttl), disk)
+
+    @classmethod
+    def from_env(cls) -> "SessionStore":
+        ttl = float(os.getenv("SESSION_TTL", str(24 * 3600)))
+        return cls(
+            max_entries=int(os.getenv("SESSION_MAX_ENTRIES", "1024")),
+            ttl=ttl if ttl > 0 else None,
+            path=os.getenv("SESSION_DB_PATH") or None,
+        )
+
+    async def create(
+        self,
+        resume_text: str,
+        job_description: str,
+        analysis: Dict[str, Any],
+        questions: Optional[List[Dict[str, Any]]] = None,
+        resume_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        now = time.time()
+        session = {
+            "session_id": uuid.uuid4().hex,
+            "resume_id": resume_id,
+            "resume_text": resume_text,
+            "job_description": job_description,
+            "analysis": analysis,
+            "questions": questions or [],
+            "answers": [],
+            "created_at": now,
+            "updated_at": now,
+        }
+        await self._save(session)
+        return session
+
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        value = await self.store.get(session_id)
+        return json.loads(value) if value is not None else None
+
+    async def update(self, session_id: str, **fields: Any) -> Optional[Dict[str, Any]]:
+        """Overwrite fields of a session, None if it doesn't exist"""
+        session = await self.get(session_id)
+        if session is None:
+            return None
+
+        session.update(fields)
+        await self._save(session)
+        return session
+
+    async def add_answers(self, session_id: str, answers: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Record evaluated answers, replacing earlier answers to the same question
+        """
+        session = await self.get(session_id)
+        if session is None:
+            return None
+
+        by_question = {answer["question"]: answer for answer in session["answers"]}
+        for answer in answers:
+            by_question[answer["question"]] = answer
+        session["answers"] = list(by_question.values())
+        await self._save(session)
+        return session
+
+    async def delete(self, session_id: str) -> None:
+        await self.store.delete(session_id)
+
+    async def _save(self, session: Dict[str, Any]) -> None:
+        session["updated_at"] = time.time()
+        await self.store.set(session["session_id"], json.dumps(session, ensure_ascii=False))
+
+    def close(self) -> None:
+        self.store.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return self.store.stats()
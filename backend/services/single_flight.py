@@ -0,0 +1,66 @@
+import asyncio
+import contextvars
+import copy
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict
+from services.deadlines import clear_deadline, within_deadline
+from services.llm_scheduler import Priority, current_priority, set_priority
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Task
+    context: contextvars.Context
+    priority: Priority
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one execution
+    Callers that arrive while a call is in flight share its result (or exception)
+    The shared call runs without any one caller's deadline, at the most urgent priority
+    among its callers; each caller stops waiting at its own deadline
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, _Flight] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        priority = current_priority()
+
+        flight = self._inflight.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            if priority < flight.priority:
+                # The task is suspended while we run, so its context can be updated in place
+                flight.context.run(set_priority, priority)
+                flight.priority = priority
+            # Followers get their own copy so no caller can mutate another's result
+            return copy.deepcopy(await within_deadline(asyncio.shield(flight.task)))
+
+        context = contextvars.copy_context()
+        context.run(clear_deadline)
+        # The call runs as its own task so one caller disconnecting doesn't cancel it for the others
+        task = asyncio.get_running_loop().create_task(fn(), context=context)
+        self._inflight[key] = _Flight(task, context, priority)
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return await within_deadline(asyncio.shield(task))
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        flight = self._inflight.get(key)
+        if flight is not None and flight.task is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved in case every caller went away
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "coalescing_rate": round(self.coalesced / self.calls, 4) if self.calls else 0.0,
+            "in_flight": len(self._inflight),
+        }
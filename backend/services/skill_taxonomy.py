@@ -0,0 +1,253 @@
+from collections import Counter, deque
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Canonical skill name -> lowercase aliases that refer to it
+SKILL_TAXONOMY: Dict[str, List[str]] = {
+    # Languages
+    "Python": ["python", "python3"],
+    "JavaScript": ["javascript", "js", "ecmascript", "es6"],
+    "TypeScript": ["typescript", "ts"],
+    "Java": ["java"],
+    "Kotlin": ["kotlin"],
+    "Scala": ["scala"],
+    "Go": ["golang", "go lang"],
+    "Rust": ["rust"],
+    "C": ["c language", "ansi c"],
+    "C++": ["c++", "cpp"],
+    "C#": ["c#", "csharp", "c sharp"],
+    "Ruby": ["ruby"],
+    "PHP": ["php"],
+    "Swift": ["swift"],
+    "R": ["r language", "rstats"],
+    "SQL": ["sql"],
+    "Bash": ["bash", "shell scripting", "shell script", "sh scripting"],
+    "PowerShell": ["powershell"],
+    # Web and frameworks
+    "HTML": ["html", "html5"],
+    "CSS": ["css", "css3", "scss", "sass"],
+    "React": ["react", "reactjs", "react.js"],
+    "Angular": ["angular", "angularjs"],
+    "Vue.js": ["vue", "vuejs", "vue.js"],
+    "Next.js": ["next.js", "nextjs"],
+    "Node.js": ["node.js", "nodejs", "node js"],
+    "Express": ["express.js", "expressjs"],
+    "Django": ["django"],
+    "Flask": ["flask"],
+    "FastAPI": ["fastapi"],
+    "Spring Boot": ["spring boot", "springboot"],
+    ".NET": [".net", "dotnet", "asp.net"],
+    "Ruby on Rails": ["rails", "ruby on rails"],
+    "GraphQL": ["graphql"],
+    "REST APIs": ["rest api", "rest apis", "restful", "restful api", "restful apis"],
+    "gRPC": ["grpc"],
+    # Cloud and infrastructure
+    "AWS": ["aws", "amazon web services"],
+    "AWS Lambda": ["lambda", "aws lambda"],
+    "Amazon EC2": ["ec2"],
+    "Amazon ECS": ["ecs"],
+    "Amazon EKS": ["eks"],
+    "Amazon S3": ["s3"],
+    "Azure": ["azure", "microsoft azure"],
+    "Google Cloud": ["gcp", "google cloud", "google cloud platform"],
+    "Docker": ["docker", "containerization", "containerisation"],
+    "Kubernetes": ["kubernetes", "k8s"],
+    "Helm": ["helm"],
+    "Terraform": ["terraform"],
+    "CloudFormation": ["cloudformation"],
+    "Ansible": ["ansible"],
+    "Linux": ["linux", "unix"],
+    "Nginx": ["nginx"],
+    "Serverless": ["serverless"],
+    "Microservices": ["microservices", "microservice", "micro-services"],
+    "Distributed Systems": ["distributed systems", "distributed system"],
+    # DevOps and delivery
+    "DevOps": ["devops"],
+    "CI/CD": ["ci/cd", "cicd", "ci cd", "continuous integration", "continuous delivery", "continuous deployment"],
+    "Jenkins": ["jenkins"],
+    "GitHub Actions": ["github actions"],
+    "GitLab CI": ["gitlab ci", "gitlab"],
+    "Git": ["git"],
+    "Infrastructure as Code": ["infrastructure as code", "iac"],
+    "Prometheus": ["prometheus"],
+    "Grafana": ["grafana"],
+    "Datadog": ["datadog"],
+    "ELK Stack": ["elk", "elasticsearch", "logstash", "kibana"],
+    "Observability": ["observability", "monitoring"],
+    "Site Reliability Engineering": ["sre", "site reliability"],
+    # Data
+    "PostgreSQL": ["postgresql", "postgres"],
+    "MySQL": ["mysql"],
+    "MongoDB": ["mongodb", "mongo"],
+    "Redis": ["redis"],
+    "Kafka": ["kafka", "apache kafka"],
+    "RabbitMQ": ["rabbitmq"],
+    "Spark": ["spark", "apache spark", "pyspark"],
+    "Airflow": ["airflow"],
+    "Snowflake": ["snowflake"],
+    "Data Engineering": ["data engineering", "etl", "data pipelines", "data pipeline"],
+    "Pandas": ["pandas"],
+    "NumPy": ["numpy"],
+    # AI / ML
+    "Machine Learning": ["machine learning", "ml"],
+    "Deep Learning": ["deep learning"],
+    "TensorFlow": ["tensorflow"],
+    "PyTorch": ["pytorch"],
+    "scikit-learn": ["scikit-learn", "sklearn"],
+    "NLP": ["nlp", "natural language processing"],
+    "Computer Vision": ["computer vision"],
+    "LLMs": ["llm", "llms", "large language models", "large language model"],
+    # Practices and testing
+    "Agile": ["agile", "scrum", "kanban"],
+    "Unit Testing": ["unit testing", "unit tests", "pytest", "jest", "junit"],
+    "Test Automation": ["test automation", "selenium", "cypress", "playwright"],
+    "System Design": ["system design", "systems design"],
+    "Object-Oriented Programming": ["oop", "object-oriented", "object oriented"],
+    "Security": ["security", "owasp", "oauth", "sso"],
+    # Mobile
+    "Android": ["android"],
+    "iOS": ["ios"],
+    "React Native": ["react native"],
+    "Flutter": ["flutter"],
+    # Soft skills
+    "Leadership": ["leadership", "mentoring", "mentored", "team lead"],
+    "Communication": ["communication", "stakeholder management"],
+    "Project Management": ["project management", "jira"],
+}
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def _fold_case(text: str) -> Tuple[str, Sequence[int]]:
+    """
+    Lowercased text plus, for each of its characters, the index it came from
+    Some characters lowercase to several (e.g. "İ"), which would shift every later offset
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered, range(len(text))
+
+    folded = []
+    origins = []
+    for position, char in enumerate(text):
+        char = char.lower()
+        folded.append(char)
+        origins.extend([position] * len(char))
+    return "".join(folded), origins
+
+
+class AhoCorasick:
+    """
+    Multi-pattern matcher that finds every pattern occurrence in one linear pass
+    Matches must sit on word boundaries, so "js" doesn't match inside "json"
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, Any]]):
+        # Trie as parallel lists: goto transitions, failure links, outputs (pattern length, payload)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, Any]]] = [[]]
+
+        for pattern, payload in patterns:
+            self._add(pattern.lower(), payload)
+        self._build_failure_links()
+
+    def _add(self, pattern: str, payload: Any) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state].append((len(pattern), payload))
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def find(self, text: str) -> List[Tuple[int, int, Any]]:
+        """
+        All whole-word matches as (start, end, payload), as offsets into text
+        Text is matched case-insensitively
+        """
+        text, origins = _fold_case(text)
+        matches = []
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+
+            for length, payload in self._out[state]:
+                start = index - length + 1
+                end = index + 1
+                # Only accept boundaries that the pattern itself doesn't already provide
+                if start > 0 and _is_word_char(text[start]) and _is_word_char(text[start - 1]):
+                    continue
+                if end < len(text) and _is_word_char(text[end - 1]) and _is_word_char(text[end]):
+                    continue
+                matches.append((origins[start], origins[end - 1] + 1, payload))
+        return matches
+
+    def contains_any(self, text: str) -> bool:
+        return bool(self.find(text))
+
+    def payloads(self, text: str) -> set:
+        """Distinct payloads of all matches in text"""
+        return {payload for _, _, payload in self.find(text)}
+
+
+class SkillMatcher:
+    """
+    Compiled skill taxonomy: finds canonical skills mentioned in a document
+    """
+
+    def __init__(self, taxonomy: Dict[str, List[str]] = SKILL_TAXONOMY):
+        self.taxonomy = taxonomy
+        self.automaton = AhoCorasick(
+            (alias, skill) for skill, aliases in taxonomy.items() for alias in aliases
+        )
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        Skill mentions as (start, end, canonical_name), overlapping matches resolved
+        in favour of the longest (e.g. "react native" over "react")
+        """
+        matches = sorted(self.automaton.find(text), key=lambda match: (match[0], -(match[1] - match[0])))
+        resolved = []
+        covered_until = 0
+        for start, end, skill in matches:
+            if start >= covered_until:
+                resolved.append((start, end, skill))
+                covered_until = end
+        return resolved
+
+    def count(self, text: str) -> Counter:
+        """Mentions per canonical skill"""
+        return Counter(skill for _, _, skill in self.find(text))
+
+
+_skill_matcher: Optional[SkillMatcher] = None
+
+
+def get_skill_matcher() -> SkillMatcher:
+    """Process-wide compiled skill matcher (built on first use or at app startup)"""
+    global _skill_matcher
+
+    if _skill_matcher is None:
+        _skill_matcher = SkillMatcher()
+    return _skill_matcher
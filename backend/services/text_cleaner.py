@@ -1,7 +1,84 @@
 import re
+from services.skill_taxonomy import AhoCorasick
+
+# Common English and job-posting filler words that never count as skills
+STOPWORDS = {
+    "a", "about", "above", "across", "after", "all", "also", "an", "and", "any", "are", "as", "at",
+    "be", "been", "being", "both", "but", "by", "can", "could", "do", "does", "each", "etc", "for",
+    "from", "has", "have", "how", "if", "in", "into", "is", "it", "its", "may", "more", "most",
+    "must", "not", "of", "on", "or", "other", "our", "out", "over", "per", "plus", "should", "so",
+    "such", "than", "that", "the", "their", "them", "then", "there", "these", "they", "this",
+    "those", "through", "to", "up", "us", "we", "well", "what", "when", "where", "which", "while",
+    "who", "will", "with", "within", "would", "you", "your",
+    "ability", "able", "candidate", "candidates", "company", "experience", "experienced",
+    "good", "great", "including", "join", "knowledge", "looking", "new", "preferred",
+    "required", "requirements", "responsibilities", "role", "skills", "strong", "team", "understanding",
+    "work", "working", "years", "year", "level", "senior", "junior", "using", "based", "like",
+    "need", "needs", "needed", "want", "seeking", "ideal", "ideally",
+}
 
 def clean_job_description(text: str) -> str:
     text = text.lower()
     text = re.sub(r"\s+", " ", text)
     text = re.sub(r"[^a-z0-9., ]", "", text)
     return text.strip()
+
+
+# Job description sections that carry no screening signal (dropped up to the next heading)
+BOILERPLATE_HEADINGS = {
+    "benefits", "perks", "perks and benefits", "benefits and perks", "what we offer", "we offer",
+    "why join us", "why work with us", "about us", "about the company", "who we are", "our culture",
+    "equal opportunity", "equal employment opportunity", "eeo statement", "diversity and inclusion",
+    "compensation", "salary", "how to apply",
+}
+
+# Sentences containing any of these are EEO/benefits boilerplate wherever they appear
+BOILERPLATE_MATCHER = AhoCorasick((phrase, phrase) for phrase in [
+    "equal opportunity employer", "equal employment opportunity", "without regard to",
+    "regardless of race", "protected veteran", "protected characteristic", "sexual orientation",
+    "gender identity", "reasonable accommodation", "e-verify", "401(k)", "401k", "paid time off",
+    "unlimited pto", "health insurance", "medical, dental", "dental and vision", "parental leave",
+    "competitive salary", "competitive compensation", "stock options", "wellness stipend",
+    "free lunch", "gym membership", "applicants will receive consideration",
+])
+
+_BULLET_PREFIX = re.compile(r"^[\s•●▪■◦*\-–—]+")
+
+
+def _is_heading(line: str) -> bool:
+    stripped = line.strip()
+    if _BULLET_PREFIX.match(stripped):
+        return False
+    return len(stripped) <= 60 and (
+        stripped.endswith(":") or (len(stripped.split()) <= 6 and not stripped.endswith((".", "!", "?")))
+    )
+
+
+def strip_boilerplate(text: str) -> str:
+    """
+    Drop EEO/benefits/company-blurb paragraphs and duplicate lines from a job description
+    """
+    kept = []
+    seen = set()
+    skipping = False
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+
+        if _is_heading(stripped):
+            skipping = stripped.rstrip(":").strip().lower() in BOILERPLATE_HEADINGS
+            if skipping:
+                continue
+
+        if skipping or BOILERPLATE_MATCHER.contains_any(stripped):
+            continue
+
+        normalized = re.sub(r"\s+", " ", _BULLET_PREFIX.sub("", stripped)).lower()
+        if normalized in seen:
+            continue
+        seen.add(normalized)
+        kept.append(stripped)
+
+    return "\n".join(kept)
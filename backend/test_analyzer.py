@@ -8,9 +8,11 @@ import os
 sys.path.insert(0, os.path.dirname(__file__))
 
 from services.ai_analyzer import AIAnalyzer
+from services.llm_providers import close_default_provider, get_default_provider
+import asyncio
 import json
 
-def test_analyzer():
+def run_analysis():
     print("🧪 Testing HireSense AI Analyzer...\n")
     
     # Sample resume text
@@ -56,8 +58,15 @@ def test_analyzer():
     print("💼 Job: Senior DevOps Engineer role\n")
     print("=" * 60)
     
-    analyzer = AIAnalyzer()
-    result = analyzer.analyze_resume(resume_text, job_description)
+    analyzer = AIAnalyzer(provider=get_default_provider())
+    
+    async def analyze():
+        try:
+            return await analyzer.analyze_resume(resume_text, job_description)
+        finally:
+            await close_default_provider()
+    
+    result = asyncio.run(analyze())
     
     print("\n📊 ANALYSIS RESULTS:\n")
     print(f"Match Score: {result.get('match_score', 'N/A')}%")
@@ -87,13 +96,16 @@ def test_analyzer():
         print(f"{i}. {step}\n")
     
     print("=" * 60)
-    print("\n✨ Full analysis saved to: test_analysis_output.json")
-    
-    # Save full output
-    with open('test_analysis_output.json', 'w') as f:
-        json.dump(result, f, indent=2)
-    
+    return result
+
+def test_analyzer():
+    assert "match_score" in run_analysis()
     print("\n✅ Test completed successfully!")
 
 if __name__ == "__main__":
-    test_analyzer()
+    result = run_analysis()
+    
+    # Only a manual run refreshes the committed sample output
+    with open('test_analysis_output.json', 'w') as f:
+        json.dump(result, f, indent=2)
+    print("\n✨ Full analysis saved to: test_analysis_output.json")
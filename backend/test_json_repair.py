@@ -0,0 +1,68 @@
+"""
+Tests for recovering JSON from LLM responses
+"""
+
+import json
+from typing import List
+
+import pytest
+from pydantic import BaseModel
+
+from services.json_repair import CLEAN, REPAIRED, TRUNCATED, extract_json, invalid_fields
+
+
+class Report(BaseModel):
+    score: int
+    summary: str
+    tags: List[str]
+
+
+def test_clean_json_is_parsed_as_is():
+    assert extract_json('{"score": 80, "tags": ["a"]}') == ({"score": 80, "tags": ["a"]}, CLEAN)
+
+
+def test_prose_and_fences_are_skipped():
+    text = 'Here is the analysis:\n```json\n{"score": 80, "summary": "ok"}\n```\nHope this helps!'
+    assert extract_json(text) == ({"score": 80, "summary": "ok"}, REPAIRED)
+
+
+def test_bracketed_prose_before_the_json_is_skipped():
+    text = 'Result [v2] below: {"score": 1}'
+    assert extract_json(text) == ({"score": 1}, REPAIRED)
+
+
+def test_trailing_and_doubled_commas_are_dropped():
+    value, status = extract_json('{"tags": ["a",, "b",], "score": 3,}')
+    assert value == {"tags": ["a", "b"], "score": 3}
+    assert status == REPAIRED
+
+
+def test_truncated_reply_keeps_complete_members_only():
+    value, status = extract_json('{"score": 72, "summary": "Strong backend", "tags": ["py", "go"')
+    assert value == {"score": 72, "summary": "Strong backend"}
+    assert status == TRUNCATED
+
+
+def test_truncated_inside_a_string_drops_that_member():
+    value, status = extract_json('{"score": 72, "summary": "Strong back')
+    assert value == {"score": 72}
+    assert status == TRUNCATED
+
+
+def test_raw_newlines_inside_strings_are_accepted():
+    value, _ = extract_json('Sure: {"summary": "line one\nline two"}')
+    assert value == {"summary": "line one\nline two"}
+
+
+def test_no_json_raises():
+    with pytest.raises(json.JSONDecodeError):
+        extract_json("I can't help with that.")
+
+
+def test_invalid_fields_lists_missing_and_wrong_fields_in_model_order():
+    assert invalid_fields({"score": 90, "summary": "ok", "tags": []}, Report) == []
+    assert invalid_fields({"tags": "not a list", "score": 1}, Report) == ["summary", "tags"]
+
+
+def test_invalid_fields_of_a_non_object_is_every_field():
+    assert invalid_fields(["score"], Report) == ["score", "summary", "tags"]
@@ -0,0 +1,153 @@
+"""
+Tests for LLM request scheduling: retries, rate budgets and priorities
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from cerebras.cloud.sdk import BadRequestError, InternalServerError, RateLimitError
+
+from services.llm_scheduler import AdaptiveLimiter, LLMScheduler, Priority, retry_after_seconds
+
+
+def api_error(error_type, status: int, headers=None):
+    response = httpx.Response(status, headers=headers or {}, request=httpx.Request("POST", "http://llm.test"))
+    return error_type(f"HTTP {status}", response=response, body=None)
+
+
+def scheduler(**kwargs) -> LLMScheduler:
+    kwargs.setdefault("base_delay", 0.001)
+    return LLMScheduler(**kwargs)
+
+
+def flaky(failures):
+    """Request that raises each of failures in turn, then succeeds"""
+    attempts = []
+
+    async def request():
+        attempts.append(len(attempts))
+        if len(attempts) <= len(failures):
+            raise failures[len(attempts) - 1]
+        return "ok"
+
+    return request, attempts
+
+
+def test_transient_errors_are_retried():
+    llm = scheduler()
+    request, attempts = flaky([
+        api_error(RateLimitError, 429, {"retry-after": "0"}),
+        api_error(InternalServerError, 500),
+    ])
+    assert asyncio.run(llm.run(request)) == "ok"
+    assert len(attempts) == 3
+    assert llm.stats()["retries"] == 2
+    assert llm.stats()["rate_limited"] == 1
+
+
+def test_non_retryable_errors_fail_immediately():
+    llm = scheduler()
+    request, attempts = flaky([api_error(BadRequestError, 400)])
+    with pytest.raises(BadRequestError):
+        asyncio.run(llm.run(request))
+    assert len(attempts) == 1
+    assert llm.stats()["failures"] == 1
+
+
+def test_retries_stop_after_max_retries():
+    llm = scheduler(max_retries=2)
+    request, attempts = flaky([api_error(InternalServerError, 500)] * 5)
+    with pytest.raises(InternalServerError):
+        asyncio.run(llm.run(request))
+    assert len(attempts) == 3
+
+
+def test_budget_is_charged_once_across_retries():
+    llm = scheduler(requests_per_minute=100, tokens_per_minute=10_000)
+    request, attempts = flaky([api_error(RateLimitError, 429, {"retry-after": "0"})] * 3)
+    asyncio.run(llm.run(request, tokens=1_000))
+    assert len(attempts) == 4
+    assert llm.request_bucket.available == pytest.approx(99, abs=0.1)
+    assert llm.token_bucket.available == pytest.approx(9_000, abs=1)
+
+
+def test_budget_is_refunded_when_every_attempt_fails():
+    llm = scheduler(tokens_per_minute=10_000, max_retries=2)
+    request, _ = flaky([api_error(InternalServerError, 500)] * 5)
+    with pytest.raises(InternalServerError):
+        asyncio.run(llm.run(request, tokens=1_000))
+    assert llm.token_bucket.available == pytest.approx(10_000, abs=1)
+
+
+def test_unused_tokens_are_settled_back():
+    llm = scheduler(tokens_per_minute=10_000)
+
+    async def request():
+        return "ok"
+
+    asyncio.run(llm.run(request, tokens=1_000))
+    llm.settle(1_000, SimpleNamespace(total_tokens=300))
+    assert llm.token_bucket.available == pytest.approx(9_700, abs=1)
+
+
+def test_retry_after_header_formats():
+    assert retry_after_seconds(api_error(RateLimitError, 429, {"retry-after": "3"})) == 3
+    assert retry_after_seconds(api_error(RateLimitError, 429, {"retry-after-ms": "250"})) == 0.25
+    assert retry_after_seconds(api_error(RateLimitError, 429)) is None
+
+
+def test_overload_halves_the_limit_once_per_cooldown():
+    limiter = AdaptiveLimiter(initial=8, cooldown=60)
+    limiter.on_overload()
+    limiter.on_overload()
+    assert limiter.limit == 4
+    limiter.on_success()
+    assert limiter.limit == pytest.approx(4.25)
+
+
+def test_queued_callers_are_admitted_in_priority_order():
+    async def main():
+        limiter = AdaptiveLimiter(initial=1)
+        await limiter.acquire()
+        admitted = []
+
+        async def wait(priority, name):
+            await limiter.acquire(priority)
+            admitted.append(name)
+            limiter.release()
+
+        waiters = [
+            asyncio.ensure_future(wait(Priority.BULK, "bulk")),
+            asyncio.ensure_future(wait(Priority.INTERACTIVE, "interactive")),
+        ]
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.gather(*waiters)
+        return admitted
+
+    assert asyncio.run(main()) == ["interactive", "bulk"]
+
+
+def test_stream_holds_its_slot_until_consumed_and_settles_usage():
+    async def main():
+        llm = scheduler(tokens_per_minute=10_000)
+        in_flight = []
+
+        async def chunks():
+            for index in range(3):
+                in_flight.append(llm.limiter.in_flight)
+                yield SimpleNamespace(index=index, usage=SimpleNamespace(total_tokens=100) if index == 2 else None)
+
+        async def request():
+            return chunks()
+
+        received = [chunk.index async for chunk in llm.stream(request, tokens=1_000)]
+        return llm, received, in_flight
+
+    llm, received, in_flight = asyncio.run(main())
+    assert received == [0, 1, 2]
+    assert in_flight == [1, 1, 1]
+    assert llm.limiter.in_flight == 0
+    assert llm.token_bucket.available == pytest.approx(9_900, abs=1)
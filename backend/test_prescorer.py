@@ -0,0 +1,68 @@
+"""
+Tests for the local keyword pre-scorer
+"""
+
+from services.prescorer import KeywordScorer, extract_terms, prescore
+
+JOB_DESCRIPTION = """
+Senior Backend Engineer
+
+Requirements:
+- 5+ years building services in Python
+- Experience with Kubernetes, Docker and AWS
+- Strong PostgreSQL and Redis knowledge
+
+Benefits:
+- Competitive salary and equity
+- Health insurance, dental and vision
+- Flexible working hours
+
+We are an equal opportunity employer. All applicants will receive consideration without regard to race.
+"""
+
+
+def test_aliases_count_as_one_canonical_skill():
+    terms = extract_terms("Deployed k8s clusters; Kubernetes operator author")
+    assert terms["Kubernetes"] == 2
+    assert "k8s" not in terms
+
+
+def test_boilerplate_never_becomes_a_keyword():
+    scorer = KeywordScorer(JOB_DESCRIPTION)
+    for word in ("benefits", "insurance", "health", "equal", "opportunity", "employer", "competitive", "flexible"):
+        assert word not in scorer.weights
+
+
+def test_only_skills_are_reported_as_keywords():
+    result = prescore("Python developer", JOB_DESCRIPTION)
+    assert result["matched_keywords"] == ["Python"]
+    assert sorted(result["missing_keywords"]) == ["AWS", "Docker", "Kubernetes", "PostgreSQL", "Redis"]
+
+
+def test_plain_words_are_reported_when_the_jd_names_no_skill():
+    result = prescore("I enjoy gardening", "Gardening and landscaping")
+    assert result["matched_keywords"] == ["gardening"]
+    assert result["missing_keywords"] == ["landscaping"]
+
+
+def test_a_matching_resume_scores_far_above_a_sparse_one():
+    strong = prescore(
+        "Backend developer, 6 years of Python, Docker and Kubernetes on AWS with PostgreSQL and Redis",
+        JOB_DESCRIPTION
+    )
+    weak = prescore("Python developer", JOB_DESCRIPTION)
+    assert strong["match_score"] >= 80
+    assert weak["match_score"] < 30
+    assert strong["missing_keywords"] == []
+
+
+def test_score_is_bounded_and_deterministic():
+    scorer = KeywordScorer(JOB_DESCRIPTION)
+    resume = "Python " * 200 + "Kubernetes Docker AWS PostgreSQL Redis"
+    first = scorer.score(resume)
+    assert first == scorer.score(resume)
+    assert 0 <= first["match_score"] <= 100
+
+
+def test_empty_job_description_scores_zero():
+    assert prescore("Python developer", "")["match_score"] == 0
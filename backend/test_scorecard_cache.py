@@ -0,0 +1,151 @@
+"""
+Tests for rendered scorecard caching and ETag revalidation
+"""
+
+import asyncio
+from datetime import date
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routes import rewriter
+from services.registry import get_scorecard_cache, get_scorecard_renderer, get_session_store
+from services.scorecard_cache import ScorecardCache, etag_for, etag_matches, scorecard_fingerprint
+from services.session_store import SessionStore
+
+ANALYSIS = {"match_score": 72, "missing_keywords": [], "overall_assessment": "Solid backend profile"}
+
+
+class FakeRenderer:
+    """Stands in for the process-pool renderer; every render returns distinct bytes"""
+
+    def __init__(self):
+        self.renders = 0
+
+    async def render(self, analysis, interview_summary=None, candidate_name="Candidate", generated_on=None):
+        self.renders += 1
+        return f"%PDF-1.4 {candidate_name} render {self.renders}".encode()
+
+
+def test_fingerprint_ignores_key_order_but_not_content():
+    today = date(2026, 1, 5)
+    reordered = dict(reversed(list(ANALYSIS.items())))
+    assert scorecard_fingerprint(ANALYSIS, None, "Ada", today) == scorecard_fingerprint(reordered, None, "Ada", today)
+    assert scorecard_fingerprint(ANALYSIS, None, "Ada", today) != scorecard_fingerprint(ANALYSIS, None, "Bob", today)
+    assert scorecard_fingerprint(ANALYSIS, None, "Ada", today) != scorecard_fingerprint(ANALYSIS, None, "Ada", date(2026, 1, 6))
+
+
+def test_if_none_match_parsing():
+    etag = etag_for("abc")
+    assert etag_matches('"abc"', etag)
+    assert etag_matches('W/"abc"', etag)
+    assert etag_matches('"zzz", "abc"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"zzz"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_concurrent_misses_share_one_render():
+    async def main():
+        cache = ScorecardCache()
+        renders = 0
+
+        async def render():
+            nonlocal renders
+            renders += 1
+            await asyncio.sleep(0.01)
+            return b"%PDF"
+
+        results = await asyncio.gather(*(cache.get_or_render("fp", render) for _ in range(3)))
+        await cache.get_or_render("fp", render)
+        return cache, renders, results
+
+    cache, renders, results = asyncio.run(main())
+    assert renders == 1
+    assert results == [b"%PDF"] * 3
+    assert cache.stats()["renders"] == 1
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    async def main():
+        first = ScorecardCache(directory=str(tmp_path))
+        await first.set("fp", b"%PDF disk")
+        second = ScorecardCache(directory=str(tmp_path))
+        return await second.get("fp"), second.stats()
+
+    value, stats = asyncio.run(main())
+    assert value == b"%PDF disk"
+    assert stats["disk"]["hits"] == 1
+    assert stats["memory"]["entries"] == 1
+
+
+def test_disabled_cache_always_renders():
+    async def main():
+        cache = ScorecardCache(enabled=False)
+
+        async def render():
+            return b"%PDF"
+
+        await cache.set("fp", b"%PDF")
+        return await cache.get("fp"), await cache.get_or_render("fp", render)
+
+    assert asyncio.run(main()) == (None, b"%PDF")
+
+
+def client_with(renderer, cache, sessions) -> TestClient:
+    app = FastAPI()
+    app.include_router(rewriter.router)
+    app.dependency_overrides[get_scorecard_renderer] = lambda: renderer
+    app.dependency_overrides[get_scorecard_cache] = lambda: cache
+    app.dependency_overrides[get_session_store] = lambda: sessions
+    return TestClient(app)
+
+
+def test_post_points_to_a_revalidatable_get():
+    renderer = FakeRenderer()
+    cache = ScorecardCache()
+    client = client_with(renderer, cache, SessionStore())
+
+    generated = client.post("/api/rewriter/generate-scorecard", json={"analysis": ANALYSIS, "candidate_name": "Ada"})
+    assert generated.status_code == 200
+    etag = generated.headers["etag"]
+
+    # A POST never answers 304, even with a matching validator
+    repeated = client.post(
+        "/api/rewriter/generate-scorecard",
+        json={"analysis": ANALYSIS, "candidate_name": "Ada"},
+        headers={"If-None-Match": etag},
+    )
+    assert repeated.status_code == 200
+    assert renderer.renders == 1
+
+    location = generated.headers["content-location"]
+    fetched = client.get(location)
+    assert fetched.status_code == 200
+    assert fetched.content == generated.content
+    assert fetched.headers["etag"] == etag
+
+    assert client.get(location, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/rewriter/scorecards/" + "0" * 64).status_code == 404
+    assert client.get("/api/rewriter/scorecards/not-a-fingerprint").status_code == 422
+    assert cache.stats()["not_modified"] == 1
+
+
+def test_session_scorecard_changes_etag_when_the_session_does():
+    renderer = FakeRenderer()
+    sessions = SessionStore()
+    client = client_with(renderer, ScorecardCache(), sessions)
+    session = asyncio.run(sessions.create("resume", "job description", ANALYSIS))
+    url = f"/api/rewriter/sessions/{session['session_id']}/scorecard"
+
+    first = client.get(url, params={"candidate_name": "Ada"})
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert client.get(url, params={"candidate_name": "Ada"}, headers={"If-None-Match": etag}).status_code == 304
+
+    asyncio.run(sessions.update(session["session_id"], summary={"overall_score": 8}))
+    updated = client.get(url, params={"candidate_name": "Ada"}, headers={"If-None-Match": etag})
+    assert updated.status_code == 200
+    assert updated.headers["etag"] != etag
+
+    assert client.get("/api/rewriter/sessions/missing/scorecard").status_code == 404
@@ -0,0 +1,144 @@
+"""
+Tests for coalescing identical in-flight calls
+"""
+
+import asyncio
+
+import pytest
+
+from services.deadlines import DeadlineExceeded, deadline, remaining
+from services.llm_scheduler import Priority, current_priority, llm_priority
+from services.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    async def main():
+        flight = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"items": [1, 2]}
+
+        results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+        return flight, calls, results
+
+    flight, calls, results = asyncio.run(main())
+    assert calls == 1
+    assert all(result == {"items": [1, 2]} for result in results)
+    # Every caller gets its own copy
+    assert len({id(result) for result in results}) == 5
+    assert flight.stats()["coalesced"] == 4
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_different_keys_and_later_calls_run_separately():
+    async def main():
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch(key):
+            calls.append(key)
+            await asyncio.sleep(0)
+            return key
+
+        await asyncio.gather(flight.do("a", lambda: fetch("a")), flight.do("b", lambda: fetch("b")))
+        await flight.do("a", lambda: fetch("a"))
+        return calls
+
+    assert asyncio.run(main()) == ["a", "b", "a"]
+
+
+def test_exceptions_reach_every_caller():
+    async def main():
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream failed")
+
+        return await asyncio.gather(*(flight.do("key", fail) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_shared_call_ignores_the_leaders_deadline():
+    async def main():
+        flight = SingleFlight()
+        seen_deadline = []
+
+        async def fetch():
+            seen_deadline.append(remaining())
+            await asyncio.sleep(0.2)
+            return "done"
+
+        async def leader():
+            with deadline(0.05):
+                return await flight.do("key", fetch)
+
+        async def follower():
+            await asyncio.sleep(0)
+            return await flight.do("key", fetch)
+
+        results = await asyncio.gather(leader(), follower(), return_exceptions=True)
+        return results, seen_deadline
+
+    (leader_result, follower_result), seen_deadline = asyncio.run(main())
+    assert isinstance(leader_result, DeadlineExceeded)
+    assert follower_result == "done"
+    assert seen_deadline == [None]
+
+
+def test_shared_call_runs_at_the_most_urgent_waiting_priority():
+    async def main():
+        flight = SingleFlight()
+        started = asyncio.Event()
+        joined = asyncio.Event()
+        priorities = []
+
+        async def fetch():
+            priorities.append(current_priority())
+            started.set()
+            await joined.wait()
+            priorities.append(current_priority())
+            return "done"
+
+        async def bulk_caller():
+            with llm_priority(Priority.BULK):
+                return await flight.do("key", fetch)
+
+        async def interactive_caller():
+            await started.wait()
+            call = asyncio.ensure_future(flight.do("key", fetch))
+            await asyncio.sleep(0)
+            joined.set()
+            return await call
+
+        await asyncio.gather(bulk_caller(), interactive_caller())
+        return priorities
+
+    assert asyncio.run(main()) == [Priority.BULK, Priority.INTERACTIVE]
+
+
+def test_a_cancelled_caller_does_not_cancel_the_shared_call():
+    async def main():
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second, first
+
+    result, first = asyncio.run(main())
+    assert result == "done"
+    with pytest.raises(asyncio.CancelledError):
+        first.result()
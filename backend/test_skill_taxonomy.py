@@ -0,0 +1,51 @@
+"""
+Tests for the Aho-Corasick skill matcher
+"""
+
+from services.prescorer import extract_terms
+from services.skill_taxonomy import AhoCorasick, SkillMatcher
+
+
+def matched(automaton: AhoCorasick, text: str):
+    return [(text[start:end], payload) for start, end, payload in automaton.find(text)]
+
+
+def test_matches_only_on_word_boundaries():
+    automaton = AhoCorasick([("js", "JavaScript"), ("go", "Go")])
+    assert matched(automaton, "json and js, golang, go.") == [("js", "JavaScript"), ("go", "Go")]
+
+
+def test_patterns_with_punctuation_keep_their_own_boundaries():
+    automaton = AhoCorasick([("c++", "C++"), ("node.js", "Node.js")])
+    assert matched(automaton, "C++/Node.js dev") == [("C++", "C++"), ("Node.js", "Node.js")]
+
+
+def test_matching_is_case_insensitive_and_offsets_point_into_the_original():
+    automaton = AhoCorasick([("python", "Python")])
+    assert matched(automaton, "PYTHON and Python") == [("PYTHON", "Python"), ("Python", "Python")]
+
+
+def test_offsets_survive_characters_that_lowercase_to_several():
+    # "İ".lower() is two characters long
+    automaton = AhoCorasick([("python", "Python"), ("kubernetes", "Kubernetes")])
+    text = "İİİİ Python developer, kubernetes"
+    assert matched(automaton, text) == [("Python", "Python"), ("kubernetes", "Kubernetes")]
+    assert set(extract_terms(text)) == {"iiii", "Python", "developer", "Kubernetes"}
+
+
+def test_overlapping_patterns_all_match():
+    automaton = AhoCorasick([("machine learning", "ML"), ("learning", "Learning")])
+    assert matched(automaton, "machine learning") == [("machine learning", "ML"), ("learning", "Learning")]
+
+
+def test_skill_matcher_prefers_the_longest_overlapping_skill():
+    matcher = SkillMatcher({"React": ["react"], "React Native": ["react native"]})
+    text = "React Native and React"
+    assert [(text[start:end], skill) for start, end, skill in matcher.find(text)] == [
+        ("React Native", "React Native"),
+        ("React", "React"),
+    ]
+
+
+def test_no_patterns_matches_nothing():
+    assert AhoCorasick([]).find("anything") == []